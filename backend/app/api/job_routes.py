@@ -4,7 +4,7 @@ from typing import Optional
 
 from app.core.database import get_db
 from app.services.job_repository import JobRepository
-from app.api.schemas import JobResponse, JobListResponse
+from app.api.schemas import JobResponse, JobListResponse, JobSummaryResponse
 
 router = APIRouter(prefix="/jobs", tags=["jobs"])
 
@@ -16,31 +16,44 @@ async def search_jobs(
     location: Optional[str] = Query(None, description="Location filter"),
     job_type: Optional[str] = Query(None, description="Job type (internship, full-time, contract)"),
     source: Optional[str] = Query(None, description="Source (e.g., career_page, adzuna_api)"),
+    q: Optional[str] = Query(None, description="Full-text search over title, company, location and description (ranked)"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page (replaces skip)"),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
+    exact_total: bool = Query(False, description="Count matches now instead of using the cached total"),
     db: Session = Depends(get_db),
 ) -> JobListResponse:
     """
     Search jobs with optional filters.
-    Returns paginated results.
+    Returns paginated results; follow next_cursor for cheap deep paging.
+    With q, results are ranked by relevance and paged with skip.
     """
     repo = JobRepository(db)
-    jobs, total = repo.search_jobs(
-        title=title,
-        company=company,
-        location=location,
-        job_type=job_type,
-        source=source,
-        skip=skip,
-        limit=limit,
-    )
+    try:
+        page = repo.list_jobs(
+            title=title,
+            company=company,
+            location=location,
+            job_type=job_type,
+            source=source,
+            q=q,
+            cursor=cursor,
+            skip=skip,
+            limit=limit,
+            exact_total=exact_total,
+            summary=True,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     return JobListResponse(
-        items=[JobResponse.model_validate(job) for job in jobs],
-        total=total,
+        items=[JobSummaryResponse.model_validate(job) for job in page.jobs],
+        total=page.total,
         skip=skip,
         limit=limit,
-        has_more=(skip + limit) < total,
+        has_more=page.has_more,
+        next_cursor=page.next_cursor,
+        total_is_exact=page.total_is_exact,
     )
 
 
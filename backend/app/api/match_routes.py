@@ -2,12 +2,21 @@ from fastapi import APIRouter, Depends, UploadFile, File, HTTPException
 from sqlalchemy.orm import Session
 import logging
 
+from app.core.config import settings
 from app.core.database import get_db
 from app.services.resume_parser import ResumeParser
 from app.services.job_matcher import JobMatcher
 from app.services.job_repository import JobRepository
-from app.services.embedding_service import EmbeddingService
-from app.api.schemas import ResumeMatchResponse, JobMatchResponse, JobResponse
+from app.services.embedding_batcher import embedding_batcher
+from app.services.keyword_index import KeywordIndex
+from app.services.resume_cache import CachedResume, resume_cache
+from app.services.pdf_extraction import (
+    PdfExtractionError,
+    PdfExtractionTimeout,
+    PdfTooLargeError,
+    pdf_extraction_pool,
+)
+from app.api.schemas import ResumeMatchResponse, JobMatchResponse, JobSummaryResponse
 
 logger = logging.getLogger(__name__)
 
@@ -23,8 +32,10 @@ async def match_resume(
     """
     Upload a PDF resume and get top matching jobs.
     
-    - Extracts text from PDF
+    - Extracts text from PDF (cached by file hash for repeat uploads)
     - Generates resume embedding via microservice
+    - Retrieves the nearest jobs from the ANN index over the whole corpus,
+      plus the most recent jobs still waiting for an embedding
     - Uses hybrid scoring (70% semantic + 30% keyword)
     - Falls back to keyword-only if embedding service is unavailable
     """
@@ -33,41 +44,98 @@ async def match_resume(
         raise HTTPException(status_code=400, detail="Only PDF files are supported")
     
     try:
-        # Read PDF bytes
-        pdf_bytes = await resume.read()
+        # Read PDF bytes (one byte past the limit is enough to reject)
+        pdf_bytes = await resume.read(settings.resume_max_bytes + 1)
         
-        # Extract text
-        resume_text = ResumeParser.extract_text_from_bytes(pdf_bytes)
+        # Repeat uploads of the same file skip extraction and embedding
+        digest = resume_cache.digest(pdf_bytes)
+        cached = await resume_cache.get(digest)
         
-        if not resume_text:
-            raise HTTPException(
-                status_code=400,
-                detail="Could not extract text from PDF. Please ensure it's a valid PDF with readable text."
-            )
+        if cached:
+            logger.info(f"Resume cache hit ({digest[:12]})")
+            resume_text = cached.text
+            resume_keywords = cached.keywords
+            resume_embedding = cached.embedding
+        else:
+            # Extract text in the process pool (keeps the event loop free)
+            try:
+                resume_text = await pdf_extraction_pool.extract_text(pdf_bytes)
+            except PdfTooLargeError:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"PDF is too large (max {settings.resume_max_bytes // (1024 * 1024)} MB)"
+                )
+            except PdfExtractionTimeout:
+                raise HTTPException(
+                    status_code=422,
+                    detail="PDF took too long to process. Please upload a simpler or shorter file."
+                )
+            except PdfExtractionError:
+                resume_text = ""
+            
+            if not resume_text:
+                raise HTTPException(
+                    status_code=400,
+                    detail="Could not extract text from PDF. Please ensure it's a valid PDF with readable text."
+                )
+            
+            logger.info(f"Extracted {len(resume_text)} characters from resume")
+            resume_keywords = ResumeParser.extract_keywords(resume_text)
+            resume_embedding = None
         
-        logger.info(f"Extracted {len(resume_text)} characters from resume")
+        # Generate resume embedding (graceful fallback if service is down)
+        if resume_embedding is None:
+            # Coalesced with concurrent uploads into one /embed-batch call
+            resume_embedding = await embedding_batcher.embed(resume_text)
+            
+            # Cache new entries, and entries that were stored without an
+            # embedding while the service was down
+            if not cached or resume_embedding:
+                await resume_cache.set(
+                    digest,
+                    CachedResume(text=resume_text, keywords=resume_keywords, embedding=resume_embedding),
+                )
         
-        # Get all active jobs
+        if resume_embedding:
+            matching_mode = "hybrid"
+            logger.info("Using hybrid matching (semantic + keyword)")
+        else:
+            matching_mode = "keyword_only"
+            logger.warning("Embedding service unavailable, falling back to keyword-only matching")
+        
+        # Candidate jobs: nearest neighbours across the whole corpus when
+        # semantic search is available, otherwise the most recent active jobs
         repo = JobRepository(db)
-        jobs, total = repo.search_jobs(is_active=True, limit=1000)
+        candidate_ids = JobMatcher.semantic_candidates(
+            resume_embedding, settings.match_candidate_pool
+        )
+        if candidate_ids:
+            # Jobs not embedded yet are invisible to the ANN index; score
+            # the most recent of them on keywords alongside
+            seen = set(candidate_ids)
+            candidate_ids += [
+                job_id
+                for job_id in repo.get_recent_job_ids_without_embeddings(settings.match_unembedded_pool)
+                if job_id not in seen
+            ]
+        # Summary columns only; descriptions and vectors load on demand
+        extra_columns = JobMatcher.candidate_columns()
+        if candidate_ids:
+            jobs = repo.get_jobs_by_ids(candidate_ids, summary=True, extra_columns=extra_columns)
+        else:
+            jobs, total = repo.search_jobs(
+                is_active=True, limit=1000, summary=True, extra_columns=extra_columns
+            )
         
         if not jobs:
             return ResumeMatchResponse(
                 total_jobs_scored=0,
-                matching_mode="hybrid",
+                matching_mode=matching_mode,
                 top_matches=[]
             )
         
-        # Generate resume embedding (graceful fallback if service is down)
-        embedding_service = EmbeddingService()
-        resume_embedding = await embedding_service.embed(resume_text)
-        
-        if resume_embedding:
-            matching_mode = "hybrid"
-            logger.info("Using hybrid matching (semantic + keyword)")
-        else:
-            matching_mode = "keyword_only"
-            logger.warning("Embedding service unavailable, falling back to keyword-only matching")
+        # BM25 keyword scores from the inverted index (no per-job re-tokenizing)
+        keyword_scores = KeywordIndex(db).score_jobs(resume_keywords, jobs)
         
         # Hybrid match
         matches = JobMatcher.match_jobs_hybrid(
@@ -75,12 +143,13 @@ async def match_resume(
             resume_embedding=resume_embedding,
             jobs=jobs,
             top_n=top_n,
+            keyword_scores=keyword_scores,
         )
         
         # Build response
         top_matches = [
             JobMatchResponse(
-                job=JobResponse.model_validate(match["job"]),
+                job=JobSummaryResponse.model_validate(match["job"]),
                 match_score=match["match_score"],
                 keyword_score=match["keyword_score"],
                 semantic_score=match["semantic_score"],
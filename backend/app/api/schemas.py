@@ -30,13 +30,31 @@ class JobResponse(BaseModel):
         from_attributes = True
 
 
+class JobSummaryResponse(BaseModel):
+    """Job as shown in lists; full detail is on GET /jobs/{id}."""
+    id: int
+    title: str
+    company: str
+    location: Optional[str] = None
+    job_type: str
+    apply_link: str
+    source: str
+    created_at: datetime
+    snippet: Optional[str] = None  # start of the description
+
+    class Config:
+        from_attributes = True
+
+
 class JobListResponse(BaseModel):
     """Paginated job list response."""
-    items: List[JobResponse]
+    items: List[JobSummaryResponse]
     total: int
     skip: int
     limit: int
     has_more: bool
+    next_cursor: Optional[str] = None  # pass as ?cursor= to fetch the next page
+    total_is_exact: bool = True        # False when total was served from the count cache
 
 
 # Alert Schemas
@@ -81,7 +99,7 @@ class AlertResponse(BaseModel):
 
 class JobMatchResponse(BaseModel):
     """Single job with match score."""
-    job: JobResponse
+    job: JobSummaryResponse
     match_score: float          # hybrid score 0-100
     keyword_score: float = 0.0  # keyword-only component 0-100
     semantic_score: float = 0.0 # cosine similarity component 0-100
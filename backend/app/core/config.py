@@ -40,15 +40,91 @@ class Settings(BaseSettings):
     adzuna_country: str = ""
     adzuna_base_url: str = "https://api.adzuna.com/v1/api"
     adzuna_job_queries: str = "software engineer,python developer,data scientist,manager,human resource"  # comma-separated
+    adzuna_results_per_page: int = 50  # Adzuna allows up to 50
+    adzuna_max_pages: int = 2  # page depth per query (5 queries x 2 pages hourly fits the free 250/day)
+    adzuna_page_concurrency: int = 2  # pages of one query requested at once
+    adzuna_max_concurrency: int = 4  # requests in flight across all queries
+    adzuna_requests_per_minute: float = 25.0  # token-bucket refill rate (free tier: 25/minute)
+    adzuna_burst: int = 5  # requests that may go out back to back
+
+    # Career page crawling (all YAML configs are fetched concurrently)
+    crawl_max_concurrency: int = 8  # requests in flight across all hosts
+    crawl_per_host_concurrency: int = 2  # requests in flight per host
+    crawl_host_delay_seconds: float = 1.0  # minimum gap between request starts to one host
+    crawl_request_timeout_seconds: float = 10.0
+    crawl_source_timeout_seconds: float = 30.0  # budget per source; YAML `timeout_seconds` overrides
+    crawl_validator_ttl_seconds: int = 7 * 24 * 60 * 60  # unchanged pages are still fully re-parsed this often
+    career_page_parser: str = "lxml"  # "lxml" (compiled selectors, needs cssselect) | "bs4"; YAML `parser` overrides
+    career_page_parse_subtree: bool = False  # stream pages, building only job_container subtrees; YAML `parse_subtree` overrides
+    career_page_parse_workers: int = 0  # process pool for large pages (0 = parse in the event loop)
+    career_page_parse_pool_min_bytes: int = 512 * 1024  # smaller pages are parsed inline
+
+    # Ingest pipeline (fetch -> normalize -> dedup -> save -> alerts, see services/ingest_pipeline.py)
+    ingest_queue_size: int = 8  # batches buffered between two stages before the producer waits
+    ingest_batch_size: int = 100  # jobs per batch handed between stages (one dedup round trip)
+    ingest_save_chunk_size: int = 500  # max jobs per save; smaller chunks go out when the stage would idle
 
     # Embedding microservice settings
     embedding_service_url: str = ""
     embedding_api_key: str = ""
     embedding_batch_size: int = 1  # max texts per embed-batch call
+    embedding_max_in_flight: int = 4  # embed-batch chunks sent concurrently
+    embedding_max_connections: int = 10  # shared keep-alive pool size
+    embedding_keepalive_expiry_seconds: float = 30.0
+    embedding_http2: bool = False  # requires the 'h2' package
+    embedding_coalesce_wait_ms: float = 5.0  # how long resume embeds wait for company
+    embedding_coalesce_max_batch: int = 16  # flush early once this many are waiting
+    embedding_cache_namespace: str = "embedding:cache:v1"  # bump when the model changes
+    embedding_cache_ttl_seconds: int = 30 * 24 * 60 * 60
+    embedding_storage_dtype: str = "float32"  # "float32" | "float16" | "int8" (jobs.embedding_packed)
+
+    # Approximate nearest-neighbour retrieval for resume matching
+    ann_index_type: str = "ivf_flat"  # "ivf_flat" | "exact"
+    ann_index_path: str = "data/ann_index.npz"  # relative to backend/
+    ann_nlist: int = 0  # number of IVF lists; 0 = auto (~sqrt(corpus size))
+    ann_nprobe: int = 16  # lists scanned per query (higher = better recall, slower)
+    ann_min_corpus_size: int = 2000  # below this, exact search is used
+    match_candidate_pool: int = 300  # semantic candidates scored per resume
+    match_quantization: str = "none"  # "int8": int8 in-memory index, exact rescoring of float-stored candidates
+    match_unembedded_pool: int = 200  # recent jobs without a vector, scored on keywords alongside
+    embedding_index_sync_seconds: int = 60  # how often a worker pulls other processes' embedding writes
+
+    # BM25 keyword scoring (corpus statistics live in term_stats / field_stats)
+    bm25_k1: float = 1.2  # term-frequency saturation
+    bm25_b: float = 0.75  # field-length normalization strength
+    bm25_title_weight: float = 3.0
+    bm25_description_weight: float = 1.0
+    bm25_company_weight: float = 0.5
+    bm25_location_weight: float = 0.5
+    bm25_half_score: float = 20.0  # raw BM25 score that maps to a 0.5 keyword score
+
+    # Resume PDF extraction (runs in a process pool)
+    resume_extract_workers: int = 2
+    resume_extract_timeout_seconds: float = 10.0  # per-document time budget
+    resume_max_pages: int = 10  # pages beyond this are ignored
+    resume_max_bytes: int = 5 * 1024 * 1024  # uploads above this are rejected
+
+    # Resume upload cache (keyed by SHA-256 of the PDF bytes)
+    resume_cache_ttl_seconds: int = 24 * 60 * 60
+    resume_cache_max_items: int = 128  # in-process LRU entries per worker
+
+    # GET /jobs
+    jobs_count_cache_seconds: int = 30  # how long a filtered total is reused
+    job_snippet_chars: int = 200        # description characters in list/match summaries
 
     # Runtime controls
     scheduler_enabled: bool = False
     backfill_enabled: bool = False
+
+    # Embedding backfill worker (batch size / concurrency adapt via AIMD)
+    backfill_interval_seconds: int = 60  # how often a backfill run starts
+    backfill_run_budget_seconds: float = 45.0  # a run stops starting rounds after this
+    backfill_min_batch_size: int = 1
+    backfill_max_batch_size: int = 64
+    backfill_max_concurrency: int = 4  # batches embedded in parallel per round
+    backfill_target_latency_seconds: float = 20.0  # slower batches count as congestion
+    backfill_max_backoff_seconds: float = 900.0  # cap on the pause after failures
+    backfill_lease_seconds: int = 300  # claimed jobs return to the queue after this
     
     class Config:
         env_file = str(Path(__file__).parent.parent / ".env")
@@ -11,10 +11,29 @@ from app.core.database import engine, Base
 from app.models.job_model import Job
 from app.models.alert_model import UserAlert
 from app.models.user_model import User
+from app.models.job_term_model import JobTerm, TermStat, FieldStat
+from app.services.full_text_search import ensure_full_text_schema
 
 logger = logging.getLogger(__name__)
 
 
+def _add_column_if_missing(conn, table: str, column: str, ddl: str):
+    """
+    Add a column to an existing table unless it is already there.
+    Returns True if the column was added.
+    """
+    existing = {col["name"] for col in inspect(conn).get_columns(table)}
+    if column in existing:
+        logger.debug(f"Migration check: '{column}' column already exists, skipping.")
+        return False
+
+    logger.info(f"Running migration: adding '{column}' column to '{table}' table...")
+    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+    conn.commit()
+    logger.info(f"Migration complete: '{column}' column added.")
+    return True
+
+
 def _run_migrations():
     """
     Run lightweight schema migrations for new columns on existing tables.
@@ -22,17 +41,54 @@ def _run_migrations():
     """
     with engine.connect() as conn:
         # Migration: Add 'embedding' JSON column to jobs table
-        result = conn.execute(text(
-            "SELECT column_name FROM information_schema.columns "
-            "WHERE table_name='jobs' AND column_name='embedding'"
-        ))
-        if not result.fetchone():
-            logger.info("Running migration: adding 'embedding' column to 'jobs' table...")
-            conn.execute(text("ALTER TABLE jobs ADD COLUMN embedding JSON"))
+        _add_column_if_missing(conn, "jobs", "embedding", "JSON")
+
+        # Migration: Packed binary embeddings (JSON values are moved over in the
+        # background by scheduler.migrate_embeddings_job)
+        blob = "BYTEA" if conn.dialect.name == "postgresql" else "BLOB"
+        _add_column_if_missing(conn, "jobs", "embedding_packed", blob)
+        _add_column_if_missing(conn, "jobs", "embedding_dim", "INTEGER")
+        _add_column_if_missing(conn, "jobs", "embedding_dtype", "VARCHAR(8)")
+
+        # Migration: Embeddings stored as JSON 'null' (rather than SQL NULL) were
+        # invisible to the backfill; turn them into real NULLs. Only rows not yet
+        # moved to packed storage can hold one: a cheap EXISTS skips the casting
+        # UPDATE on every boot once none are left.
+        legacy = "embedding_packed IS NULL AND embedding IS NOT NULL"
+        if conn.execute(text(f"SELECT 1 FROM jobs WHERE {legacy} LIMIT 1")).first():
+            result = conn.execute(
+                text(f"UPDATE jobs SET embedding = NULL WHERE {legacy} AND CAST(embedding AS TEXT) = 'null'")
+            )
+            conn.commit()
+            if result.rowcount:
+                logger.info(f"Migration complete: {result.rowcount} JSON-null embeddings reset to NULL.")
+
+        # Migration: Lease column for multi-worker embedding backfill
+        _add_column_if_missing(conn, "jobs", "embedding_claimed_until", "TIMESTAMP WITH TIME ZONE")
+
+        # Migration: Fingerprint of the embedded text (NULL for rows embedded before it existed)
+        _add_column_if_missing(conn, "jobs", "text_fingerprint", "VARCHAR(64)")
+
+        # Migration: Track which jobs are in the job_terms keyword index
+        _add_column_if_missing(conn, "jobs", "keywords_indexed", "BOOLEAN NOT NULL DEFAULT false")
+
+        # Migration: Composite index for keyset pagination on GET /jobs
+        conn.execute(text("CREATE INDEX IF NOT EXISTS ix_jobs_created_at_id ON jobs (created_at, id)"))
+        conn.commit()
+
+        # Migration: Full-text search (tsvector + GIN on Postgres, FTS5 on SQLite)
+        ensure_full_text_schema(conn)
+
+        # Migration: BM25 term frequencies / field lengths on keyword postings.
+        # Postings written before these columns existed are dropped and the
+        # jobs re-queued for indexing (see scheduler.index_keywords_job).
+        added_tf = _add_column_if_missing(conn, "job_terms", "tf", "INTEGER NOT NULL DEFAULT 1")
+        added_len = _add_column_if_missing(conn, "job_terms", "field_length", "INTEGER NOT NULL DEFAULT 0")
+        if added_tf or added_len:
+            conn.execute(text("DELETE FROM job_terms"))
+            conn.execute(text("UPDATE jobs SET keywords_indexed = false"))
             conn.commit()
-            logger.info("Migration complete: 'embedding' column added.")
-        else:
-            logger.debug("Migration check: 'embedding' column already exists, skipping.")
+            logger.info("Migration complete: keyword index cleared for BM25 re-indexing.")
 
 
 def init_db():
@@ -1,15 +1,17 @@
+import asyncio
 import logging
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 
 from app.services.redis_sync_service import RedisSyncService
-from app.services.fetcher_service import FetcherService
 from app.services.job_repository import JobRepository
-from app.services.alert_service import AlertService
+from app.services.ingest_pipeline import IngestPipeline
 from app.services.email_service import EmailService
 from app.services.email_queue_service import EmailQueueService
-from app.services.embedding_service import EmbeddingService
-from app.models.alert_model import UserAlert
+from app.services.backfill_worker import backfill_worker
+from app.services.ann_index import ann_index, rebuild_ann_index
+from app.services.embedding_index import embedding_index
+from app.services.keyword_index import KeywordIndex
 from app.core.database import SessionLocal
 from app.core.config import settings
 
@@ -26,82 +28,20 @@ async def sync_redis_job():
     await sync_service.check_consistency()
 
 
-async def _generate_and_store_embeddings(saved_jobs, repo):
-    """
-    Generate embeddings for newly saved jobs and store them in the DB.
-    If the embedding service is unavailable, logs a warning and skips.
-    The backfill task will pick them up later.
-    """
-    if not saved_jobs:
-        return
-
-    embedding_service = EmbeddingService()
-    texts = [
-        EmbeddingService.build_job_text(job.title or "", job.description or "")
-        for job in saved_jobs
-    ]
-
-    embeddings = await embedding_service.embed_batch(texts)
-
-    if embeddings is None:
-        logger.warning(
-            f"Embedding service unavailable. {len(saved_jobs)} jobs saved without embeddings "
-            "(backfill will handle them later)."
-        )
-        return
-
-    pairs = [
-        (job.id, emb)
-        for job, emb in zip(saved_jobs, embeddings)
-        if emb is not None
-    ]
-    if pairs:
-        updated = repo.update_embeddings_batch(pairs)
-        logger.info(f"Stored embeddings for {updated} jobs")
-
-
 async def fetch_and_save_job():
     """Background job to fetch and save jobs every hour.
-    Embeddings are NOT generated here — the backfill job running
-    every minute will pick up new jobs and generate embeddings
-    incrementally, avoiding timeouts on free-tier services.
+    Runs the streaming ingest pipeline (see services/ingest_pipeline.py):
+    each source's jobs are normalized, deduplicated, saved and matched
+    against alerts while slower sources are still downloading.
+    Embeddings are NOT generated here — the adaptive backfill worker
+    picks up new jobs and generates embeddings incrementally, avoiding
+    timeouts on free-tier services.
     """
     logger.info("Starting fetch and save job...")
     try:
-        fetcher = FetcherService()
-        unique_jobs = await fetcher.fetch_normalized_unique()
-        
-        if unique_jobs:
-            db = SessionLocal()
-            try:
-                repo = JobRepository(db)
-                saved_count, saved_jobs = repo.save_jobs_batch(unique_jobs)
-                logger.info(f"Fetch and save job completed: {saved_count} jobs saved (embeddings deferred to backfill)")
-                
-                # Check alerts and queue notifications (async)
-                if saved_count > 0 and saved_jobs:
-                    logger.info("Checking alerts...")
-                    alert_service = AlertService(db)
-                    alerts = db.query(UserAlert).filter_by(is_active=True).all()
-
-                    if not alerts:
-                        logger.info("No active alerts found, skipping email queue")
-                        return
-                    
-                    notifications_queued = 0
-                    for alert in alerts:
-                        matching_jobs = alert_service._match_jobs_to_alert(alert, saved_jobs)
-                        if matching_jobs:
-                            logger.info(f"Alert '{alert.name}' matched {len(matching_jobs)} jobs")
-                            if await EmailQueueService.queue_email(alert.email, alert.name, matching_jobs):
-                                notifications_queued += 1
-
-                    if notifications_queued > 0:
-                        logger.info(f"Queued {notifications_queued} alert notifications")
-                    else:
-                        logger.info("No alert matches found, email queue not triggered")
-            finally:
-                db.close()
+        result = await IngestPipeline().run()
+        if result.saved:
+            logger.info(f"Fetch and save job completed: {result.saved} jobs saved (embeddings deferred to backfill)")
         else:
             logger.info("No unique jobs to save")
     except Exception as e:
@@ -110,35 +50,100 @@ async def fetch_and_save_job():
 
 async def backfill_embeddings_job():
     """
-    Background job that runs every minute to incrementally generate
-    embeddings for jobs that don't have them yet.
+    Background job that incrementally generates embeddings for jobs
+    that don't have them yet.
 
-    Processes a small batch each run (BACKFILL_BATCH_SIZE) to stay
-    within free-tier timeout limits. Over successive runs every
-    minute, all jobs will eventually get embeddings.
+    Batch size and concurrency adapt to the embedding service's latency
+    and error rate (see BackfillWorker); after failures the worker
+    backs off and skips runs.
     """
     if not settings.backfill_enabled:
         logger.info("Backfill job is disabled by configuration. Skipping run.")
         return
 
-    BACKFILL_BATCH_SIZE = 1  # process one job per minute to avoid free-tier timeouts
+    try:
+        await backfill_worker.run_once()
+    except Exception as e:
+        logger.error(f"Error in backfill embeddings job: {e}")
 
+
+async def index_keywords_job():
+    """
+    Background job that adds jobs saved before the keyword index existed
+    (or whose indexing failed) to the job_terms inverted index.
+    New jobs are indexed at ingest time by save_jobs_batch.
+    """
     try:
         db = SessionLocal()
         try:
-            repo = JobRepository(db)
-            jobs_missing = repo.get_jobs_without_embeddings(limit=BACKFILL_BATCH_SIZE)
+            keyword_index = KeywordIndex(db)
+            indexed = keyword_index.index_missing(limit=500)
+            if indexed:
+                keyword_index.refresh_stats()
+                logger.info(f"Keyword index: indexed {indexed} jobs")
+        finally:
+            db.close()
+    except Exception as e:
+        logger.error(f"Error in keyword index job: {e}")
 
-            if not jobs_missing:
-                # Nothing to do — all jobs have embeddings
-                return
 
-            logger.info(f"Backfill: processing {len(jobs_missing)} jobs without embeddings...")
-            await _generate_and_store_embeddings(jobs_missing, repo)
+async def migrate_embeddings_job():
+    """
+    Background job that moves embeddings from the legacy JSON column to
+    the packed binary column, a few batches per run, until none are left.
+    """
+    try:
+        db = SessionLocal()
+        try:
+            repo = JobRepository(db)
+            total = 0
+            for _ in range(5):
+                migrated = repo.migrate_legacy_embeddings(limit=1000)
+                total += migrated
+                if not migrated:
+                    break
+            if total:
+                logger.info(f"Embedding storage migration: {total} rows packed")
         finally:
             db.close()
     except Exception as e:
-        logger.error(f"Error in backfill embeddings job: {e}")
+        logger.error(f"Error in embedding storage migration job: {e}")
+
+
+async def refresh_ann_index_job():
+    """
+    Background job that retrains the ANN index once the corpus has grown
+    enough since the last build (new jobs are added incrementally in between).
+    Training runs in a worker thread so it does not block the event loop.
+    """
+    try:
+        if not ann_index.needs_rebuild():
+            return
+        logger.info("Rebuilding ANN index...")
+        await asyncio.to_thread(rebuild_ann_index)
+    except Exception as e:
+        logger.error(f"Error rebuilding ANN index: {e}")
+
+
+def _sync_embedding_index() -> None:
+    db = SessionLocal()
+    try:
+        embedding_index.sync(db)
+    finally:
+        db.close()
+
+
+async def sync_embedding_index_job():
+    """
+    Background job that pulls embeddings written by other processes (the
+    other API workers, the backfill script) into this worker's in-memory
+    index, and drops vectors they cleared. Runs in a worker thread so the
+    database read and matrix update do not block the event loop.
+    """
+    try:
+        await asyncio.to_thread(_sync_embedding_index)
+    except Exception as e:
+        logger.error(f"Error syncing embedding index: {e}")
 
 
 async def process_email_queue_job():
@@ -232,16 +237,48 @@ def start_background_scheduler():
     )
 
     if settings.backfill_enabled:
-        # Add job to backfill missing embeddings every 3 minutes
+        # Add job to backfill missing embeddings (adaptive batch size)
         scheduler.add_job(
             backfill_embeddings_job,
-            IntervalTrigger(minutes=3),
+            IntervalTrigger(seconds=settings.backfill_interval_seconds),
             id="backfill_embeddings_job",
-            name="Backfill missing job embeddings every 3 minutes",
+            name="Backfill missing job embeddings",
         )
     else:
         logger.info("Backfill scheduler job is disabled by configuration.")
 
+    # Add job to index not-yet-indexed jobs' keywords every 10 minutes
+    scheduler.add_job(
+        index_keywords_job,
+        IntervalTrigger(minutes=10),
+        id="index_keywords_job",
+        name="Add unindexed jobs to the keyword index every 10 minutes",
+    )
+
+    # Add job to move JSON embeddings to packed storage every 5 minutes
+    scheduler.add_job(
+        migrate_embeddings_job,
+        IntervalTrigger(minutes=5),
+        id="migrate_embeddings_job",
+        name="Migrate JSON embeddings to packed binary storage",
+    )
+
+    # Add job to retrain the ANN index (when needed) every 30 minutes
+    scheduler.add_job(
+        refresh_ann_index_job,
+        IntervalTrigger(minutes=30),
+        id="refresh_ann_index_job",
+        name="Retrain ANN index when the corpus has grown",
+    )
+
+    # Add job to pull other processes' embedding writes into this worker's index
+    scheduler.add_job(
+        sync_embedding_index_job,
+        IntervalTrigger(seconds=settings.embedding_index_sync_seconds),
+        id="sync_embedding_index_job",
+        name="Sync the in-memory embedding index with the database",
+    )
+
     # Add job to process email queue every 5 minutes
     scheduler.add_job(
         process_email_queue_job,
@@ -1,74 +1,94 @@
+import asyncio
 import logging
-from typing import List
+import math
+from typing import Awaitable, Callable, List, Optional, Tuple
 
 import httpx
 
 from app.core.config import settings
 from app.fetchers.base import BaseFetcher, JobData
+from app.fetchers.rate_limit import TokenBucket
 
 logger = logging.getLogger(__name__)
 
+# Async predicate: True if every job on a page is already known
+PageIsKnown = Callable[[List[JobData]], Awaitable[bool]]
+
 
 class AdzunaApiFetcher(BaseFetcher):
     """
     Public Adzuna Jobs API fetcher (JSON-based).
     https://developer.adzuna.com/overview
+
+    Fetches up to `max_pages` pages of `results_per_page` results, newest
+    first. After page 1, pages are requested `page_concurrency` at a time;
+    fetching stops at the first empty page or the first page made up only
+    of jobs `page_is_known` reports as already seen.
     """
 
-    def __init__(self, query: str = "software engineer", location: str | None = None):
+    def __init__(
+        self,
+        query: str = "software engineer",
+        location: str | None = None,
+        results_per_page: int = settings.adzuna_results_per_page,
+        max_pages: int = settings.adzuna_max_pages,
+        page_concurrency: int = settings.adzuna_page_concurrency,
+    ):
         self.query = query
         self.location = location
+        self.results_per_page = results_per_page
+        self.max_pages = max_pages
+        self.page_concurrency = max(1, page_concurrency)
         self.app_id = settings.adzuna_app_id
         self.app_key = settings.adzuna_app_key
         self.country = settings.adzuna_country
         self.base_url = settings.adzuna_base_url
+        self.pages_fetched = 0
+        self.jobs_fetched = 0
 
-    async def fetch(self) -> List[JobData]:
+    async def fetch(
+        self,
+        client: Optional[httpx.AsyncClient] = None,
+        limiter: Optional[TokenBucket] = None,
+        page_is_known: Optional[PageIsKnown] = None,
+    ) -> List[JobData]:
+        """
+        Fetch jobs for the query. Pass a shared `client` and `limiter` when
+        running several queries at once.
+        """
         if not self.app_id or not self.app_key:
             logger.warning("Adzuna API credentials not configured; skipping")
             return []
 
-        url = f"{self.base_url}/jobs/{self.country}/search/1"
-        params = {
-            "app_id": self.app_id,
-            "app_key": self.app_key,
-            "what": self.query,
-        }
-        if self.location:
-            params["where"] = self.location
+        if client is None:
+            async with httpx.AsyncClient(timeout=15.0) as own_client:
+                return await self._fetch_pages(own_client, limiter, page_is_known)
+        return await self._fetch_pages(client, limiter, page_is_known)
 
+    async def _fetch_pages(
+        self,
+        client: httpx.AsyncClient,
+        limiter: Optional[TokenBucket],
+        page_is_known: Optional[PageIsKnown],
+    ) -> List[JobData]:
         jobs: List[JobData] = []
 
         try:
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                response = await client.get(
-                    url,
-                    params=params,
-                    headers={"Accept": "application/json"},
-                )
-                response.raise_for_status()
-                data = response.json()
-
-            for item in data.get("results", []):
-                title = item.get("title")
-                company = (item.get("company") or {}).get("display_name")
-                location = (item.get("location") or {}).get("display_name")
-                description = item.get("description")
-                apply_link = item.get("redirect_url")
-
-                if not company:
-                    continue
-
-                jobs.append(
-                    JobData(
-                        title=title,
-                        company=company,
-                        location=location,
-                        description=description,
-                        apply_link=apply_link,
-                        source="adzuna_api",
-                    )
+            first_page, total = await self._fetch_page(client, 1, limiter)
+            jobs.extend(first_page)
+            last_page = min(self.max_pages, math.ceil(total / self.results_per_page))
+            done = await self._is_exhausted(first_page, page_is_known)
+
+            page = 2
+            while not done and page <= last_page:
+                window = range(page, min(page + self.page_concurrency, last_page + 1))
+                results = await asyncio.gather(
+                    *(self._fetch_page(client, number, limiter) for number in window)
                 )
+                for page_jobs, _ in results:
+                    jobs.extend(page_jobs)
+                    done = done or await self._is_exhausted(page_jobs, page_is_known)
+                page = window.stop
 
         except httpx.HTTPError as e:
             logger.error(f"Adzuna HTTP error: {e}")
@@ -76,3 +96,61 @@ class AdzunaApiFetcher(BaseFetcher):
             logger.error(f"Adzuna unexpected error: {e}")
 
         return jobs
+
+    @staticmethod
+    async def _is_exhausted(page_jobs: List[JobData], page_is_known: Optional[PageIsKnown]) -> bool:
+        """No more pages worth fetching after this one."""
+        if not page_jobs:
+            return True
+        return page_is_known is not None and await page_is_known(page_jobs)
+
+    async def _fetch_page(
+        self, client: httpx.AsyncClient, page: int, limiter: Optional[TokenBucket]
+    ) -> Tuple[List[JobData], int]:
+        """One results page. Returns (jobs, total result count for the query)."""
+        url = f"{self.base_url}/jobs/{self.country}/search/{page}"
+        params = {
+            "app_id": self.app_id,
+            "app_key": self.app_key,
+            "what": self.query,
+            "results_per_page": self.results_per_page,
+            "sort_by": "date",
+        }
+        if self.location:
+            params["where"] = self.location
+
+        if limiter is not None:
+            await limiter.acquire()
+        response = await client.get(
+            url,
+            params=params,
+            headers={"Accept": "application/json"},
+        )
+        response.raise_for_status()
+        data = response.json()
+        self.pages_fetched += 1
+
+        jobs: List[JobData] = []
+        for item in data.get("results", []):
+            title = item.get("title")
+            company = (item.get("company") or {}).get("display_name")
+            location = (item.get("location") or {}).get("display_name")
+            description = item.get("description")
+            apply_link = item.get("redirect_url")
+
+            if not company:
+                continue
+
+            jobs.append(
+                JobData(
+                    title=title,
+                    company=company,
+                    location=location,
+                    description=description,
+                    apply_link=apply_link,
+                    source="adzuna_api",
+                )
+            )
+
+        self.jobs_fetched += len(jobs)
+        return jobs, int(data.get("count") or 0)
@@ -1,14 +1,21 @@
 import logging
 import httpx
-from bs4 import BeautifulSoup
-from typing import List
+from typing import List, Optional
 import yaml
 from pathlib import Path
 
+from app.core.config import settings
 from app.fetchers.base import BaseFetcher, JobData
+from app.fetchers.crawler import CrawlClient
+from app.fetchers.html_extract import ExtractedJob, extract_jobs, extract_jobs_async
+from app.fetchers.page_cache import PageValidators, PageValidatorStore
 
 logger = logging.getLogger(__name__)
 
+# CareerPageFetcher.unchanged values
+NOT_MODIFIED = "not_modified"  # server answered 304
+SAME_BODY = "same_body"        # 200 with the body we parsed last time
+
 
 class CareerPageFetcher(BaseFetcher):
     """
@@ -27,70 +34,98 @@ class CareerPageFetcher(BaseFetcher):
         self.job_url = self.config.get('job_url')
         self.selectors = self.config.get('selectors', {})
         self.source = "career_page"
+        # Whole-fetch budget when crawled alongside other pages
+        self.timeout_seconds = float(self.config.get('timeout_seconds', settings.crawl_source_timeout_seconds))
+        # HTML extraction engine (see fetchers/html_extract.py)
+        self.parser = self.config.get('parser', settings.career_page_parser)
+        self.parse_subtree = bool(self.config.get('parse_subtree', settings.career_page_parse_subtree))
+        # Set by fetch(): NOT_MODIFIED / SAME_BODY when the page was skipped
+        self.unchanged: Optional[str] = None
+        # Set by fetch(): why the page could not be fetched or parsed
+        self.error: Optional[str] = None
+        # Set by fetch(): validators of a parsed page, to store once its jobs are saved
+        self.new_validators: Optional[PageValidators] = None
 
-    async def fetch(self) -> List[JobData]:
+    async def fetch(
+        self,
+        client: Optional[CrawlClient] = None,
+        validators: Optional[PageValidatorStore] = None,
+    ) -> List[JobData]:
         """
         Fetch and parse jobs from career page.
+        Pass the crawl's shared `client` when fetching many pages at once.
+
+        With a `validators` store the request is conditional; an unchanged
+        page (304, or the same body as last time) returns no jobs without
+        being parsed, and `unchanged` says why. The validators of a newly
+        parsed page are not stored here but kept in `new_validators`; the
+        caller stores them once the jobs are saved, so a lost run does not
+        mark the page as seen. Failures return no jobs and set `error`.
         """
         jobs = []
+        self.unchanged = None
+        self.error = None
+        self.new_validators = None
         
         try:
-            async with httpx.AsyncClient(timeout=10.0, follow_redirects=True) as client:
-                response = await client.get(self.job_url)
-                response.raise_for_status()
-                
-                soup = BeautifulSoup(response.text, 'lxml')
-                job_elements = soup.select(self.selectors.get('job_container', ''))
-                
-                for element in job_elements:
-                    try:
-                        job_data = self._parse_job(element)
-                        if job_data:
-                            jobs.append(job_data)
-                    except Exception as e:
-                        logger.warning(f"Error parsing job element: {e}")
-                        continue
+            stored = await validators.get(self.job_url) if validators else None
+            headers = stored.request_headers() if stored else {}
+            if client is None:
+                async with httpx.AsyncClient(timeout=10.0, follow_redirects=True) as own_client:
+                    response = await own_client.get(self.job_url, headers=headers)
+            else:
+                response = await client.get(self.job_url, headers=headers)
+
+            if response.status_code == 304 and stored:
+                self.unchanged = NOT_MODIFIED
+                return jobs
+            response.raise_for_status()
+
+            current = PageValidators.from_response(response)
+            if stored and stored.body_hash == current.body_hash:
+                self.unchanged = SAME_BODY
+                if (current.etag, current.last_modified) != (stored.etag, stored.last_modified):
+                    await validators.set(self.job_url, current, keep_ttl=True)
+                return jobs
+
+            extracted = await extract_jobs_async(
+                response.text, self.selectors, self.parser, self.parse_subtree
+            )
+            jobs = self._to_jobs(extracted)
+            # An empty parse may be a selector/markup regression: keep re-parsing
+            if jobs:
+                self.new_validators = current
         
         except httpx.HTTPError as e:
+            self.error = f"HTTP error: {e}"
             logger.error(f"HTTP error fetching from {self.job_url}: {e}")
         except Exception as e:
+            self.error = f"Unexpected error: {e}"
             logger.error(f"Unexpected error in CareerPageFetcher: {e}")
         
         return jobs
 
-    def _parse_job(self, element) -> JobData | None:
+    def parse(self, html: str) -> List[JobData]:
         """
-        Parse a single job element from the page.
+        Extract jobs from a downloaded career page.
         """
-        try:
-            title_elem = element.select_one(self.selectors.get('title', ''))
-            location_elem = element.select_one(self.selectors.get('location', ''))
-            link_elem = element.select_one(self.selectors.get('link', ''))
-            description_elem = element.select_one(self.selectors.get('description', ''))
-            
-            if not title_elem or not link_elem:
-                return None
-            
-            title = title_elem.get_text(strip=True)
-            location = location_elem.get_text(strip=True) if location_elem else None
-            apply_link = link_elem.get('href', '')
-            description = description_elem.get_text(strip=True) if description_elem else None
+        return self._to_jobs(extract_jobs(html, self.selectors, self.parser, self.parse_subtree))
+
+    def _to_jobs(self, extracted: List[ExtractedJob]) -> List[JobData]:
+        jobs = []
+        for item in extracted:
+            apply_link = item.link
             
             # Make absolute URL if needed
             if apply_link and not apply_link.startswith('http'):
                 apply_link = self.base_url.rstrip('/') + '/' + apply_link.lstrip('/')
             
-            return JobData(
-                title=title,
+            jobs.append(JobData(
+                title=item.title,
                 company=self.company,
-                location=location,
-                description=description,
+                location=item.location,
+                description=item.description,
                 apply_link=apply_link,
                 source=self.source,
-            )
-        
-        except Exception as e:
-            logger.debug(f"Error parsing job element: {e}")
-            return None
-
-    
+            ))
+        return jobs
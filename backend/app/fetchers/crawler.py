@@ -0,0 +1,102 @@
+"""
+Shared HTTP client for crawling many sites concurrently.
+
+A crawl run opens one pooled httpx.AsyncClient and hands it to every
+fetcher. Requests pass through a global concurrency cap and a per-host
+limiter: at most `per_host_concurrency` requests in flight to a host, with
+request starts to the same host spaced at least `host_delay_seconds`
+apart. Fanning out over every source stays polite to each site.
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "job-aggregator/1.0"
+
+
+@dataclass
+class _HostSlot:
+    """Limiter state for one host."""
+    in_flight: asyncio.Semaphore
+    spacing: asyncio.Lock = field(default_factory=asyncio.Lock)
+    next_start: float = 0.0
+
+
+class CrawlClient:
+    """
+    Pooled, rate-limited HTTP client shared by the fetchers of one crawl.
+
+    Use as an async context manager; `get` takes the same arguments as
+    httpx.AsyncClient.get.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = settings.crawl_max_concurrency,
+        per_host_concurrency: int = settings.crawl_per_host_concurrency,
+        host_delay_seconds: float = settings.crawl_host_delay_seconds,
+        request_timeout_seconds: float = settings.crawl_request_timeout_seconds,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.max_concurrency = max_concurrency
+        self.per_host_concurrency = per_host_concurrency
+        self.host_delay_seconds = host_delay_seconds
+        self.request_timeout_seconds = request_timeout_seconds
+        self.transport = transport
+        self.requests = 0
+        self._client: Optional[httpx.AsyncClient] = None
+        self._slots: Dict[str, _HostSlot] = {}
+        self._global: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self) -> "CrawlClient":
+        self._client = httpx.AsyncClient(
+            timeout=self.request_timeout_seconds,
+            follow_redirects=True,
+            headers={"User-Agent": USER_AGENT},
+            limits=httpx.Limits(
+                max_connections=self.max_concurrency,
+                max_keepalive_connections=self.max_concurrency,
+            ),
+            transport=self.transport,
+        )
+        self._global = asyncio.Semaphore(self.max_concurrency)
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        """GET `url` once it is the host's turn and a global slot is free."""
+        if self._client is None:
+            raise RuntimeError("CrawlClient must be used inside 'async with'")
+        # Host first: requests waiting out a politeness delay hold no global slot
+        async with self._host_turn(urlsplit(url).netloc), self._global:
+            self.requests += 1
+            return await self._client.get(url, **kwargs)
+
+    @asynccontextmanager
+    async def _host_turn(self, host: str):
+        slot = self._slots.get(host)
+        if slot is None:
+            slot = self._slots[host] = _HostSlot(asyncio.Semaphore(self.per_host_concurrency))
+        async with slot.in_flight:
+            # Space out request starts; the lock makes waiters queue in order
+            async with slot.spacing:
+                wait = slot.next_start - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                slot.next_start = time.monotonic() + self.host_delay_seconds
+            yield
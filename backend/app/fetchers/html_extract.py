@@ -0,0 +1,310 @@
+"""
+Job extraction from career-page HTML.
+
+Two engines produce the same ExtractedJob tuples:
+
+- "bs4": the original BeautifulSoup (lxml tree builder) + soupsieve path,
+  kept as the reference and as the fallback.
+- "lxml": each config's CSS selectors are compiled once (cssselect ->
+  XPath, cached per process) and evaluated directly on an lxml tree, with
+  no BeautifulSoup object model in between. Text follows BeautifulSoup's
+  get_text(strip=True): every text node stripped and joined, script/style/
+  template contents and comments left out.
+
+With `subtree`, the lxml engine streams the document through a pull
+parser and keeps only job_container subtrees, freeing everything else as
+it goes. This needs a container selector that matches on the element alone
+(tag, class, id, attributes; no combinators or pseudo-classes); other
+selectors, and pages whose containers nest, are parsed as a whole tree.
+Memory stays bounded only as far as libxml2's HTML push parser emits
+events incrementally; some libxml2 versions (2.10) hold back most of a page
+until the end, so the mode is off by default.
+
+Large pages can be parsed in a process pool (settings.career_page_parse_workers).
+"""
+
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from lxml import etree
+
+from app.core.config import settings
+
+try:
+    from cssselect import HTMLTranslator, SelectorError
+    from cssselect import parse as parse_css
+except ImportError:  # optional: without it every page uses the bs4 engine
+    HTMLTranslator = None
+
+logger = logging.getLogger(__name__)
+
+PARSER_ENGINES = ("lxml", "bs4")
+
+# Selector keys read from each job container
+FIELDS = ("title", "location", "link", "description")
+
+# Characters fed to the pull parser at a time in subtree mode
+SUBTREE_FEED_CHARS = 64 * 1024
+
+# Elements whose text BeautifulSoup's get_text() leaves out
+_NON_TEXT_TAGS = {"script", "style", "template"}
+
+
+class ExtractedJob(NamedTuple):
+    """Raw fields of one job container (link is the href as written)."""
+    title: str
+    location: Optional[str]
+    link: str
+    description: Optional[str]
+
+
+# ── BeautifulSoup engine (reference) ─────────────────────────────
+
+def _extract_bs4(html: str, selectors: Dict[str, str]) -> List[ExtractedJob]:
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'lxml')
+    jobs = []
+    for element in soup.select(selectors.get('job_container', '')):
+        try:
+            title_elem = element.select_one(selectors.get('title', ''))
+            location_elem = element.select_one(selectors.get('location', ''))
+            link_elem = element.select_one(selectors.get('link', ''))
+            description_elem = element.select_one(selectors.get('description', ''))
+        except Exception as e:
+            logger.debug(f"Error parsing job element: {e}")
+            continue
+        if not title_elem or not link_elem:
+            continue
+        jobs.append(ExtractedJob(
+            title=title_elem.get_text(strip=True),
+            location=location_elem.get_text(strip=True) if location_elem else None,
+            link=link_elem.get('href', ''),
+            description=description_elem.get_text(strip=True) if description_elem else None,
+        ))
+    return jobs
+
+
+# ── lxml engine ──────────────────────────────────────────────────
+
+class CompiledSelectors(NamedTuple):
+    container: etree.XPath
+    fields: Tuple[etree.XPath, ...]     # in FIELDS order
+    container_self: Optional[etree.XPath]  # element-only match, for subtree streaming
+
+
+def _is_element_only(tree) -> bool:
+    """True if a parsed selector tests nothing but the element itself."""
+    name = type(tree).__name__
+    if name == "Element":
+        return True
+    if name in ("Class", "Hash", "Attrib"):
+        return _is_element_only(tree.selector)
+    return False
+
+
+@lru_cache(maxsize=256)
+def _compile(selector_items: Tuple[Tuple[str, str], ...]) -> Optional[CompiledSelectors]:
+    """
+    Compile a config's selectors to XPath (once per process). None if any
+    selector is missing or not supported by cssselect (the page then goes
+    through the bs4 engine, which behaves exactly as before).
+    """
+    selectors = dict(selector_items)
+    translator = HTMLTranslator()
+    try:
+        container_css = selectors.get('job_container', '')
+        container = etree.XPath(translator.css_to_xpath(container_css, prefix="descendant-or-self::"))
+        # select_one only looks below the container, never at it
+        fields = tuple(
+            etree.XPath(translator.css_to_xpath(selectors.get(field, ''), prefix="descendant::"))
+            for field in FIELDS
+        )
+        parsed = parse_css(container_css)
+        container_self = None
+        if all(s.pseudo_element is None and _is_element_only(s.parsed_tree) for s in parsed):
+            container_self = etree.XPath(translator.css_to_xpath(container_css, prefix="self::"))
+    except (SelectorError, etree.XPathError) as e:
+        logger.info(f"Selectors {selectors} not supported by the lxml engine ({e}); using bs4")
+        return None
+    return CompiledSelectors(container, fields, container_self)
+
+
+_warned_missing_cssselect = False
+
+
+def compile_selectors(selectors: Dict[str, str]) -> Optional[CompiledSelectors]:
+    global _warned_missing_cssselect
+    if HTMLTranslator is None:
+        if not _warned_missing_cssselect:
+            logger.warning("CAREER_PAGE_PARSER is 'lxml' but the 'cssselect' package is missing; using bs4")
+            _warned_missing_cssselect = True
+        return None
+    return _compile(tuple(sorted((k, v) for k, v in selectors.items() if isinstance(v, str))))
+
+
+def _collect_text(node, parts: List[str], own_text: bool) -> None:
+    if own_text and node.text:
+        parts.append(node.text)
+    for child in node:
+        # Comments / processing instructions have non-string tags
+        if isinstance(child.tag, str):
+            _collect_text(child, parts, child.tag not in _NON_TEXT_TAGS)
+        if child.tail:
+            parts.append(child.tail)
+
+
+def element_text(element) -> str:
+    """lxml equivalent of BeautifulSoup's get_text(strip=True)."""
+    parts: List[str] = []
+    _collect_text(element, parts, True)
+    return "".join(part.strip() for part in parts)
+
+
+def _extract_job(container, compiled: CompiledSelectors) -> Optional[ExtractedJob]:
+    title_elem, location_elem, link_elem, description_elem = (
+        next(iter(xpath(container)), None) for xpath in compiled.fields
+    )
+    if title_elem is None or link_elem is None:
+        return None
+    return ExtractedJob(
+        title=element_text(title_elem),
+        location=element_text(location_elem) if location_elem is not None else None,
+        link=link_elem.get('href', ''),
+        description=element_text(description_elem) if description_elem is not None else None,
+    )
+
+
+def _parse_tree(html: str):
+    if not html.strip():
+        return None
+    try:
+        return etree.fromstring(html, etree.HTMLParser())
+    except ValueError:
+        # str input with an XML encoding declaration
+        return etree.fromstring(html.encode("utf-8"), etree.HTMLParser(encoding="utf-8"))
+
+
+def _extract_lxml(html: str, compiled: CompiledSelectors) -> List[ExtractedJob]:
+    root = _parse_tree(html)
+    if root is None:
+        return []
+    jobs = []
+    for container in compiled.container(root):
+        job = _extract_job(container, compiled)
+        if job:
+            jobs.append(job)
+    return jobs
+
+
+class _NestedContainers(Exception):
+    """A job container inside another one; streaming cannot keep document order."""
+
+
+def _extract_lxml_subtree(html: str, compiled: CompiledSelectors) -> List[ExtractedJob]:
+    """
+    Stream the page, keeping only job_container subtrees in memory.
+    """
+    jobs: List[ExtractedJob] = []
+    state = {"open": 0}
+    parser = etree.HTMLPullParser(events=("start", "end"))
+    for offset in range(0, len(html), SUBTREE_FEED_CHARS):
+        parser.feed(html[offset:offset + SUBTREE_FEED_CHARS])
+        _consume_events(parser, compiled, jobs, state)
+    parser.close()
+    _consume_events(parser, compiled, jobs, state)
+    return jobs
+
+
+def _consume_events(parser, compiled: CompiledSelectors, jobs: List[ExtractedJob], state: dict) -> None:
+    for event, element in parser.read_events():
+        if event == "start":
+            if compiled.container_self(element):
+                state["open"] += 1
+                if state["open"] > 1:
+                    raise _NestedContainers()
+            continue
+
+        if state["open"] and compiled.container_self(element):
+            state["open"] -= 1
+            job = _extract_job(element, compiled)
+            if job:
+                jobs.append(job)
+        elif state["open"]:
+            continue  # part of a container that is still being built
+
+        # Done with this element (and everything before it at this level)
+        element.clear(keep_tail=True)
+        parent = element.getparent()
+        if parent is not None:
+            while element.getprevious() is not None:
+                del parent[0]
+
+
+# ── Entry points ─────────────────────────────────────────────────
+
+def extract_jobs(
+    html: str,
+    selectors: Dict[str, str],
+    engine: str = settings.career_page_parser,
+    subtree: bool = settings.career_page_parse_subtree,
+) -> List[ExtractedJob]:
+    """
+    Job containers on a career page, in document order.
+
+    Raises:
+        Exception: the bs4 engine could not evaluate job_container (as before).
+    """
+    if engine not in PARSER_ENGINES:
+        raise ValueError(f"Unknown parser engine '{engine}' (expected one of {PARSER_ENGINES})")
+    compiled = compile_selectors(selectors) if engine == "lxml" else None
+    if compiled is None:
+        return _extract_bs4(html, selectors)
+    if subtree and compiled.container_self is not None:
+        try:
+            return _extract_lxml_subtree(html, compiled)
+        except _NestedContainers:
+            pass
+    return _extract_lxml(html, compiled)
+
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        # spawn: the parent runs threads (scheduler, DB pool), so avoid fork
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.career_page_parse_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _executor
+
+
+async def extract_jobs_async(
+    html: str,
+    selectors: Dict[str, str],
+    engine: str = settings.career_page_parser,
+    subtree: bool = settings.career_page_parse_subtree,
+) -> List[ExtractedJob]:
+    """
+    extract_jobs, in the process pool for pages of at least
+    settings.career_page_parse_pool_min_bytes (when workers are configured).
+    """
+    if settings.career_page_parse_workers <= 0 or len(html) < settings.career_page_parse_pool_min_bytes:
+        return extract_jobs(html, selectors, engine, subtree)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), extract_jobs, html, selectors, engine, subtree)
+
+
+def shutdown_parse_pool() -> None:
+    """Stop the parse pool (called on application shutdown)."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
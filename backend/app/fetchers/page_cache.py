@@ -0,0 +1,98 @@
+"""
+Validators for conditional GETs of career pages.
+
+For each job_url we keep the ETag, Last-Modified and SHA-256 of the body
+last parsed. The next crawl sends If-None-Match / If-Modified-Since; a
+304, or a 200 whose body hashes the same, means the page is unchanged and
+is not parsed again.
+
+Entries expire `ttl_seconds` after the page last changed, so every page is
+fully re-parsed at least that often (its jobs are re-seen before the dedup
+memory and the 30-day cleanup forget them). Redis being down is
+non-critical: requests are sent unconditionally.
+"""
+
+import hashlib
+import json
+import logging
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+import httpx
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.core.config import settings
+from app.core.redis import redis
+
+logger = logging.getLogger(__name__)
+
+
+def body_hash(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+@dataclass
+class PageValidators:
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    body_hash: Optional[str] = None
+
+    @classmethod
+    def from_response(cls, response: httpx.Response) -> "PageValidators":
+        return cls(
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            body_hash=body_hash(response.content),
+        )
+
+    def request_headers(self) -> dict:
+        """Conditional request headers for the next fetch."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class PageValidatorStore:
+    """
+    Redis-backed job_url -> PageValidators.
+    """
+
+    def __init__(
+        self,
+        namespace: str = "crawl:validators",
+        ttl_seconds: int = settings.crawl_validator_ttl_seconds,
+    ):
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+
+    def _key(self, url: str) -> str:
+        return f"{self.namespace}:{hashlib.sha256(url.encode('utf-8')).hexdigest()}"
+
+    async def get(self, url: str) -> Optional[PageValidators]:
+        try:
+            raw = await redis.get(self._key(url))
+        except RedisConnectionError as e:
+            logger.warning("Redis unavailable; fetching %s unconditionally: %s", url, e)
+            return None
+        return PageValidators(**json.loads(raw)) if raw else None
+
+    async def set(self, url: str, validators: PageValidators, keep_ttl: bool = False) -> None:
+        """
+        Store validators. `keep_ttl` refreshes an existing entry without
+        postponing the periodic full re-parse (used when the body did not change).
+        """
+        key, value = self._key(url), json.dumps(asdict(validators))
+        try:
+            if keep_ttl:
+                await redis.set(key, value, keepttl=True, xx=True)
+            else:
+                await redis.set(key, value, ex=self.ttl_seconds)
+        except RedisConnectionError as e:
+            logger.warning("Redis unavailable; skipping page validator write: %s", e)
+
+
+# Shared store
+page_validators = PageValidatorStore()
@@ -0,0 +1,49 @@
+"""
+Token-bucket rate limiting for API fetchers.
+
+Tokens refill continuously at `rate_per_second` up to `capacity`; each
+request takes one. Bursts up to `capacity` go out at once, after which
+requests are spaced to the refill rate, so throughput follows the quota
+instead of round-trip latency.
+"""
+
+import asyncio
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Async token bucket. Waiters are served in arrival order.
+    """
+
+    def __init__(self, rate_per_second: float, capacity: float):
+        if rate_per_second <= 0 or capacity < 1:
+            raise ValueError("rate_per_second must be > 0 and capacity >= 1")
+        self.rate_per_second = rate_per_second
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.acquired = 0
+        self._updated = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+
+    @classmethod
+    def per_minute(cls, requests_per_minute: float, burst: float) -> "TokenBucket":
+        return cls(requests_per_minute / 60.0, burst)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate_per_second)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            self._refill()
+            if self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate_per_second)
+                self._refill()
+            self.tokens -= 1
+            self.acquired += 1
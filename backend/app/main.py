@@ -5,9 +5,19 @@ from fastapi.middleware.cors import CORSMiddleware
 import os
 
 from app.core.config import settings
-from app.core.database import engine
+from app.core.database import engine, SessionLocal
 from app.core.scheduler import start_background_scheduler, stop_background_scheduler
 from app.core.init_db import init_db
+from app.services.embedding_index import embedding_index
+from app.services.ann_index import load_or_build_ann_index
+from app.services.pdf_extraction import pdf_extraction_pool
+from app.fetchers.html_extract import shutdown_parse_pool
+from app.services.embedding_service import close_http_client
+from app.services.embedding_batcher import embedding_batcher
+from app.services.embedding_cache import embedding_cache
+from app.services.backfill_worker import backfill_worker
+from app.services.fetcher_service import career_page_metrics
+from app.services.ingest_pipeline import ingest_metrics
 from app.api.job_routes import router as jobs_router
 from app.api.alert_routes import router as alerts_router
 from app.api.match_routes import router as match_router
@@ -24,6 +34,21 @@ ALLOWED_ORIGINS = os.getenv(
 ).split(",")
 
 
+def _load_embedding_index():
+    """
+    Build the in-memory embedding matrix and ANN index used by resume matching.
+    Non-fatal: if it fails, the scheduler's index sync job retries the build.
+    """
+    db = SessionLocal()
+    try:
+        embedding_index.rebuild(db)
+        load_or_build_ann_index()
+    except Exception as e:
+        logger.error(f"Embedding index build failed: {e}", exc_info=True)
+    finally:
+        db.close()
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
@@ -34,6 +59,7 @@ async def lifespan(app: FastAPI):
         logger.info("Starting up...")
         init_db()  # Initialize database schema only if empty
         logger.info("Database initialized successfully.")
+        _load_embedding_index()
         if settings.scheduler_enabled:
             start_background_scheduler()
             logger.info("Background scheduler started.")
@@ -49,6 +75,9 @@ async def lifespan(app: FastAPI):
         logger.info("Shutting down...")
         if settings.scheduler_enabled:
             stop_background_scheduler()
+        pdf_extraction_pool.shutdown()
+        shutdown_parse_pool()
+        await close_http_client()
         engine.dispose()
         logger.info("Shutdown cleanup complete.")
     except Exception as e:
@@ -88,3 +117,15 @@ async def root():
 async def health_check():
     """Health check for load balancers and monitoring."""
     return {"status": "ok"}
+
+
+@app.get("/metrics")
+async def metrics():
+    """In-process performance counters (per worker)."""
+    return {
+        "embedding_batcher": embedding_batcher.metrics(),
+        "embedding_cache": embedding_cache.metrics(),
+        "backfill": backfill_worker.metrics(),
+        "career_pages": career_page_metrics(),
+        "ingest": ingest_metrics(),
+    }
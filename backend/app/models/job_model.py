@@ -1,10 +1,16 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, JSON
-from sqlalchemy.sql import func
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, JSON, LargeBinary, Index, or_
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import query_expression
+from sqlalchemy.sql import func, false
 from app.core.database import Base
 
 
 class Job(Base):
     __tablename__ = "jobs"
+    __table_args__ = (
+        # Keyset pagination for GET /jobs (newest first)
+        Index("ix_jobs_created_at_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     
@@ -18,6 +24,10 @@ class Job(Base):
     
     # Description
     description = Column(Text)
+
+    # Leading characters of the description, computed in SQL by summary
+    # queries (see job_repository.summary_options); None otherwise
+    snippet = query_expression()
     
     # URL to original posting
     apply_link = Column(String(2048), unique=True, nullable=False)
@@ -36,12 +46,38 @@ class Job(Base):
     # Additional fields (skills, requirements, etc.)
     job_metadata = Column(JSON, default=lambda: {})
 
-    # Vector embedding for semantic matching (list of floats)
-    embedding = Column(JSON, nullable=True)
+    # Vector embedding for semantic matching, packed little-endian
+    # (see services/embedding_codec.py) with its dimension and dtype
+    embedding_packed = Column(LargeBinary, nullable=True)
+    embedding_dim = Column(Integer, nullable=True)
+    embedding_dtype = Column(String(8), nullable=True)
+
+    # Legacy JSON list of floats; emptied as rows are migrated to embedding_packed.
+    # none_as_null: None must be SQL NULL (not JSON 'null') for IS NULL filters
+    embedding = Column(JSON(none_as_null=True), nullable=True)
+
+    # SHA-256 of the normalized embedding text (title + description);
+    # the embedding is cleared and re-queued when this changes
+    text_fingerprint = Column(String(64), nullable=True)
+
+    # Backfill lease: a worker owns this job's embedding until then (NULL = unclaimed)
+    embedding_claimed_until = Column(DateTime(timezone=True), nullable=True)
+
+    # Whether title/description/company/location are in the job_terms index
+    keywords_indexed = Column(Boolean, default=False, nullable=False, server_default=false())
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
+    @hybrid_property
+    def has_embedding(self):
+        """True if the job has a vector in either storage format."""
+        return self.embedding_packed is not None or self.embedding is not None
+
+    @has_embedding.expression
+    def has_embedding(cls):
+        return or_(cls.embedding_packed.isnot(None), cls.embedding.isnot(None))
+
     def __repr__(self):
         return f"<Job(id={self.id}, title='{self.title}', company='{self.company}')>"
@@ -0,0 +1,57 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
+from app.core.database import Base
+
+
+class JobTerm(Base):
+    """
+    Inverted keyword index: one posting per (term, job, field).
+    Lets resume keyword scoring touch only jobs that share a term.
+    """
+    __tablename__ = "job_terms"
+
+    # Lookup key first so `WHERE term IN (...)` is an index range scan
+    term = Column(String(100), primary_key=True)
+    job_id = Column(Integer, ForeignKey("jobs.id", ondelete="CASCADE"), primary_key=True)
+
+    # Which job field the term came from: title, description, company, location
+    field = Column(String(20), primary_key=True)
+
+    # Occurrences of the term in the field, and the field's token count (BM25)
+    tf = Column(Integer, nullable=False, default=1, server_default="1")
+    field_length = Column(Integer, nullable=False, default=0, server_default="0")
+
+    __table_args__ = (
+        Index("ix_job_terms_job_id", "job_id"),
+    )
+
+    def __repr__(self):
+        return f"<JobTerm(term='{self.term}', job_id={self.job_id}, field='{self.field}')>"
+
+
+class TermStat(Base):
+    """
+    Document frequency of a term per field over active jobs (BM25 idf).
+    Recomputed from job_terms by KeywordIndex.refresh_stats().
+    """
+    __tablename__ = "term_stats"
+
+    term = Column(String(100), primary_key=True)
+    field = Column(String(20), primary_key=True)
+    doc_freq = Column(Integer, nullable=False)
+
+    def __repr__(self):
+        return f"<TermStat(term='{self.term}', field='{self.field}', doc_freq={self.doc_freq})>"
+
+
+class FieldStat(Base):
+    """
+    Per-field corpus totals over active jobs (BM25 length normalization).
+    """
+    __tablename__ = "field_stats"
+
+    field = Column(String(20), primary_key=True)
+    doc_count = Column(Integer, nullable=False)
+    total_length = Column(Integer, nullable=False)
+
+    def __repr__(self):
+        return f"<FieldStat(field='{self.field}', doc_count={self.doc_count}, total_length={self.total_length})>"
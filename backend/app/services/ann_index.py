@@ -0,0 +1,347 @@
+"""
+Approximate nearest-neighbour (ANN) retrieval over job embeddings.
+
+Lets resume matching pull the top few hundred semantic candidates from the
+whole active corpus instead of brute-forcing a fixed window of rows.
+
+Indexes are pluggable (see ANN_INDEX_TYPES) and sit on top of the shared
+EmbeddingIndex: they only store a coarse structure over job ids, and read
+vectors from the current embedding matrix at query time.
+"""
+
+import logging
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.embedding_index import EmbeddingIndex, embedding_index, normalize_rows
+
+logger = logging.getLogger(__name__)
+
+BACKEND_ROOT = Path(__file__).parent.parent.parent
+
+
+def _top_k(ids: np.ndarray, scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Select the k best (id, score) pairs, sorted descending, without a full sort."""
+    if k <= 0 or not len(ids):
+        return ids[:0], scores[:0]
+    if len(ids) > k:
+        part = np.argpartition(-scores, k - 1)[:k]
+        ids, scores = ids[part], scores[part]
+    order = np.argsort(-scores, kind="stable")
+    return ids[order], scores[order]
+
+
+class AnnIndex(ABC):
+    """
+    Candidate generator over the vectors held by an EmbeddingIndex.
+    """
+
+    def __init__(self, vectors: EmbeddingIndex):
+        self.vectors = vectors
+
+    @abstractmethod
+    def search(self, query: List[float], k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return (job_ids, cosine_scores) of up to k nearest jobs, best first.
+        """
+
+    def build(self) -> None:
+        """(Re)build the index from the current vectors. No-op by default."""
+
+    def needs_rebuild(self) -> bool:
+        """Whether build() should be called again. False by default."""
+        return False
+
+    def save(self, path: Path) -> None:
+        """Persist the index to disk. No-op by default."""
+
+    def load(self, path: Path) -> bool:
+        """Load a persisted index. Returns True on success."""
+        return False
+
+
+class ExactIndex(AnnIndex):
+    """
+    Brute-force search over every indexed job (exact, linear time).
+    Also serves as the ground truth for recall benchmarks.
+    """
+
+    def search(self, query: List[float], k: int) -> Tuple[np.ndarray, np.ndarray]:
+        ids, scores = self.vectors.score(query)
+        return _top_k(ids, scores, k)
+
+
+class IvfFlatIndex(AnnIndex):
+    """
+    Inverted-file index with exact ("flat") scoring inside each list.
+
+    Training runs spherical k-means on the normalized vectors to get
+    `nlist` centroids; each job is assigned to its nearest centroid.
+    A query scores only the jobs in its `nprobe` closest lists, so cost
+    grows with N * nprobe / nlist rather than N.
+
+    Jobs added to or removed from the EmbeddingIndex after training are
+    picked up incrementally (assigned to their nearest centroid) the next
+    time the index is searched. Retraining is left to the caller (see
+    needs_rebuild) so it never runs on the request path.
+    """
+
+    def __init__(
+        self,
+        vectors: EmbeddingIndex,
+        nlist: int = 0,
+        nprobe: int = 16,
+        min_corpus_size: int = 2000,
+        train_iterations: int = 10,
+        train_sample_size: int = 20000,
+        seed: int = 0,
+    ):
+        super().__init__(vectors)
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.min_corpus_size = min_corpus_size
+        self.train_iterations = train_iterations
+        self.train_sample_size = train_sample_size
+        self.seed = seed
+
+        self._lock = threading.Lock()
+        self._centroids: Optional[np.ndarray] = None
+        self._assign: Dict[int, int] = {}
+        self._list_ids: List[np.ndarray] = []
+        self._trained_size = 0
+        self._synced_snapshot = None
+
+    @property
+    def is_trained(self) -> bool:
+        return self._centroids is not None
+
+    # ── Build / persist ──────────────────────────────────────────
+
+    def build(self) -> None:
+        snapshot = self.vectors.snapshot()
+        n = len(snapshot.ids)
+        if n < max(self.min_corpus_size, 1):
+            logger.info(f"IVF index: corpus too small to train ({n} jobs), using exact search")
+            with self._lock:
+                self._reset()
+            return
+
+        nlist = self.nlist or max(1, int(np.sqrt(n)))
+        nlist = min(nlist, n)
+        centroids = self._train_centroids(snapshot, nlist)
+        # argmax over centroids is unaffected by per-row scales, so int8 rows work as-is
+        assignments = self._nearest_centroid(snapshot.matrix, centroids)
+
+        with self._lock:
+            self._centroids = centroids
+            self._assign = dict(zip(snapshot.ids.tolist(), assignments.tolist()))
+            self._rebuild_lists()
+            self._trained_size = n
+            self._synced_snapshot = snapshot
+
+        logger.info(f"IVF index built: {n} jobs in {nlist} lists (nprobe={self.nprobe})")
+
+    def needs_rebuild(self) -> bool:
+        """
+        True when the index was never trained but the corpus is now big
+        enough, or the corpus has doubled since the last training run.
+        """
+        n = len(self.vectors)
+        if not self.is_trained:
+            return n >= max(self.min_corpus_size, 1)
+        return n >= 2 * self._trained_size
+
+    def save(self, path: Path) -> None:
+        with self._lock:
+            if not self.is_trained:
+                return
+            ids = np.fromiter(self._assign.keys(), dtype=np.int64, count=len(self._assign))
+            lists = np.fromiter(self._assign.values(), dtype=np.int32, count=len(self._assign))
+            centroids = self._centroids
+            trained_size = self._trained_size
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp.npz")
+        np.savez(tmp_path, centroids=centroids, ids=ids, lists=lists, trained_size=trained_size)
+        tmp_path.replace(path)
+        logger.info(f"IVF index saved to {path}")
+
+    def load(self, path: Path) -> bool:
+        if not path.exists():
+            return False
+        try:
+            with np.load(path) as data:
+                centroids = data["centroids"].astype(np.float32)
+                ids, lists = data["ids"], data["lists"]
+                trained_size = int(data["trained_size"])
+        except Exception as e:
+            logger.warning(f"Could not load IVF index from {path}: {e}")
+            return False
+
+        if self.vectors.dim and centroids.shape[1] != self.vectors.dim:
+            logger.warning(
+                f"IVF index at {path} has dim {centroids.shape[1]}, "
+                f"embeddings have dim {self.vectors.dim}; ignoring it"
+            )
+            return False
+
+        with self._lock:
+            self._centroids = centroids
+            self._assign = dict(zip(ids.tolist(), lists.tolist()))
+            self._rebuild_lists()
+            self._trained_size = trained_size
+            self._synced_snapshot = None
+        logger.info(f"IVF index loaded from {path}: {len(ids)} jobs, {len(centroids)} lists")
+        return True
+
+    # ── Search ───────────────────────────────────────────────────
+
+    def search(self, query: List[float], k: int) -> Tuple[np.ndarray, np.ndarray]:
+        if not self.is_trained:
+            return ExactIndex(self.vectors).search(query, k)
+
+        snapshot = self.vectors.snapshot()
+        self._sync(snapshot)
+        with self._lock:
+            centroids, list_ids = self._centroids, self._list_ids
+        if centroids is None:
+            return ExactIndex(self.vectors).search(query, k)
+
+        q = self.vectors.normalize_query(query, snapshot)
+        if q is None:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        centroid_scores = centroids @ q
+        nprobe = min(self.nprobe, len(centroid_scores))
+        probe = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]
+
+        candidates = np.concatenate([list_ids[i] for i in probe])
+        rows = self.vectors.rows_for(candidates, snapshot)
+        present = rows >= 0
+        candidates, rows = candidates[present], rows[present]
+        scores = snapshot.dot(q, rows)
+        return _top_k(candidates, scores, k)
+
+    # ── Internals ────────────────────────────────────────────────
+
+    def _reset(self) -> None:
+        self._centroids = None
+        self._assign = {}
+        self._list_ids = []
+        self._trained_size = 0
+        self._synced_snapshot = None
+
+    def _sync(self, snapshot) -> None:
+        """Assign jobs added since the last sync; drop jobs that were removed."""
+        if snapshot is self._synced_snapshot:
+            return
+        with self._lock:
+            if snapshot is self._synced_snapshot or not self.is_trained:
+                return
+            known = np.fromiter(self._assign.keys(), dtype=np.int64, count=len(self._assign))
+            added = np.setdiff1d(snapshot.ids, known, assume_unique=True)
+            removed = np.setdiff1d(known, snapshot.ids, assume_unique=True)
+
+            for job_id in removed.tolist():
+                del self._assign[job_id]
+            if len(added):
+                rows = self.vectors.rows_for(added, snapshot)
+                lists = self._nearest_centroid(snapshot.matrix[rows], self._centroids)
+                self._assign.update(zip(added.tolist(), lists.tolist()))
+            if len(added) or len(removed):
+                self._rebuild_lists()
+            self._synced_snapshot = snapshot
+
+    def _rebuild_lists(self) -> None:
+        """Group job ids by list into one array per centroid."""
+        nlist = len(self._centroids)
+        ids = np.fromiter(self._assign.keys(), dtype=np.int64, count=len(self._assign))
+        lists = np.fromiter(self._assign.values(), dtype=np.int64, count=len(self._assign))
+        order = np.argsort(lists, kind="stable")
+        bounds = np.searchsorted(lists[order], np.arange(nlist + 1))
+        sorted_ids = ids[order]
+        self._list_ids = [sorted_ids[bounds[i]:bounds[i + 1]] for i in range(nlist)]
+
+    def _train_centroids(self, snapshot, nlist: int) -> np.ndarray:
+        """Spherical k-means on (a sample of) the normalized vectors."""
+        rng = np.random.default_rng(self.seed)
+        n = len(snapshot.ids)
+        if n > self.train_sample_size:
+            train = snapshot.vectors(rng.choice(n, self.train_sample_size, replace=False))
+        else:
+            train = snapshot.vectors()
+
+        centroids = train[rng.choice(len(train), nlist, replace=False)].copy()
+        for _ in range(self.train_iterations):
+            assignments = self._nearest_centroid(train, centroids)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, train)
+            counts = np.bincount(assignments, minlength=nlist)
+            centroids = normalize_rows(sums)
+
+            # Re-seed empty clusters with random training points
+            empty = np.flatnonzero(counts == 0)
+            if len(empty):
+                centroids[empty] = train[rng.choice(len(train), len(empty), replace=False)]
+        return centroids
+
+    @staticmethod
+    def _nearest_centroid(vectors: np.ndarray, centroids: np.ndarray, chunk_size: int = 8192) -> np.ndarray:
+        """Index of the most similar centroid for each vector (chunked to bound memory)."""
+        out = np.empty(len(vectors), dtype=np.int64)
+        for start in range(0, len(vectors), chunk_size):
+            block = vectors[start:start + chunk_size]
+            out[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+        return out
+
+
+ANN_INDEX_TYPES = {
+    "exact": ExactIndex,
+    "ivf_flat": IvfFlatIndex,
+}
+
+
+def create_ann_index(index_type: str, vectors: EmbeddingIndex = embedding_index) -> AnnIndex:
+    """Instantiate an ANN index by name, configured from settings."""
+    if index_type not in ANN_INDEX_TYPES:
+        raise ValueError(f"Unknown ANN index type '{index_type}' (expected one of {list(ANN_INDEX_TYPES)})")
+    if index_type == "ivf_flat":
+        return IvfFlatIndex(
+            vectors,
+            nlist=settings.ann_nlist,
+            nprobe=settings.ann_nprobe,
+            min_corpus_size=settings.ann_min_corpus_size,
+        )
+    return ANN_INDEX_TYPES[index_type](vectors)
+
+
+def ann_index_path() -> Path:
+    """Configured on-disk location of the persisted index."""
+    path = Path(settings.ann_index_path)
+    return path if path.is_absolute() else BACKEND_ROOT / path
+
+
+def load_or_build_ann_index() -> None:
+    """
+    Load the persisted index if it matches the current embeddings,
+    otherwise build it from the embedding matrix and persist it.
+    """
+    path = ann_index_path()
+    if ann_index.load(path) and not ann_index.needs_rebuild():
+        return
+    rebuild_ann_index()
+
+
+def rebuild_ann_index() -> None:
+    """Retrain the shared index from the embedding matrix and persist it."""
+    ann_index.build()
+    ann_index.save(ann_index_path())
+
+
+# Shared index for the whole process (loaded or built at startup)
+ann_index = create_ann_index(settings.ann_index_type)
@@ -0,0 +1,258 @@
+"""
+Adaptive embedding backfill.
+
+Jobs are saved without embeddings and picked up here. Instead of a fixed
+batch of one job per run, the worker sizes its work with AIMD (additive
+increase, multiplicative decrease): while batches come back within the
+latency target it grows the batch size, then the number of batches in
+flight, one step per round. A slow round halves the batch size; a failed
+or timed-out round halves both and pauses the worker with exponential
+backoff. The free-tier embedding service gets as much work as it can
+absorb without being pushed into timeouts.
+
+Jobs are leased through JobRepository.claim_jobs_without_embeddings, so
+several workers (one per API process, plus the backfill script) can run
+at once without embedding the same job twice.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.job_model import Job
+from app.services.embedding_service import EmbeddingService
+from app.services.job_repository import JobRepository
+
+logger = logging.getLogger(__name__)
+
+# Batch-size increase per healthy round
+ADDITIVE_STEP = 2
+
+# First pause after a failed round (doubles on each further failure)
+BASE_BACKOFF_SECONDS = 30.0
+
+# Window used for the drain-rate estimate
+DRAIN_WINDOW_SECONDS = 600.0
+
+# Smoothing factor for the latency / error-rate moving averages
+EWMA_ALPHA = 0.3
+
+
+@dataclass
+class AimdController:
+    """
+    Batch size and concurrency for the next backfill round.
+    """
+    min_batch_size: int = 1
+    max_batch_size: int = 64
+    max_concurrency: int = 4
+    target_latency_seconds: float = 20.0
+    max_backoff_seconds: float = 900.0
+    batch_size: int = 1
+    concurrency: int = 1
+    backoff_seconds: float = 0.0
+
+    @classmethod
+    def from_settings(cls) -> "AimdController":
+        return cls(
+            min_batch_size=settings.backfill_min_batch_size,
+            max_batch_size=settings.backfill_max_batch_size,
+            max_concurrency=settings.backfill_max_concurrency,
+            target_latency_seconds=settings.backfill_target_latency_seconds,
+            max_backoff_seconds=settings.backfill_max_backoff_seconds,
+            batch_size=settings.backfill_min_batch_size,
+        )
+
+    def on_success(self, latency_seconds: float) -> None:
+        """Every batch of the round succeeded; the slowest took `latency_seconds`."""
+        self.backoff_seconds = 0.0
+        if latency_seconds > self.target_latency_seconds:
+            if self.batch_size > self.min_batch_size:
+                self.batch_size = max(self.min_batch_size, self.batch_size // 2)
+            else:
+                self.concurrency = max(1, self.concurrency - 1)
+        elif self.batch_size < self.max_batch_size:
+            self.batch_size = min(self.max_batch_size, self.batch_size + ADDITIVE_STEP)
+        elif self.concurrency < self.max_concurrency:
+            self.concurrency += 1
+
+    def on_failure(self) -> None:
+        """A batch failed or timed out: halve everything and back off."""
+        self.batch_size = max(self.min_batch_size, self.batch_size // 2)
+        self.concurrency = max(1, self.concurrency // 2)
+        self.backoff_seconds = min(
+            self.max_backoff_seconds,
+            self.backoff_seconds * 2 if self.backoff_seconds else BASE_BACKOFF_SECONDS,
+        )
+
+
+class BackfillWorker:
+    """
+    Embeds jobs missing a vector in adaptive rounds and tracks progress.
+
+    Each run keeps starting rounds until the backlog is empty, a round
+    fails, or the run budget is spent (so runs never overlap the next
+    scheduled one).
+    """
+
+    def __init__(
+        self,
+        controller: Optional[AimdController] = None,
+        run_budget_seconds: float = settings.backfill_run_budget_seconds,
+        lease_seconds: int = settings.backfill_lease_seconds,
+        session_factory=SessionLocal,
+    ):
+        self.controller = controller or AimdController.from_settings()
+        self.run_budget_seconds = run_budget_seconds
+        self.lease_seconds = lease_seconds
+        self.session_factory = session_factory
+        self.embedding_service = EmbeddingService()
+        self.paused_until = 0.0
+        self.backlog: Optional[int] = None
+        self.rounds = 0
+        self.failed_rounds = 0
+        self.embedded_total = 0
+        self.latency_ewma: Optional[float] = None
+        self.error_rate_ewma = 0.0
+        self._started = time.monotonic()
+        self._drained: Deque[Tuple[float, int]] = deque()
+
+    async def run_once(self) -> int:
+        """
+        One scheduled backfill run. Returns the number of jobs embedded.
+        """
+        now = time.monotonic()
+        if now < self.paused_until:
+            logger.info(f"Backfill: backing off for another {self.paused_until - now:.0f}s")
+            return 0
+
+        deadline = now + self.run_budget_seconds
+        embedded = 0
+        db = self.session_factory()
+        try:
+            repo = JobRepository(db)
+            while time.monotonic() < deadline:
+                batch_size = self.controller.batch_size
+                concurrency = self.controller.concurrency
+                jobs = repo.claim_jobs_without_embeddings(
+                    limit=batch_size * concurrency, lease_seconds=self.lease_seconds
+                )
+                if not jobs:
+                    break
+
+                chunks = [jobs[i:i + batch_size] for i in range(0, len(jobs), batch_size)]
+                results = await asyncio.gather(*(self._embed_chunk(chunk) for chunk in chunks))
+
+                pairs = []
+                unfinished: List[int] = []
+                failed = False
+                slowest = 0.0
+                for chunk, (embeddings, latency) in zip(chunks, results):
+                    slowest = max(slowest, latency)
+                    if embeddings is None:
+                        failed = True
+                        unfinished.extend(job.id for job in chunk)
+                        continue
+                    for job, emb in zip(chunk, embeddings):
+                        if emb is not None:
+                            fingerprint = EmbeddingService.job_text_fingerprint(job.title, job.description)
+                            pairs.append((job.id, emb, fingerprint))
+                        else:
+                            unfinished.append(job.id)
+
+                if pairs:
+                    updated = repo.update_embeddings_batch(pairs)
+                    embedded += updated
+                    self._record_drained(updated)
+                # Let other workers retry right away instead of waiting out the lease
+                repo.release_embedding_claims(unfinished)
+
+                self._observe(failed, slowest)
+                if failed:
+                    self.paused_until = time.monotonic() + self.controller.backoff_seconds
+                    logger.warning(
+                        f"Backfill: embedding round failed after {slowest:.1f}s; "
+                        f"batch_size={self.controller.batch_size}, "
+                        f"concurrency={self.controller.concurrency}, "
+                        f"pausing {self.controller.backoff_seconds:.0f}s"
+                    )
+                    break
+                if not pairs:
+                    # Service answered without usable vectors; do not spin on the same rows
+                    break
+
+            self.backlog = repo.count_jobs_without_embeddings()
+        finally:
+            db.close()
+
+        if embedded:
+            logger.info(
+                f"Backfill: embedded {embedded} jobs; backlog={self.backlog}, "
+                f"batch_size={self.controller.batch_size}, concurrency={self.controller.concurrency}, "
+                f"drain_rate={self.drain_rate_per_minute():.1f}/min"
+            )
+        return embedded
+
+    async def _embed_chunk(self, jobs: List[Job]) -> Tuple[Optional[List[List[float]]], float]:
+        """Embed one batch in a single request. Returns (embeddings or None, seconds)."""
+        texts = [
+            EmbeddingService.build_job_text(job.title or "", job.description or "")
+            for job in jobs
+        ]
+        start = time.monotonic()
+        embeddings = await self.embedding_service.embed_batch(texts, batch_size=len(texts))
+        return embeddings, time.monotonic() - start
+
+    def _observe(self, failed: bool, latency_seconds: float) -> None:
+        self.rounds += 1
+        if failed:
+            self.failed_rounds += 1
+            self.controller.on_failure()
+        else:
+            self.controller.on_success(latency_seconds)
+            self.latency_ewma = latency_seconds if self.latency_ewma is None else (
+                EWMA_ALPHA * latency_seconds + (1 - EWMA_ALPHA) * self.latency_ewma
+            )
+        self.error_rate_ewma = EWMA_ALPHA * float(failed) + (1 - EWMA_ALPHA) * self.error_rate_ewma
+
+    # ── Progress ─────────────────────────────────────────────────
+
+    def _record_drained(self, count: int) -> None:
+        now = time.monotonic()
+        self.embedded_total += count
+        self._drained.append((now, count))
+        while self._drained and self._drained[0][0] < now - DRAIN_WINDOW_SECONDS:
+            self._drained.popleft()
+
+    def drain_rate_per_minute(self) -> float:
+        """Jobs embedded per minute over the last few minutes."""
+        now = time.monotonic()
+        window = min(DRAIN_WINDOW_SECONDS, max(now - self._started, 60.0))
+        recent = sum(count for ts, count in self._drained if ts >= now - window)
+        return recent * 60.0 / window
+
+    def metrics(self) -> dict:
+        """Backlog, drain rate and current AIMD state."""
+        rate = self.drain_rate_per_minute()
+        return {
+            "backlog": self.backlog,
+            "drain_rate_per_minute": round(rate, 2),
+            "eta_minutes": round(self.backlog / rate, 1) if self.backlog and rate else None,
+            "batch_size": self.controller.batch_size,
+            "concurrency": self.controller.concurrency,
+            "latency_ewma_seconds": round(self.latency_ewma, 3) if self.latency_ewma is not None else None,
+            "error_rate": round(self.error_rate_ewma, 3),
+            "paused_for_seconds": round(max(0.0, self.paused_until - time.monotonic()), 1),
+            "rounds": self.rounds,
+            "failed_rounds": self.failed_rounds,
+            "embedded_total": self.embedded_total,
+        }
+
+
+# Shared worker (its AIMD state persists across scheduled runs)
+backfill_worker = BackfillWorker()
@@ -1,5 +1,6 @@
 from dataclasses import dataclass
 import logging
+from typing import List
 
 from redis.exceptions import ConnectionError as RedisConnectionError
 
@@ -24,6 +25,17 @@ class DedupService:
             # Return False so the job is processed (database dedup will catch it)
             return False
 
+    async def seen_many(self, dedup_hashes: List[str]) -> List[bool]:
+        """Which hashes are already known, in one round trip. All False if Redis is down."""
+        if not dedup_hashes:
+            return []
+        keys = [f"{self.namespace}:{dedup_hash}" for dedup_hash in dedup_hashes]
+        try:
+            return [value is not None for value in await redis.mget(keys)]
+        except RedisConnectionError as e:
+            logger.warning("Redis unavailable; skipping dedup check: %s", e)
+            return [False] * len(dedup_hashes)
+
     async def mark_seen(self, dedup_hash: str) -> None:
         """Mark hash as seen in Redis. Non-critical if Redis is down."""
         key = f"{self.namespace}:{dedup_hash}"
@@ -31,3 +43,15 @@ class DedupService:
             await redis.set(key, "1", ex=self.ttl_seconds)
         except RedisConnectionError as e:
             logger.warning("Redis unavailable; skipping dedup mark: %s", e)
+
+    async def mark_many(self, dedup_hashes: List[str]) -> None:
+        """Mark hashes as seen in one round trip. Non-critical if Redis is down."""
+        if not dedup_hashes:
+            return
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                for dedup_hash in dedup_hashes:
+                    pipe.set(f"{self.namespace}:{dedup_hash}", "1", ex=self.ttl_seconds)
+                await pipe.execute()
+        except RedisConnectionError as e:
+            logger.warning("Redis unavailable; skipping dedup mark: %s", e)
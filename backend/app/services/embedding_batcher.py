@@ -0,0 +1,136 @@
+"""
+Request-coalescing micro-batcher for single-text embeddings.
+
+Concurrent /match/resume calls each need one embedding. Instead of one
+/embed round trip per request, the batcher holds requests for a few
+milliseconds (or until a size cap), sends them as a single /embed-batch
+call and fans the vectors back out to the waiting coroutines.
+A request that arrives alone is sent to /embed as before.
+"""
+
+import asyncio
+import logging
+import time
+from typing import List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.services.embedding_service import EmbeddingService
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingBatcher:
+    """
+    Coalesces concurrent embed() calls into /embed-batch requests.
+    """
+
+    def __init__(
+        self,
+        max_batch_size: int = settings.embedding_coalesce_max_batch,
+        max_wait_ms: float = settings.embedding_coalesce_wait_ms,
+    ):
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_seconds = max(0.0, max_wait_ms) / 1000
+        self._pending: List[Tuple[str, asyncio.Future, float]] = []
+        self._timer: Optional[asyncio.Task] = None
+        self._in_flight: Set[asyncio.Task] = set()
+
+        # Metrics
+        self._batches = 0
+        self._items = 0
+        self._max_batch_seen = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    async def embed(self, text: str) -> Optional[List[float]]:
+        """
+        Embed one text, sharing a service call with concurrent callers.
+        Returns None if the service is unavailable (same as EmbeddingService.embed).
+        """
+        if not text or not text.strip():
+            logger.warning("Empty text provided to embed()")
+            return None
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((text, future, time.monotonic()))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush(partial=False)
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self._flush_after_wait())
+
+        return await future
+
+    def metrics(self) -> dict:
+        """Batch-size and queue-wait statistics since startup."""
+        return {
+            "batches": self._batches,
+            "requests": self._items,
+            "avg_batch_size": round(self._items / self._batches, 2) if self._batches else 0.0,
+            "max_batch_size": self._max_batch_seen,
+            "avg_queue_wait_ms": round(1000 * self._total_wait / self._items, 2) if self._items else 0.0,
+            "max_queue_wait_ms": round(1000 * self._max_wait, 2),
+            "pending": len(self._pending),
+        }
+
+    # ── Internals ────────────────────────────────────────────────
+
+    async def _flush_after_wait(self) -> None:
+        await asyncio.sleep(self.max_wait_seconds)
+        self._timer = None
+        self._flush(partial=True)
+
+    def _flush(self, partial: bool) -> None:
+        """
+        Hand pending requests to send tasks in chunks of max_batch_size.
+        With partial=False only full batches go out; the rest keeps waiting
+        for the current window to close.
+        """
+        while len(self._pending) >= self.max_batch_size or (partial and self._pending):
+            batch = self._pending[: self.max_batch_size]
+            self._pending = self._pending[self.max_batch_size :]
+            task = asyncio.create_task(self._send(batch))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+        if not self._pending and self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    async def _send(self, batch: List[Tuple[str, asyncio.Future, float]]) -> None:
+        sent_at = time.monotonic()
+        waits = [sent_at - enqueued_at for _, _, enqueued_at in batch]
+        self._record(len(batch), waits)
+
+        texts = [text for text, _, _ in batch]
+        service = EmbeddingService()
+        try:
+            if len(texts) == 1:
+                single = await service.embed(texts[0])
+                embeddings = [single] if single is not None else None
+            else:
+                # Resume texts: keep them out of the job-embedding cache (as embed() does)
+                embeddings = await service.embed_batch(texts, batch_size=len(texts), use_cache=False)
+        except Exception as e:
+            logger.error(f"Embedding batcher error: {e}")
+            embeddings = None
+
+        for i, (_, future, _) in enumerate(batch):
+            if not future.done():
+                future.set_result(embeddings[i] if embeddings else None)
+
+        logger.debug(
+            f"Embedding batch of {len(batch)} sent after {1000 * max(waits):.1f} ms max wait, "
+            f"took {1000 * (time.monotonic() - sent_at):.1f} ms"
+        )
+
+    def _record(self, size: int, waits: List[float]) -> None:
+        self._batches += 1
+        self._items += size
+        self._max_batch_seen = max(self._max_batch_seen, size)
+        self._total_wait += sum(waits)
+        self._max_wait = max(self._max_wait, max(waits))
+
+
+# Shared batcher for the whole process
+embedding_batcher = EmbeddingBatcher()
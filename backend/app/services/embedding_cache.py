@@ -0,0 +1,119 @@
+"""
+Content-addressed embedding store.
+
+The same posting often reaches us through several Adzuna queries, or is
+re-fetched after expiry, producing identical `build_job_text` output.
+Vectors are cached in Redis under the SHA-256 of the whitespace-normalized
+text, so EmbeddingService.embed_batch only sends cache misses over the wire.
+
+Vectors are stored as base64-encoded little-endian float32 (about a third
+of the size of a JSON float list).
+"""
+
+import base64
+import hashlib
+import logging
+import re
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.core.config import settings
+from app.core.redis import redis
+
+logger = logging.getLogger(__name__)
+
+
+def text_hash(text: str) -> str:
+    """SHA-256 of the text with whitespace collapsed and trimmed."""
+    normalized = re.sub(r"\s+", " ", text or "").strip()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def _encode(embedding: Sequence[float]) -> str:
+    return base64.b64encode(np.asarray(embedding, dtype="<f4").tobytes()).decode("ascii")
+
+
+def _decode(raw: str) -> List[float]:
+    return np.frombuffer(base64.b64decode(raw), dtype="<f4").tolist()
+
+
+class EmbeddingCache:
+    """
+    Redis-backed text-hash -> embedding cache with hit/miss counters.
+    Redis being down is non-critical: lookups miss and writes are skipped.
+    """
+
+    def __init__(
+        self,
+        namespace: str = settings.embedding_cache_namespace,
+        ttl_seconds: int = settings.embedding_cache_ttl_seconds,
+    ):
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    def _key(self, digest: str) -> str:
+        return f"{self.namespace}:{digest}"
+
+    async def get_many(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """
+        Cached embeddings for the given texts (None where missing), in order.
+        """
+        if not texts:
+            return []
+        keys = [self._key(text_hash(text)) for text in texts]
+        try:
+            raw_values = await redis.mget(keys)
+        except RedisConnectionError as e:
+            logger.warning("Redis unavailable; skipping embedding cache lookup: %s", e)
+            self.misses += len(texts)
+            return [None] * len(texts)
+
+        results: List[Optional[List[float]]] = []
+        for raw in raw_values:
+            results.append(_decode(raw) if raw else None)
+        found = sum(1 for r in results if r is not None)
+        self.hits += found
+        self.misses += len(texts) - found
+        return results
+
+    async def set_many(self, texts: List[str], embeddings: List[Optional[List[float]]]) -> int:
+        """
+        Store embeddings for the given texts (None entries are skipped).
+        Returns the number of vectors written.
+        """
+        items: Dict[str, str] = {
+            self._key(text_hash(text)): _encode(embedding)
+            for text, embedding in zip(texts, embeddings)
+            if embedding
+        }
+        if not items:
+            return 0
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                for key, value in items.items():
+                    pipe.set(key, value, ex=self.ttl_seconds)
+                await pipe.execute()
+        except RedisConnectionError as e:
+            logger.warning("Redis unavailable; skipping embedding cache write: %s", e)
+            return 0
+        self.writes += len(items)
+        return len(items)
+
+    def metrics(self) -> dict:
+        """Hit/miss counters since startup."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "writes": self.writes,
+        }
+
+
+# Shared cache (counters are per worker process)
+embedding_cache = EmbeddingCache()
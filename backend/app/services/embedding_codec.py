@@ -0,0 +1,89 @@
+"""
+Packed binary encoding for job embeddings.
+
+Vectors are stored in jobs.embedding_packed as raw little-endian bytes,
+with their dimension and dtype in embedding_dim / embedding_dtype. A
+float32 vector decodes with np.frombuffer (no parsing, no copy); float16
+halves the storage and int8 cuts it to a quarter at some precision cost.
+
+int8 payloads are prefixed with a float32 scale (max |x| / 127) so the
+original magnitudes can be restored.
+"""
+
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+
+EMBEDDING_DTYPES = ("float32", "float16", "int8")
+
+_NUMPY_DTYPES = {"float32": "<f4", "float16": "<f2", "int8": "i1"}
+_SCALE_BYTES = 4
+
+
+def pack_embedding(embedding: Sequence[float], dtype: Optional[str] = None) -> Tuple[bytes, int, str]:
+    """
+    Encode a vector (in settings.embedding_storage_dtype by default).
+    Returns (payload, dim, dtype) for the three jobs columns.
+    """
+    dtype = dtype or settings.embedding_storage_dtype
+    if dtype not in _NUMPY_DTYPES:
+        raise ValueError(f"Unsupported embedding dtype '{dtype}' (expected one of {EMBEDDING_DTYPES})")
+    vector = np.asarray(embedding, dtype=np.float32).ravel()
+    if dtype == "int8":
+        peak = float(np.abs(vector).max()) if len(vector) else 0.0
+        scale = peak / 127.0 if peak else 1.0
+        quantized = np.clip(np.rint(vector / scale), -127, 127).astype(np.int8)
+        payload = np.float32(scale).astype("<f4").tobytes() + quantized.tobytes()
+    else:
+        payload = vector.astype(_NUMPY_DTYPES[dtype]).tobytes()
+    return payload, len(vector), dtype
+
+
+def unpack_embedding(payload: Optional[bytes], dim: Optional[int], dtype: Optional[str]) -> Optional[np.ndarray]:
+    """
+    Decode a packed vector to a 1-D float32 array (None if there is none).
+    float32 payloads are returned as a read-only view of the bytes.
+    """
+    if payload is None:
+        return None
+    dtype = dtype or "float32"
+    if dtype == "int8":
+        scale = np.frombuffer(payload, dtype="<f4", count=1)[0]
+        values = np.frombuffer(payload, dtype=np.int8, offset=_SCALE_BYTES)
+        vector = values.astype(np.float32) * scale
+    elif dtype in _NUMPY_DTYPES:
+        vector = np.frombuffer(payload, dtype=_NUMPY_DTYPES[dtype])
+        if dtype != "float32":
+            vector = vector.astype(np.float32)
+    else:
+        raise ValueError(f"Unsupported embedding dtype '{dtype}'")
+    if dim is not None and len(vector) != dim:
+        raise ValueError(f"Packed embedding has {len(vector)} values, expected {dim}")
+    return vector
+
+
+def packed_columns(embedding: Optional[Sequence[float]]) -> dict:
+    """
+    Column values storing `embedding` on a job (all NULL for None).
+    Also empties the legacy JSON column.
+    """
+    if embedding is None:
+        return {"embedding_packed": None, "embedding_dim": None, "embedding_dtype": None, "embedding": None}
+    payload, dim, dtype = pack_embedding(embedding)
+    return {"embedding_packed": payload, "embedding_dim": dim, "embedding_dtype": dtype, "embedding": None}
+
+
+def decode_job_embedding(packed, dim, dtype, legacy) -> Optional[np.ndarray]:
+    """Vector from a job's packed columns, falling back to the legacy JSON list."""
+    if packed is not None:
+        return unpack_embedding(packed, dim, dtype)
+    if legacy:
+        return np.asarray(legacy, dtype=np.float32)
+    return None
+
+
+def job_embedding(job) -> Optional[np.ndarray]:
+    """Vector of a loaded Job row (None if it has no embedding)."""
+    return decode_job_embedding(job.embedding_packed, job.embedding_dim, job.embedding_dtype, job.embedding)
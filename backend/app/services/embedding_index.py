@@ -0,0 +1,355 @@
+"""
+Process-wide in-memory index of job embeddings.
+
+Keeps every active job's vector L2-normalized in one contiguous float32
+matrix so that scoring a resume against the corpus is a single
+matrix-vector product instead of a per-job Python loop.
+
+With dtype="int8" the rows are scalar-quantized (one float32 scale per
+row), which cuts the matrix to a quarter of its size. Scores from an int8
+index are approximate; JobMatcher rescores its final candidates with the
+full-precision vectors stored on the job rows.
+
+The index only sees writes made by its own process. Other processes (the
+other API workers, scripts/backfill_embeddings.py) write to the database
+only, so each process calls sync() periodically to pick their writes up.
+"""
+
+import logging
+import threading
+from datetime import datetime, timedelta
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.job_model import Job
+from app.services.embedding_codec import decode_job_embedding
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """
+    L2-normalize each row of a 2-D array in float32.
+    Zero vectors stay zero (cosine similarity against them is 0).
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+INDEX_DTYPES = ("float32", "int8")
+
+# Rows converted to float32 at a time when scoring an int8 matrix
+_DOT_CHUNK_ROWS = 16384
+
+# Bound the size of IN (...) lists sent to the database
+_ID_CHUNK_SIZE = 1000
+
+
+def quantize_rows(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Symmetric per-row int8 quantization: row ~= int8_row * scale.
+    Returns (int8 matrix, float32 scales).
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    peaks = np.abs(vectors).max(axis=1) if vectors.size else np.zeros(len(vectors), dtype=np.float32)
+    scales = np.where(peaks > 0, peaks / 127.0, 1.0).astype(np.float32)
+    quantized = np.clip(np.rint(vectors / scales[:, np.newaxis]), -127, 127).astype(np.int8)
+    return quantized, scales
+
+
+@dataclass(frozen=True)
+class _Snapshot:
+    """Immutable view of the index; swapped atomically on every write."""
+    ids: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int64))
+    matrix: np.ndarray = field(default_factory=lambda: np.empty((0, 0), dtype=np.float32))
+    rows: Dict[int, int] = field(default_factory=dict)
+    scales: Optional[np.ndarray] = None  # per-row scales when matrix is int8
+
+    @property
+    def quantized(self) -> bool:
+        return self.scales is not None
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the vectors (matrix plus scales)."""
+        return self.matrix.nbytes + (self.scales.nbytes if self.scales is not None else 0)
+
+    def vectors(self, rows=None) -> np.ndarray:
+        """Normalized float32 vectors for the given rows (all rows if None)."""
+        rows = slice(None) if rows is None else rows
+        if self.scales is None:
+            return self.matrix[rows]
+        return self.matrix[rows].astype(np.float32) * self.scales[rows][:, np.newaxis]
+
+    def dot(self, q: np.ndarray, rows=None) -> np.ndarray:
+        """Similarity of a normalized query with the given rows (all rows if None)."""
+        if self.scales is None:
+            return self.matrix @ q if rows is None else self.matrix[rows] @ q
+        matrix = self.matrix if rows is None else self.matrix[rows]
+        scales = self.scales if rows is None else self.scales[rows]
+        out = np.empty(len(matrix), dtype=np.float32)
+        for start in range(0, len(matrix), _DOT_CHUNK_ROWS):
+            block = matrix[start:start + _DOT_CHUNK_ROWS].astype(np.float32)
+            out[start:start + len(block)] = block @ q
+        return out * scales
+
+
+class EmbeddingIndex:
+    """
+    Contiguous float32 (or int8) matrix of normalized job embeddings keyed by job id.
+
+    Readers work on an immutable snapshot, so scoring never blocks on a
+    concurrent refresh. Writers (rebuild / upsert / remove) serialize on a
+    lock and publish a new snapshot when done.
+    """
+
+    def __init__(self, dtype: str = "float32"):
+        if dtype not in INDEX_DTYPES:
+            raise ValueError(f"Unsupported index dtype '{dtype}' (expected one of {INDEX_DTYPES})")
+        self.dtype = dtype
+        self._lock = threading.Lock()
+        self._snapshot = _Snapshot()
+        # When the last rebuild/sync started reading (naive UTC, like the DB timestamps)
+        self._synced_at: Optional[datetime] = None
+
+    def __len__(self) -> int:
+        return len(self._snapshot.ids)
+
+    @property
+    def dim(self) -> int:
+        """Embedding dimension (0 while the index is empty)."""
+        return self._snapshot.matrix.shape[1] if len(self) else 0
+
+    def snapshot(self) -> _Snapshot:
+        """Current immutable view (ids, matrix, id -> row mapping)."""
+        return self._snapshot
+
+    # ── Writes ───────────────────────────────────────────────────
+
+    def rebuild(self, db: Session, chunk_size: int = 1000) -> int:
+        """
+        Rebuild the whole index from the active jobs in the database.
+        Returns the number of indexed jobs.
+        """
+        started = datetime.utcnow()
+        ids, vectors = self._filter_vectors(self._read_vectors(db, chunk_size=chunk_size))
+
+        with self._lock:
+            self._snapshot = self._build_snapshot(ids, vectors)
+            self._synced_at = started
+
+        logger.info(f"Embedding index rebuilt: {len(ids)} jobs, dim={self.dim}")
+        return len(ids)
+
+    def sync(self, db: Session, overlap_seconds: float = 120.0) -> Tuple[int, int]:
+        """
+        Catch up with embedding writes made by other processes since the
+        last rebuild or sync (rebuilds if there was none):
+        - jobs created or updated since then (minus `overlap_seconds`, for
+          clock skew and long transactions) are re-read and upserted;
+        - active embedded jobs missing from the index are read and upserted;
+        - indexed jobs that were deleted, deactivated or lost their
+          embedding are removed.
+        Returns (upserted, removed).
+        """
+        if self._synced_at is None:
+            return self.rebuild(db), 0
+
+        started = datetime.utcnow()
+        since = self._synced_at - timedelta(seconds=overlap_seconds)
+        # Taken before reading the database: local writes land in the index
+        # only after their commit, so anything in it and not embedded in the
+        # database below really is gone
+        snapshot = self._snapshot
+        embedded = np.fromiter(
+            (job_id for (job_id,) in db.query(Job.id).filter(Job.is_active.is_(True), Job.has_embedding)),
+            dtype=np.int64,
+        )
+        removed = self.remove(np.setdiff1d(snapshot.ids, embedded).tolist())
+
+        pairs = list(self._read_vectors(db, or_(Job.updated_at >= since, Job.created_at >= since)))
+        loaded = {job_id for job_id, _ in pairs}
+        missing = [
+            job_id for job_id in np.setdiff1d(embedded, snapshot.ids).tolist() if job_id not in loaded
+        ]
+        for i in range(0, len(missing), _ID_CHUNK_SIZE):
+            pairs.extend(self._read_vectors(db, Job.id.in_(missing[i:i + _ID_CHUNK_SIZE])))
+
+        upserted = self.upsert(pairs)
+        self._synced_at = started
+        if upserted or removed:
+            logger.info(f"Embedding index synced: {upserted} upserted, {removed} removed")
+        return upserted, removed
+
+    def upsert(self, job_embedding_pairs: Iterable[Tuple[int, List[float]]]) -> int:
+        """
+        Insert or replace vectors for the given (job_id, embedding) pairs.
+        Returns the number of vectors written.
+        """
+        with self._lock:
+            current = self._snapshot
+            ids, vectors = self._filter_vectors(
+                job_embedding_pairs, dim=current.matrix.shape[1] if len(current.ids) else None
+            )
+            if not ids:
+                return 0
+
+            # Last write wins for ids repeated within the batch
+            latest: Dict[int, int] = {job_id: i for i, job_id in enumerate(ids)}
+            new_ids = np.fromiter(latest.keys(), dtype=np.int64, count=len(latest))
+            new_matrix = normalize_rows(np.asarray(vectors, dtype=np.float32)[list(latest.values())])
+
+            if not len(current.ids):
+                self._snapshot = self._build_snapshot(new_ids, new_matrix, normalized=True)
+                return len(new_ids)
+
+            # Overwrite rows that already exist, append the rest
+            new_matrix, new_scales = self._encode(new_matrix)
+            matrix = current.matrix.copy()
+            scales = current.scales.copy() if current.scales is not None else None
+            existing = np.array([job_id in current.rows for job_id in new_ids], dtype=bool)
+            if existing.any():
+                target_rows = [current.rows[int(job_id)] for job_id in new_ids[existing]]
+                matrix[target_rows] = new_matrix[existing]
+                if scales is not None:
+                    scales[target_rows] = new_scales[existing]
+
+            appended = ~existing
+            all_ids = np.concatenate([current.ids, new_ids[appended]])
+            matrix = np.ascontiguousarray(np.vstack([matrix, new_matrix[appended]]))
+            if scales is not None:
+                scales = np.concatenate([scales, new_scales[appended]])
+            self._snapshot = self._snapshot_of(all_ids, matrix, scales)
+            return len(new_ids)
+
+    def remove(self, job_ids: Iterable[int]) -> int:
+        """
+        Drop vectors for the given job ids.
+        Returns the number of vectors removed.
+        """
+        with self._lock:
+            current = self._snapshot
+            drop = {int(job_id) for job_id in job_ids if int(job_id) in current.rows}
+            if not drop:
+                return 0
+
+            keep = np.array([int(job_id) not in drop for job_id in current.ids], dtype=bool)
+            self._snapshot = self._snapshot_of(
+                current.ids[keep],
+                current.matrix[keep],
+                current.scales[keep] if current.scales is not None else None,
+            )
+            return len(drop)
+
+    # ── Reads ────────────────────────────────────────────────────
+
+    def rows_for(self, job_ids: Sequence[int], snapshot: Optional[_Snapshot] = None) -> np.ndarray:
+        """
+        Map job ids to matrix rows in the given (or current) snapshot.
+        Ids that are not indexed map to -1.
+        """
+        snapshot = snapshot or self._snapshot
+        return np.fromiter(
+            (snapshot.rows.get(int(job_id), -1) for job_id in job_ids),
+            dtype=np.int64,
+            count=len(job_ids),
+        )
+
+    def score(self, query: List[float]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Cosine similarity of a query vector against every indexed job
+        (approximate for an int8 index).
+        Returns (job_ids, scores); both empty if the query does not fit.
+        """
+        snapshot = self._snapshot
+        q = self.normalize_query(query, snapshot)
+        if q is None:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        return snapshot.ids, snapshot.dot(q)
+
+    def normalize_query(
+        self, query: Optional[List[float]], snapshot: Optional[_Snapshot] = None
+    ) -> Optional[np.ndarray]:
+        """
+        Normalize a query vector to float32.
+        Returns None if it is empty or does not match the index dimension.
+        """
+        snapshot = snapshot or self._snapshot
+        if query is None or len(query) == 0 or not len(snapshot.ids):
+            return None
+        q = np.asarray(query, dtype=np.float32)
+        if q.ndim != 1 or q.shape[0] != snapshot.matrix.shape[1]:
+            logger.warning(
+                f"Query embedding dim {q.shape} does not match index dim {snapshot.matrix.shape[1]}"
+            )
+            return None
+        return normalize_rows(q[np.newaxis, :])[0]
+
+    # ── Internals ────────────────────────────────────────────────
+
+    @staticmethod
+    def _read_vectors(db: Session, *criteria, chunk_size: int = 1000) -> Iterable[Tuple[int, Optional[List[float]]]]:
+        """(job_id, embedding) for active embedded jobs matching `criteria`."""
+        rows = (
+            db.query(Job.id, Job.embedding_packed, Job.embedding_dim, Job.embedding_dtype, Job.embedding)
+            .filter(Job.is_active.is_(True), Job.has_embedding, *criteria)
+            .yield_per(chunk_size)
+        )
+        for job_id, packed, dim, dtype, legacy in rows:
+            yield job_id, decode_job_embedding(packed, dim, dtype, legacy)
+
+    @staticmethod
+    def _filter_vectors(
+        pairs: Iterable[Tuple[int, Optional[List[float]]]], dim: Optional[int] = None
+    ) -> Tuple[List[int], List[List[float]]]:
+        """Drop empty vectors and vectors whose dimension differs from the rest."""
+        ids: List[int] = []
+        vectors: List[List[float]] = []
+        skipped = 0
+        for job_id, embedding in pairs:
+            if embedding is None or len(embedding) == 0:
+                continue
+            if dim is None:
+                dim = len(embedding)
+            if len(embedding) != dim:
+                skipped += 1
+                continue
+            ids.append(int(job_id))
+            vectors.append(embedding)
+        if skipped:
+            logger.warning(f"Embedding index skipped {skipped} vectors with dim != {dim}")
+        return ids, vectors
+
+    def _encode(self, normalized: np.ndarray) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """Normalized float32 rows in the index's storage dtype: (matrix, scales)."""
+        if self.dtype == "int8":
+            return quantize_rows(normalized)
+        return normalized, None
+
+    def _build_snapshot(self, ids, vectors, normalized: bool = False) -> _Snapshot:
+        ids = np.asarray(ids, dtype=np.int64)
+        if not len(ids):
+            return _Snapshot()
+        matrix = np.ascontiguousarray(vectors, dtype=np.float32)
+        if not normalized:
+            matrix = normalize_rows(matrix)
+        matrix, scales = self._encode(matrix)
+        return self._snapshot_of(ids, matrix, scales)
+
+    @staticmethod
+    def _snapshot_of(ids: np.ndarray, matrix: np.ndarray, scales: Optional[np.ndarray]) -> _Snapshot:
+        if not len(ids):
+            return _Snapshot()
+        rows = {int(job_id): row for row, job_id in enumerate(ids)}
+        return _Snapshot(ids=ids, matrix=np.ascontiguousarray(matrix), rows=rows, scales=scales)
+
+
+# Shared index for the whole process (rebuilt at startup, refreshed on writes)
+embedding_index = EmbeddingIndex(dtype="int8" if settings.match_quantization == "int8" else "float32")
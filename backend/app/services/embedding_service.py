@@ -5,17 +5,64 @@ Provides methods to generate vector embeddings for text using
 the hosted embedding model. Used for semantic job matching.
 """
 
+import asyncio
 import logging
 from typing import List, Optional
 import httpx
 
 from app.core.config import settings
+from app.services.embedding_cache import embedding_cache, text_hash
 
 logger = logging.getLogger(__name__)
 
 # Timeout: 30s connect, 120s read (batch embedding can be slow)
 TIMEOUT = httpx.Timeout(connect=30.0, read=120.0, write=30.0, pool=30.0)
 
+# Application-lifetime client (keep-alive pool shared by every call)
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Shared pooled client for the embedding service.
+
+    Created lazily on first use. A client is bound to the event loop it
+    was created on, so a new one is made if the loop changes (e.g. for
+    scripts that call asyncio.run more than once).
+    """
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        http2 = settings.embedding_http2
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                logger.warning("EMBEDDING_HTTP2 is set but the 'h2' package is missing; using HTTP/1.1")
+                http2 = False
+
+        _client = httpx.AsyncClient(
+            timeout=TIMEOUT,
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=settings.embedding_max_connections,
+                max_keepalive_connections=settings.embedding_max_connections,
+                keepalive_expiry=settings.embedding_keepalive_expiry_seconds,
+            ),
+        )
+        _client_loop = loop
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared client (called on application shutdown)."""
+    global _client, _client_loop
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = None
+    _client_loop = None
+
 
 class EmbeddingService:
     """
@@ -29,7 +76,8 @@ class EmbeddingService:
     def __init__(self):
         self.base_url = settings.embedding_service_url.rstrip("/")
         self.api_key = settings.embedding_api_key
-        self.batch_size = settings.embedding_batch_size
+        self.batch_size = max(1, settings.embedding_batch_size)
+        self.max_in_flight = max(1, settings.embedding_max_in_flight)
 
     def _headers(self) -> dict:
         """Build request headers with API key."""
@@ -53,15 +101,14 @@ class EmbeddingService:
             return None
 
         try:
-            async with httpx.AsyncClient(timeout=TIMEOUT) as client:
-                response = await client.post(
-                    f"{self.base_url}/embed",
-                    headers=self._headers(),
-                    json={"text": text},
-                )
-                response.raise_for_status()
-                data = response.json()
-                return data.get("embedding")
+            response = await get_http_client().post(
+                f"{self.base_url}/embed",
+                headers=self._headers(),
+                json={"text": text},
+            )
+            response.raise_for_status()
+            data = response.json()
+            return data.get("embedding")
 
         except httpx.TimeoutException:
             logger.error("Embedding service timed out for embed()")
@@ -73,13 +120,19 @@ class EmbeddingService:
             logger.error(f"Embedding service error: {e}")
             return None
 
-    async def embed_batch(self, texts: List[str]) -> Optional[List[List[float]]]:
+    async def embed_batch(
+        self, texts: List[str], batch_size: Optional[int] = None, use_cache: bool = True
+    ) -> Optional[List[List[float]]]:
         """
-        Generate embeddings for multiple texts in one call.
-        Automatically chunks into batches of self.batch_size.
+        Generate embeddings for multiple texts.
+        Texts already in the embedding cache are served from it; the rest
+        are chunked into batches of self.batch_size and up to
+        self.max_in_flight chunks are sent concurrently. Results keep input order.
         
         Args:
             texts: List of texts to embed (e.g., job title + description).
+            batch_size: Override the configured chunk size for this call.
+            use_cache: Consult and fill the content-hash embedding cache.
         
         Returns:
             List of embedding vectors (same order as input), 
@@ -87,34 +140,41 @@ class EmbeddingService:
         """
         if not texts:
             return []
+        if not use_cache:
+            return await self._embed_uncached(texts, batch_size)
 
-        all_embeddings: List[List[float]] = []
+        cached = await embedding_cache.get_many(texts)
+        miss_positions = [i for i, emb in enumerate(cached) if emb is None]
+        if not miss_positions:
+            return cached
 
-        try:
-            async with httpx.AsyncClient(timeout=TIMEOUT) as client:
-                # Process in batches
-                for i in range(0, len(texts), self.batch_size):
-                    batch = texts[i : i + self.batch_size]
-                    
-                    response = await client.post(
-                        f"{self.base_url}/embed-batch",
-                        headers=self._headers(),
-                        json={"texts": batch},
-                    )
-                    response.raise_for_status()
-                    data = response.json()
-                    
-                    embeddings = data.get("embeddings", [])
-                    if len(embeddings) != len(batch):
-                        logger.error(
-                            f"Embedding count mismatch: sent {len(batch)}, got {len(embeddings)}"
-                        )
-                        return None
-                    
-                    all_embeddings.extend(embeddings)
-
-            return all_embeddings
+        miss_texts = [texts[i] for i in miss_positions]
+        fresh = await self._embed_uncached(miss_texts, batch_size)
+        if fresh is None:
+            return None
+        await embedding_cache.set_many(miss_texts, fresh)
+
+        for i, emb in zip(miss_positions, fresh):
+            cached[i] = emb
+        return cached
+
+    async def _embed_uncached(
+        self, texts: List[str], batch_size: Optional[int] = None
+    ) -> Optional[List[List[float]]]:
+        """Send texts to the service in concurrent chunks (no cache)."""
+
+        client = get_http_client()
+        slots = asyncio.Semaphore(self.max_in_flight)
+        size = max(1, batch_size or self.batch_size)
+        chunks = [texts[i : i + size] for i in range(0, len(texts), size)]
+
+        async def send(batch: List[str]) -> Optional[List[List[float]]]:
+            async with slots:
+                return await self._post_batch(client, batch)
 
+        tasks = [asyncio.create_task(send(batch)) for batch in chunks]
+        try:
+            results = await asyncio.gather(*tasks)
         except httpx.TimeoutException:
             logger.error("Embedding service timed out for embed_batch()")
             return None
@@ -124,6 +184,41 @@ class EmbeddingService:
         except Exception as e:
             logger.error(f"Embedding service error: {e}")
             return None
+        finally:
+            # Stop sibling chunks once one has failed
+            for task in tasks:
+                task.cancel()
+
+        if any(result is None for result in results):
+            return None
+
+        all_embeddings: List[List[float]] = []
+        for result in results:
+            all_embeddings.extend(result)
+        return all_embeddings
+
+    async def _post_batch(
+        self, client: httpx.AsyncClient, batch: List[str]
+    ) -> Optional[List[List[float]]]:
+        """
+        Send one chunk to /embed-batch.
+        Returns None if the service answers with the wrong number of vectors.
+        """
+        response = await client.post(
+            f"{self.base_url}/embed-batch",
+            headers=self._headers(),
+            json={"texts": batch},
+        )
+        response.raise_for_status()
+        data = response.json()
+
+        embeddings = data.get("embeddings", [])
+        if len(embeddings) != len(batch):
+            logger.error(
+                f"Embedding count mismatch: sent {len(batch)}, got {len(embeddings)}"
+            )
+            return None
+        return embeddings
 
     @staticmethod
     def build_job_text(title: str, description: str) -> str:
@@ -137,3 +232,10 @@ class EmbeddingService:
         if description:
             parts.append(description.strip())
         return " ".join(parts)
+
+    @staticmethod
+    def job_text_fingerprint(title: str, description: str) -> str:
+        """
+        Fingerprint of a job's embedding text (also its embedding cache key).
+        """
+        return text_hash(EmbeddingService.build_job_text(title or "", description or ""))
@@ -1,88 +1,263 @@
+import asyncio
 import logging
-from typing import List
+import time
+from collections import Counter, defaultdict
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
 from pathlib import Path
+import httpx
 from app.fetchers.base import JobData
+from app.fetchers.crawler import CrawlClient
+from app.fetchers.rate_limit import TokenBucket
 from app.fetchers.career_page import CareerPageFetcher
-from app.fetchers.adzuna_api import AdzunaApiFetcher
+from app.fetchers.page_cache import PageValidatorStore, page_validators
+from app.fetchers.adzuna_api import AdzunaApiFetcher, PageIsKnown
 from app.services.normalizer import normalize, NormalizedJob
 from app.services.dedup_service import DedupService
 
 logger = logging.getLogger(__name__)
 
+# Awaited once every job a source produced has been saved (or dropped as a duplicate)
+OnSaved = Callable[[], Awaitable[None]]
+
+# Async callback receiving (source name, jobs, on_saved or None) as each source finishes
+SourceSink = Callable[[str, List[JobData], Optional[OnSaved]], Awaitable[None]]
+
+# Per-source career page outcomes since startup: company -> Counter of
+# "parsed", "not_modified", "same_body", "failed"
+career_page_stats: Dict[str, Counter] = defaultdict(Counter)
+
+
+def career_page_metrics() -> dict:
+    """Per-source crawl outcome counts (for /metrics)."""
+    return {company: dict(counts) for company, counts in sorted(career_page_stats.items())}
+
+
 class FetcherService:
     """
     Orchestrates job fetching from multiple sources.
     """
 
-    def __init__(self, config_dir: str = "app/configs/companies"):
+    def __init__(
+        self,
+        config_dir: str = "app/configs/companies",
+        validators: Optional[PageValidatorStore] = page_validators,
+    ):
         self.config_dir = Path(config_dir)
+        # Conditional-GET validators for career pages (None: always re-download)
+        self.validators = validators
+        # Validator writes of pages fetched by fetch_all() without on_source
+        self._unsaved_validators: List[OnSaved] = []
 
-    async def fetch_all(self) -> List[JobData]:
+    async def fetch_all(self, on_source: Optional[SourceSink] = None) -> List[JobData]:
         """
         Fetch jobs from all configured career pages and public APIs.
+
+        With `on_source`, each source's jobs are handed to it as soon as that
+        source is done instead of being collected (the result is then empty).
+        The callback may block to apply backpressure; source time budgets
+        only cover the download. It must await the source's `on_saved` (if
+        any) once those jobs are saved; without `on_source`, call
+        save_page_validators() after saving the returned jobs. Until then a
+        parsed page is not treated as unchanged by the next crawl.
         """
         all_jobs = []
 
-        # Fetch from career pages
-        career_page_jobs = await self._fetch_from_career_pages()
+        # Career pages and APIs are independent; fetch both at once
+        career_page_jobs, api_jobs = await asyncio.gather(
+            self._fetch_from_career_pages(on_source=on_source),
+            self._fetch_from_public_apis(on_source=on_source),
+        )
+        if on_source is not None:
+            return all_jobs
+
         all_jobs.extend(career_page_jobs)
         logger.info(f"Fetched {len(career_page_jobs)} jobs from career pages")
 
-        api_jobs = await self._fetch_from_public_apis()
         all_jobs.extend(api_jobs)
         logger.info(f"Fetched {len(api_jobs)} jobs from public APIs")
 
         return all_jobs
 
-    async def _fetch_from_career_pages(self) -> List[JobData]:
+    async def _fetch_from_career_pages(
+        self, client: Optional[CrawlClient] = None, on_source: Optional[SourceSink] = None
+    ) -> List[JobData]:
         """
-        Fetch from all YAML configured career pages.
+        Fetch from all YAML configured career pages concurrently.
+
+        Pages share one pooled client with global and per-host limits (see
+        fetchers/crawler.py), and each source has its own time budget, so
+        one slow site cannot hold up the rest.
         """
-        jobs = []
-        
         if not self.config_dir.exists():
             logger.warning(f"Config directory not found: {self.config_dir}")
-            return jobs
+            return []
 
-        yaml_files = list(self.config_dir.glob('*.yaml'))
+        yaml_files = sorted(self.config_dir.glob('*.yaml'))
         logger.info(f"Found {len(yaml_files)} career page configs")
 
+        fetchers = []
         for config_file in yaml_files:
             try:
-                fetcher = CareerPageFetcher(str(config_file))
-                company_jobs = await fetcher.fetch()
-                jobs.extend(company_jobs)
-                logger.info(f"Fetched {len(company_jobs)} jobs from {fetcher.company}")
+                fetchers.append(CareerPageFetcher(str(config_file)))
             except Exception as e:
-                logger.error(f"Error fetching from {config_file}: {e}")
-                continue
+                logger.error(f"Error loading career page config {config_file}: {e}")
+        if not fetchers:
+            return []
 
-        return jobs
+        start = time.monotonic()
+        if client is None:
+            async with CrawlClient() as shared_client:
+                results = await asyncio.gather(
+                    *(self._fetch_career_page(f, shared_client, on_source) for f in fetchers)
+                )
+        else:
+            results = await asyncio.gather(*(self._fetch_career_page(f, client, on_source) for f in fetchers))
+        wall_seconds = time.monotonic() - start
+
+        # Serial baseline: sum of per-source times (roughly a one-by-one crawl)
+        serial_seconds = sum(seconds for _, seconds in results)
+        unchanged = sum(1 for fetcher in fetchers if fetcher.unchanged)
+        logger.info(
+            f"Crawled {len(fetchers)} career pages in {wall_seconds:.1f}s "
+            f"(serial baseline {serial_seconds:.1f}s, {serial_seconds / max(wall_seconds, 1e-3):.1f}x); "
+            f"{unchanged} unchanged"
+        )
+        return [job for company_jobs, _ in results for job in company_jobs]
 
-    async def _fetch_from_public_apis(self) -> List[JobData]:
+    async def _fetch_career_page(
+        self, fetcher: CareerPageFetcher, client: CrawlClient, on_source: Optional[SourceSink] = None
+    ) -> Tuple[List[JobData], float]:
+        """
+        One source within its time budget. Returns (jobs, seconds taken);
+        with `on_source` the jobs are passed on instead of returned.
+        """
+        start = time.monotonic()
+        company_jobs: List[JobData] = []
+        outcome = "failed"
+        try:
+            company_jobs = await asyncio.wait_for(
+                fetcher.fetch(client, self.validators), fetcher.timeout_seconds
+            )
+            if fetcher.error:
+                logger.warning(f"{fetcher.company}: career page failed ({fetcher.error})")
+            elif fetcher.unchanged:
+                outcome = fetcher.unchanged
+                logger.info(f"{fetcher.company}: career page unchanged ({outcome}), skipped parsing")
+            else:
+                outcome = "parsed"
+                logger.info(
+                    f"Fetched {len(company_jobs)} jobs from {fetcher.company} "
+                    f"in {time.monotonic() - start:.1f}s"
+                )
+        except asyncio.TimeoutError:
+            logger.warning(f"Gave up on {fetcher.company} after {fetcher.timeout_seconds:g}s")
+        except Exception as e:
+            logger.error(f"Error fetching from {fetcher.company}: {e}")
+        career_page_stats[fetcher.company][outcome] += 1
+        seconds = time.monotonic() - start
+
+        on_saved = self._validator_write(fetcher)
+        if on_source is not None:
+            if company_jobs:
+                await on_source(fetcher.company, company_jobs, on_saved)
+            company_jobs = []
+        elif on_saved is not None:
+            self._unsaved_validators.append(on_saved)
+        return company_jobs, seconds
+
+    def _validator_write(self, fetcher: CareerPageFetcher) -> Optional[OnSaved]:
+        """Store a parsed page's validators; run once its jobs are saved."""
+        if self.validators is None or fetcher.new_validators is None:
+            return None
+        store, url, validators = self.validators, fetcher.job_url, fetcher.new_validators
+
+        async def on_saved() -> None:
+            await store.set(url, validators)
+        return on_saved
+
+    async def save_page_validators(self) -> int:
+        """
+        Store the validators of pages fetched by fetch_all() (without
+        on_source). Call after their jobs are saved. Returns pages stored.
+        """
+        pending, self._unsaved_validators = self._unsaved_validators, []
+        for on_saved in pending:
+            await on_saved()
+        return len(pending)
+
+    async def _fetch_from_public_apis(
+        self, client: Optional[httpx.AsyncClient] = None, on_source: Optional[SourceSink] = None
+    ) -> List[JobData]:
         """
         Fetch from public job APIs (e.g., Adzuna).
         Supports multiple job queries from config.
+
+        Queries (and pages within a query) are fetched concurrently; every
+        request takes a token from one bucket sized to Adzuna's quota.
+        Paging stops early at a page whose jobs are all already seen.
         """
         from app.core.config import settings
         
-        jobs: List[JobData] = []
-        
         # Parse queries from config (comma-separated)
         queries = [q.strip() for q in settings.adzuna_job_queries.split(",") if q.strip()]
-        
-        for query in queries:
-            try:
-                logger.info(f"Fetching Adzuna jobs for: {query}")
-                adzuna = AdzunaApiFetcher(query=query)
-                adzuna_jobs = await adzuna.fetch()
-                jobs.extend(adzuna_jobs)
-                logger.info(f"Fetched {len(adzuna_jobs)} jobs for query '{query}'")
-            except Exception as e:
-                logger.error(f"Error fetching from Adzuna API for query '{query}': {e}")
+        if not queries:
+            return []
+
+        limiter = TokenBucket.per_minute(settings.adzuna_requests_per_minute, settings.adzuna_burst)
+        dedup = DedupService()
 
+        async def page_is_known(page_jobs: List[JobData]) -> bool:
+            seen = await dedup.seen_many([normalize(job).dedup_hash for job in page_jobs])
+            return all(seen)
+
+        fetchers = [AdzunaApiFetcher(query=query) for query in queries]
+        start = time.monotonic()
+        if client is None:
+            limits = httpx.Limits(
+                max_connections=settings.adzuna_max_concurrency,
+                max_keepalive_connections=settings.adzuna_max_concurrency,
+            )
+            async with httpx.AsyncClient(timeout=15.0, limits=limits) as shared_client:
+                results = await asyncio.gather(
+                    *(self._fetch_adzuna_query(f, shared_client, limiter, page_is_known, on_source) for f in fetchers)
+                )
+        else:
+            results = await asyncio.gather(
+                *(self._fetch_adzuna_query(f, client, limiter, page_is_known, on_source) for f in fetchers)
+            )
+
+        jobs = [job for query_jobs in results for job in query_jobs]
+        fetched = sum(fetcher.jobs_fetched for fetcher in fetchers)
+        logger.info(
+            f"Fetched {fetched} Adzuna jobs for {len(queries)} queries "
+            f"({limiter.acquired} requests) in {time.monotonic() - start:.1f}s"
+        )
         return jobs
 
+    async def _fetch_adzuna_query(
+        self,
+        fetcher: AdzunaApiFetcher,
+        client: httpx.AsyncClient,
+        limiter: TokenBucket,
+        page_is_known: PageIsKnown,
+        on_source: Optional[SourceSink] = None,
+    ) -> List[JobData]:
+        try:
+            logger.info(f"Fetching Adzuna jobs for: {fetcher.query}")
+            adzuna_jobs = await fetcher.fetch(client, limiter, page_is_known)
+            logger.info(
+                f"Fetched {len(adzuna_jobs)} jobs for query '{fetcher.query}' "
+                f"({fetcher.pages_fetched} pages)"
+            )
+        except Exception as e:
+            logger.error(f"Error fetching from Adzuna API for query '{fetcher.query}': {e}")
+            return []
+        if on_source is not None:
+            if adzuna_jobs:
+                await on_source(f"adzuna:{fetcher.query}", adzuna_jobs, None)
+            return []
+        return adzuna_jobs
+
     async def fetch_normalized_unique(self) -> List[NormalizedJob]:
         """
         Phase 3: Fetch, normalize, and deduplicate jobs using Redis.
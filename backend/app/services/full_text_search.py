@@ -0,0 +1,154 @@
+"""
+Ranked full-text search over jobs for GET /jobs?q=.
+
+- PostgreSQL: a generated `search_vector` tsvector column (title weighted
+  A, company and location B, description C) with a GIN index. The database
+  keeps it in step with every INSERT/UPDATE, including the bulk upsert.
+- SQLite: an external-content FTS5 table `jobs_fts` kept in sync by
+  triggers on jobs.
+
+The description is indexed too (lowest weight) so skills and keywords that
+only appear in the posting body can be searched.
+
+Other databases fall back to a case-insensitive substring match.
+"""
+
+import logging
+import re
+
+from sqlalchemy import column, func, literal_column, or_, table, text
+from sqlalchemy.orm import Query
+
+from app.models.job_model import Job
+
+logger = logging.getLogger(__name__)
+
+# FTS5 bm25() column weights: title, company, location, description
+SQLITE_BM25_WEIGHTS = (10.0, 4.0, 4.0, 1.0)
+
+# Indexed jobs columns (FTS5 column order)
+_INDEXED_COLUMNS = ("title", "company", "location", "description")
+
+_jobs_fts = table("jobs_fts", column("rowid"))
+
+_POSTGRES_DDL = [
+    """
+    ALTER TABLE jobs ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(company, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(location, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_jobs_search_vector ON jobs USING GIN (search_vector)",
+]
+
+_SQLITE_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+        title, company, location, description, content='jobs', content_rowid='id'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_insert AFTER INSERT ON jobs BEGIN
+        INSERT INTO jobs_fts(rowid, title, company, location, description)
+        VALUES (new.id, new.title, new.company, new.location, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_delete AFTER DELETE ON jobs BEGIN
+        INSERT INTO jobs_fts(jobs_fts, rowid, title, company, location, description)
+        VALUES ('delete', old.id, old.title, old.company, old.location, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_update AFTER UPDATE OF title, company, location, description ON jobs BEGIN
+        INSERT INTO jobs_fts(jobs_fts, rowid, title, company, location, description)
+        VALUES ('delete', old.id, old.title, old.company, old.location, old.description);
+        INSERT INTO jobs_fts(rowid, title, company, location, description)
+        VALUES (new.id, new.title, new.company, new.location, new.description);
+    END
+    """,
+]
+
+# Structures created before location was indexed are dropped and rebuilt
+_SQLITE_DROP_DDL = [
+    "DROP TRIGGER IF EXISTS jobs_fts_insert",
+    "DROP TRIGGER IF EXISTS jobs_fts_delete",
+    "DROP TRIGGER IF EXISTS jobs_fts_update",
+    "DROP TABLE IF EXISTS jobs_fts",
+]
+
+
+def ensure_full_text_schema(conn) -> None:
+    """
+    Create the search column/table, index and triggers if missing (idempotent).
+    Existing rows are indexed when the structure is first created.
+    """
+    dialect = conn.dialect.name
+    if dialect == "postgresql":
+        expression = conn.execute(text(
+            "SELECT generation_expression FROM information_schema.columns "
+            "WHERE table_name = 'jobs' AND column_name = 'search_vector'"
+        )).scalar()
+        if expression is not None and "location" not in expression:
+            # Generated expressions cannot be altered; the GIN index goes with the column
+            conn.execute(text("ALTER TABLE jobs DROP COLUMN search_vector"))
+            logger.info("Rebuilding search_vector to include location")
+        for ddl in _POSTGRES_DDL:
+            conn.execute(text(ddl))
+        conn.commit()
+    elif dialect == "sqlite":
+        existing_columns = [
+            row[1] for row in conn.execute(text("PRAGMA table_info(jobs_fts)"))
+        ]
+        existed = tuple(existing_columns) == _INDEXED_COLUMNS
+        if existing_columns and not existed:
+            for ddl in _SQLITE_DROP_DDL:
+                conn.execute(text(ddl))
+        for ddl in _SQLITE_DDL:
+            conn.execute(text(ddl))
+        if not existed:
+            conn.execute(text("INSERT INTO jobs_fts(jobs_fts) VALUES ('rebuild')"))
+            logger.info("Full-text index created and populated (FTS5)")
+        conn.commit()
+
+
+def _fts5_query(q: str) -> str:
+    """
+    Turn free text into an FTS5 query: every word quoted (so punctuation
+    and FTS operators in user input are taken literally) and all required.
+    """
+    words = re.findall(r"\w+", q)
+    return " ".join(f'"{word}"' for word in words)
+
+
+def apply_full_text_search(query: Query, q: str, dialect: str) -> Query:
+    """
+    Restrict a Job query to full-text matches of `q`, best matches first
+    (ties newest first).
+    """
+    if dialect == "postgresql":
+        tsquery = func.websearch_to_tsquery("english", q)
+        search_vector = literal_column("jobs.search_vector")
+        return query.filter(search_vector.op("@@")(tsquery)).order_by(
+            func.ts_rank_cd(search_vector, tsquery).desc(), Job.created_at.desc(), Job.id.desc()
+        )
+
+    if dialect == "sqlite":
+        fts_query = _fts5_query(q)
+        if not fts_query:
+            return query.filter(False)
+        weights = ", ".join(str(w) for w in SQLITE_BM25_WEIGHTS)
+        # bm25() is lower-is-better
+        return (
+            query.join(_jobs_fts, _jobs_fts.c.rowid == Job.id)
+            .filter(text("jobs_fts MATCH :fts_query").bindparams(fts_query=fts_query))
+            .order_by(text(f"bm25(jobs_fts, {weights})"), Job.created_at.desc(), Job.id.desc())
+        )
+
+    pattern = f"%{q}%"
+    return query.filter(or_(*(getattr(Job, name).ilike(pattern) for name in _INDEXED_COLUMNS))).order_by(
+        Job.created_at.desc(), Job.id.desc()
+    )
@@ -0,0 +1,374 @@
+"""
+Streaming ingest: fetch -> normalize -> dedup -> save -> alerts.
+
+The stages run concurrently and hand batches to each other through bounded
+queues. Each source's jobs enter the pipeline as soon as that source is
+done, so jobs from a fast source are saved and matched against alerts while
+slower sources are still downloading. A full queue blocks the stage feeding
+it, so a slow database holds the crawl back instead of letting it pile up
+in memory.
+
+Each stage records how many items it took in and passed on, the time it
+spent working (excluding waits on its input) and the time it spent blocked
+on a full output queue; /metrics shows the figures of the last run.
+Embeddings are not generated here; the backfill worker picks new jobs up.
+
+Batches carry the source they came from. Once every job of a source is
+saved or dropped as a duplicate, the source's `on_saved` callback runs
+(e.g. to store a career page's validators); a job lost on the way means it
+never runs, so the page is parsed again next time.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.fetchers.base import JobData
+from app.models.alert_model import UserAlert
+from app.models.job_model import Job
+from app.services.alert_service import AlertService
+from app.services.dedup_service import DedupService
+from app.services.email_queue_service import EmailQueueService
+from app.services.fetcher_service import FetcherService, OnSaved
+from app.services.job_repository import JobRepository
+from app.services.keyword_index import KeywordIndex
+from app.services.normalizer import NormalizedJob, normalize
+
+logger = logging.getLogger(__name__)
+
+STAGES = ("fetch", "normalize", "dedup", "save", "alerts")
+
+# Marks the end of a stage's output
+_DONE = None
+
+
+class SavedJob(NamedTuple):
+    """Fields of a saved job needed for alert matching and emails (no session attached)."""
+    id: int
+    title: str
+    company: str
+    location: Optional[str]
+    job_type: str
+    source: str
+    apply_link: str
+
+    @classmethod
+    def from_job(cls, job: Job) -> "SavedJob":
+        return cls(job.id, job.title, job.company, job.location, job.job_type, job.source, job.apply_link)
+
+
+@dataclass(eq=False)
+class _SourceProgress:
+    """Jobs of one source that are still on their way to the database."""
+    name: str
+    pending: int
+    on_saved: Optional[OnSaved]
+    failed: bool = False
+
+    async def settle(self, count: int, failed: bool = False) -> None:
+        """`count` jobs left the pipeline (saved or dropped; `failed` if lost)."""
+        self.pending -= count
+        self.failed = self.failed or failed
+        if self.pending == 0 and not self.failed and self.on_saved is not None:
+            await self.on_saved()
+
+
+@dataclass
+class StageStats:
+    name: str
+    items_in: int = 0
+    items_out: int = 0
+    batches: int = 0
+    busy_seconds: float = 0.0  # working on batches
+    blocked_seconds: float = 0.0  # waiting for room in the next stage's queue
+
+    def record(self, items_in: int, items_out: int, seconds: float) -> None:
+        self.items_in += items_in
+        self.items_out += items_out
+        self.batches += 1
+        self.busy_seconds += seconds
+
+    def metrics(self) -> dict:
+        return {
+            "items_in": self.items_in,
+            "items_out": self.items_out,
+            "batches": self.batches,
+            "busy_seconds": round(self.busy_seconds, 3),
+            "blocked_seconds": round(self.blocked_seconds, 3),
+            "items_per_second": round(self.items_in / self.busy_seconds, 1) if self.busy_seconds else None,
+        }
+
+
+@dataclass
+class IngestResult:
+    fetched: int = 0
+    unique: int = 0
+    saved: int = 0
+    notifications_queued: int = 0
+    seconds: float = 0.0
+    first_save_seconds: Optional[float] = None  # run start -> first chunk committed
+    stages: Dict[str, StageStats] = field(default_factory=dict)
+
+    def metrics(self) -> dict:
+        return {
+            "fetched": self.fetched,
+            "unique": self.unique,
+            "saved": self.saved,
+            "notifications_queued": self.notifications_queued,
+            "seconds": round(self.seconds, 2),
+            "first_save_seconds": round(self.first_save_seconds, 2) if self.first_save_seconds is not None else None,
+            "stages": {name: stats.metrics() for name, stats in self.stages.items()},
+        }
+
+
+# Last completed run (for /metrics)
+last_ingest: Optional[IngestResult] = None
+
+
+def ingest_metrics() -> Optional[dict]:
+    """Counts and per-stage throughput of the last ingest run (for /metrics)."""
+    return last_ingest.metrics() if last_ingest else None
+
+
+class IngestPipeline:
+    """
+    One ingest run. Stages hand batches of at most `batch_size` jobs to each
+    other through queues holding `queue_size` batches; the save stage writes
+    up to `save_chunk_size` jobs per statement, and a smaller chunk whenever
+    nothing else is waiting, so the first jobs are saved without delay.
+    """
+
+    def __init__(
+        self,
+        fetcher: Optional[FetcherService] = None,
+        session_factory: sessionmaker = SessionLocal,
+        dedup: Optional[DedupService] = None,
+        queue_size: int = settings.ingest_queue_size,
+        batch_size: int = settings.ingest_batch_size,
+        save_chunk_size: int = settings.ingest_save_chunk_size,
+    ):
+        self.fetcher = fetcher or FetcherService()
+        self.session_factory = session_factory
+        self.dedup = dedup or DedupService()
+        self.queue_size = max(1, queue_size)
+        self.batch_size = max(1, batch_size)
+        self.save_chunk_size = max(1, save_chunk_size)
+
+    async def run(self) -> IngestResult:
+        global last_ingest
+        result = IngestResult(stages={name: StageStats(name) for name in STAGES})
+        queues = [asyncio.Queue(self.queue_size) for _ in range(len(STAGES) - 1)]
+        raw, normalized, unique, saved = queues
+
+        start = time.monotonic()
+        # A stage that fails cancels the others (nothing is left waiting on a queue)
+        async with asyncio.TaskGroup() as group:
+            group.create_task(self._fetch(raw, result))
+            group.create_task(self._normalize(raw, normalized, result))
+            group.create_task(self._dedup(normalized, unique, result))
+            group.create_task(self._save(unique, saved, result, start))
+            group.create_task(self._alerts(saved, result))
+        result.seconds = time.monotonic() - start
+
+        stages = result.stages
+        result.fetched = stages["fetch"].items_out
+        result.unique = stages["dedup"].items_out
+        result.saved = stages["save"].items_out
+        last_ingest = result
+
+        first_save = f"{result.first_save_seconds:.1f}s" if result.first_save_seconds is not None else "n/a"
+        logger.info(
+            f"Ingest: {result.fetched} fetched -> {result.unique} unique -> {result.saved} saved, "
+            f"{result.notifications_queued} alert notifications in {result.seconds:.1f}s "
+            f"(first save after {first_save})"
+        )
+        for stats in stages.values():
+            rate = stats.metrics()["items_per_second"]
+            logger.info(
+                f"Ingest stage {stats.name}: {stats.items_in} in / {stats.items_out} out in "
+                f"{stats.batches} batches, busy {stats.busy_seconds:.2f}s"
+                + (f" ({rate:g} items/s)" if rate is not None else "")
+                + f", blocked {stats.blocked_seconds:.2f}s"
+            )
+        return result
+
+    # ── Queue helpers ────────────────────────────────────────────
+
+    @staticmethod
+    async def _put(queue: asyncio.Queue, batch: list, stats: StageStats) -> None:
+        """Hand a batch on, counting time spent waiting for room as backpressure."""
+        start = time.monotonic()
+        await queue.put(batch)
+        stats.blocked_seconds += time.monotonic() - start
+
+    @staticmethod
+    async def _batches(queue: asyncio.Queue) -> AsyncIterator[list]:
+        while (batch := await queue.get()) is not _DONE:
+            yield batch
+
+    # ── Stages ───────────────────────────────────────────────────
+
+    async def _fetch(self, out: asyncio.Queue, result: IngestResult) -> None:
+        """Every source, concurrently; a source's jobs go out when it is done."""
+        stats = result.stages["fetch"]
+        start = time.monotonic()
+
+        async def on_source(source: str, jobs: List[JobData], on_saved: Optional[OnSaved] = None) -> None:
+            # One batch per source; busy time is the crawl's wall time (set below)
+            stats.record(len(jobs), len(jobs), 0.0)
+            progress = _SourceProgress(source, len(jobs), on_saved)
+            for offset in range(0, len(jobs), self.batch_size):
+                await self._put(out, (progress, jobs[offset:offset + self.batch_size]), stats)
+
+        await self.fetcher.fetch_all(on_source=on_source)
+        stats.busy_seconds = time.monotonic() - start
+        await out.put(_DONE)
+
+    async def _normalize(self, inp: asyncio.Queue, out: asyncio.Queue, result: IngestResult) -> None:
+        stats = result.stages["normalize"]
+        async for progress, jobs in self._batches(inp):
+            start = time.monotonic()
+            normalized: List[NormalizedJob] = []
+            for job in jobs:
+                try:
+                    normalized.append(normalize(job))
+                except Exception as e:
+                    logger.error(f"Error normalizing job {job.title}: {e}")
+            stats.record(len(jobs), len(normalized), time.monotonic() - start)
+            if len(normalized) < len(jobs):
+                await progress.settle(len(jobs) - len(normalized), failed=True)
+            if normalized:
+                await self._put(out, (progress, normalized), stats)
+        await out.put(_DONE)
+
+    async def _dedup(self, inp: asyncio.Queue, out: asyncio.Queue, result: IngestResult) -> None:
+        """Drop jobs seen in this run or in Redis dedup memory (one MGET per batch)."""
+        stats = result.stages["dedup"]
+        run_hashes: Set[str] = set()
+        async for progress, jobs in self._batches(inp):
+            start = time.monotonic()
+            fresh = []
+            for job in jobs:
+                if job.dedup_hash not in run_hashes:
+                    run_hashes.add(job.dedup_hash)
+                    fresh.append(job)
+            seen = await self.dedup.seen_many([job.dedup_hash for job in fresh])
+            unique = [job for job, known in zip(fresh, seen) if not known]
+            await self.dedup.mark_many([job.dedup_hash for job in unique])
+            stats.record(len(jobs), len(unique), time.monotonic() - start)
+            if len(unique) < len(jobs):
+                await progress.settle(len(jobs) - len(unique))
+            if unique:
+                await self._put(out, (progress, unique), stats)
+        await out.put(_DONE)
+
+    async def _save(self, inp: asyncio.Queue, out: asyncio.Queue, result: IngestResult, run_start: float) -> None:
+        """
+        Upsert in chunks in a worker thread, so downloads continue meanwhile.
+        Keyword statistics are refreshed once, after the last chunk.
+        """
+        stats = result.stages["save"]
+        # Saved rows are snapshotted right away; skip reloading them after commits
+        db = self.session_factory(expire_on_commit=False)
+        pending: List[Tuple[_SourceProgress, NormalizedJob]] = []
+        try:
+            async for progress, jobs in self._batches(inp):
+                pending.extend((progress, job) for job in jobs)
+                # Full chunks go out at once, a partial one only when nothing else is queued
+                while len(pending) >= self.save_chunk_size or (pending and inp.empty()):
+                    chunk, pending = pending[:self.save_chunk_size], pending[self.save_chunk_size:]
+                    await self._save_chunk(db, chunk, out, result, run_start)
+            if pending:
+                await self._save_chunk(db, pending, out, result, run_start)
+
+            if stats.items_out:
+                await asyncio.to_thread(KeywordIndex(db).refresh_stats)
+        finally:
+            db.close()
+        await out.put(_DONE)
+
+    async def _save_chunk(
+        self,
+        db: Session,
+        chunk: List[Tuple[_SourceProgress, NormalizedJob]],
+        out: asyncio.Queue,
+        result: IngestResult,
+        run_start: float,
+    ) -> None:
+        stats = result.stages["save"]
+        start = time.monotonic()
+        try:
+            saved, saved_hashes = await asyncio.to_thread(self._save_sync, db, [job for _, job in chunk])
+        except Exception as e:
+            logger.error(f"Error saving {len(chunk)} jobs: {e}")
+            saved, saved_hashes = [], set()
+        stats.record(len(chunk), len(saved), time.monotonic() - start)
+
+        # Per source: how many of its jobs left the pipeline, and whether any was lost
+        settled: Dict[_SourceProgress, List[int]] = {}
+        for progress, job in chunk:
+            counts = settled.setdefault(progress, [0, 0])
+            counts[0] += 1
+            counts[1] += job.dedup_hash not in saved_hashes
+        for progress, (count, lost) in settled.items():
+            await progress.settle(count, failed=bool(lost))
+
+        if saved:
+            if result.first_save_seconds is None:
+                result.first_save_seconds = time.monotonic() - run_start
+            await self._put(out, saved, stats)
+
+    @staticmethod
+    def _save_sync(db: Session, chunk: List[NormalizedJob]) -> Tuple[List[SavedJob], Set[str]]:
+        _, saved_jobs = JobRepository(db).save_jobs_batch(chunk, refresh_keyword_stats=False)
+        return [SavedJob.from_job(job) for job in saved_jobs], {job.dedup_hash for job in saved_jobs}
+
+    async def _alerts(self, inp: asyncio.Queue, result: IngestResult) -> None:
+        """
+        Match each saved chunk against the active alerts as it arrives; each
+        alert still gets one notification per run, queued once saving is done.
+        """
+        stats = result.stages["alerts"]
+        alerts: List[UserAlert] = []
+        try:
+            alerts = await asyncio.to_thread(self._load_alerts)
+        except Exception as e:
+            logger.error(f"Error loading alerts: {e}")
+
+        matcher = AlertService(db=None)
+        matches: Dict[int, List[SavedJob]] = {}
+        # Keep draining even without alerts, or the save stage would block
+        async for jobs in self._batches(inp):
+            start = time.monotonic()
+            matched = 0
+            for alert in alerts:
+                alert_jobs = matcher._match_jobs_to_alert(alert, jobs)
+                if alert_jobs:
+                    matches.setdefault(alert.id, []).extend(alert_jobs)
+                    matched += len(alert_jobs)
+            stats.record(len(jobs), matched, time.monotonic() - start)
+
+        if not alerts:
+            if stats.items_in:
+                logger.info("No active alerts found, skipping email queue")
+            return
+        for alert in alerts:
+            alert_jobs = matches.get(alert.id)
+            if not alert_jobs:
+                continue
+            logger.info(f"Alert '{alert.name}' matched {len(alert_jobs)} jobs")
+            if await EmailQueueService.queue_email(alert.email, alert.name, alert_jobs):
+                result.notifications_queued += 1
+
+    def _load_alerts(self) -> List[UserAlert]:
+        db = self.session_factory()
+        try:
+            return db.query(UserAlert).filter_by(is_active=True).all()
+        finally:
+            db.close()
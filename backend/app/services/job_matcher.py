@@ -1,8 +1,12 @@
 import logging
 import numpy as np
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from app.models.job_model import Job
 from app.services.resume_parser import ResumeParser
+from app.services.embedding_index import embedding_index, normalize_rows
+from app.services.embedding_codec import job_embedding
+from app.services.ann_index import ann_index
+from app.services.keyword_index import extract_job_terms, keyword_score
 
 logger = logging.getLogger(__name__)
 
@@ -18,8 +22,41 @@ class JobMatcher:
     - Keyword overlap score (lexical)
     
     Falls back to keyword-only when embeddings are unavailable.
+
+    With settings.match_quantization = "int8" the in-memory index is int8
+    and only used to pick candidates; their semantic scores are then
+    recomputed exactly from the float vectors stored on the job rows.
+    Rows stored as int8 (settings.embedding_storage_dtype) have no float
+    vector to recompute from and keep their index score.
     """
 
+    # ── Candidate retrieval ──────────────────────────────────────
+
+    @staticmethod
+    def semantic_candidates(resume_embedding: Optional[List[float]], k: int) -> List[int]:
+        """
+        Ids of the k jobs nearest to the resume across the whole indexed
+        corpus, best first. Empty if there is no embedding or no index.
+        """
+        if not resume_embedding:
+            return []
+        ids, _ = ann_index.search(resume_embedding, k)
+        return ids.tolist()
+
+    @staticmethod
+    def candidate_columns() -> tuple:
+        """
+        Job columns match_jobs_hybrid reads on every candidate, beyond the
+        summary projection: the keyword-index flag and embedding_dim (a
+        cheap "has a packed vector" marker), plus the stored vectors when
+        int8 scores are rescored exactly. Only jobs that have a vector but
+        are missing from the embedding index load it lazily.
+        """
+        columns = (Job.keywords_indexed, Job.embedding_dim)
+        if embedding_index.dtype == "int8":
+            columns += (Job.embedding_packed, Job.embedding_dtype, Job.embedding)
+        return columns
+
     # ── Hybrid matching (primary) ────────────────────────────────
 
     @staticmethod
@@ -28,6 +65,7 @@ class JobMatcher:
         resume_embedding: Optional[List[float]],
         jobs: List[Job],
         top_n: int = 20,
+        keyword_scores: Optional[List[float]] = None,
     ) -> List[Dict]:
         """
         Score and rank jobs using a blend of semantic + keyword matching.
@@ -37,6 +75,9 @@ class JobMatcher:
             resume_embedding: Embedding vector of the resume (can be None).
             jobs: List of Job objects to score.
             top_n: Number of top matches to return.
+            keyword_scores: Precomputed keyword scores in [0, 1] aligned with
+                `jobs` (BM25 from KeywordIndex.score_jobs). If omitted, raw
+                keyword overlap normalized by the best job in `jobs` is used.
         
         Returns:
             List of dicts with job, match_score (0-100), keyword_score,
@@ -45,54 +86,43 @@ class JobMatcher:
         if not resume_text or not jobs:
             return []
 
-        resume_keywords = ResumeParser.extract_keywords(resume_text)
-
-        # -- Compute raw keyword scores ---------------------------------
-        keyword_scores: List[float] = []
-        for job in jobs:
-            ks = JobMatcher._calculate_keyword_score(resume_keywords, job)
-            keyword_scores.append(float(ks))
-
-        # Normalize keyword scores to 0-1 range
-        max_ks = max(keyword_scores) if keyword_scores else 1.0
-        norm_keyword = [s / max_ks if max_ks > 0 else 0.0 for s in keyword_scores]
+        # -- Compute keyword scores ------------------------------------
+        if keyword_scores is not None:
+            # Already on a stable 0-1 scale (BM25 from the keyword index)
+            norm_keyword = np.asarray(keyword_scores, dtype=np.float32)
+        else:
+            resume_keywords = ResumeParser.extract_keywords(resume_text)
+            raw_keyword = np.fromiter(
+                (JobMatcher._calculate_keyword_score(resume_keywords, job) for job in jobs),
+                dtype=np.float32,
+                count=len(jobs),
+            )
+            # Normalize overlap counts to 0-1 range within this window
+            max_ks = raw_keyword.max()
+            norm_keyword = raw_keyword / max_ks if max_ks > 0 else np.zeros_like(raw_keyword)
 
         # -- Compute cosine similarity scores ---------------------------
-        has_resume_emb = resume_embedding is not None and len(resume_embedding) > 0
-        cosine_scores: List[float] = []
-
-        for job in jobs:
-            if has_resume_emb and job.embedding:
-                cs = JobMatcher._cosine_similarity(resume_embedding, job.embedding)
-                cosine_scores.append(cs)
-            else:
-                # No embedding available – will rely only on keyword score
-                cosine_scores.append(0.0)
+        cosine_scores, job_has_emb = JobMatcher._semantic_scores(resume_embedding, jobs)
 
         # -- Blend into final score -------------------------------------
-        scored_jobs = []
-        for idx, job in enumerate(jobs):
-            job_has_emb = bool(job.embedding)
-
-            if has_resume_emb and job_has_emb:
-                # Full hybrid score
-                final = (
-                    SEMANTIC_WEIGHT * cosine_scores[idx]
-                    + KEYWORD_WEIGHT * norm_keyword[idx]
-                )
-            else:
-                # Fallback: keyword-only (normalized to 0-1)
-                final = norm_keyword[idx]
-
-            scored_jobs.append({
-                "job": job,
-                "match_score": round(final * 100, 2),      # 0-100 scale
-                "keyword_score": round(norm_keyword[idx] * 100, 2),
-                "semantic_score": round(cosine_scores[idx] * 100, 2),
-            })
+        # Full hybrid score where the job has an embedding,
+        # keyword-only (normalized to 0-1) otherwise
+        final_scores = np.where(
+            job_has_emb,
+            SEMANTIC_WEIGHT * cosine_scores + KEYWORD_WEIGHT * norm_keyword,
+            norm_keyword,
+        )
 
-        scored_jobs.sort(key=lambda x: x["match_score"], reverse=True)
-        return scored_jobs[:top_n]
+        # -- Build results for the winners only -------------------------
+        return [
+            {
+                "job": jobs[idx],
+                "match_score": round(float(final_scores[idx]) * 100, 2),      # 0-100 scale
+                "keyword_score": round(float(norm_keyword[idx]) * 100, 2),
+                "semantic_score": round(float(cosine_scores[idx]) * 100, 2),
+            }
+            for idx in JobMatcher._top_indices(final_scores, top_n)
+        ]
 
     # ── Legacy keyword-only matching (kept for backward compat) ──
 
@@ -110,20 +140,114 @@ class JobMatcher:
             logger.warning("No keywords extracted from resume")
             return []
 
-        scored_jobs = []
-        for job in jobs:
-            score = JobMatcher._calculate_keyword_score(resume_keywords, job)
-            scored_jobs.append({
-                "job": job,
+        scores = np.fromiter(
+            (JobMatcher._calculate_keyword_score(resume_keywords, job) for job in jobs),
+            dtype=np.int64,
+            count=len(jobs),
+        )
+
+        results = []
+        for idx in JobMatcher._top_indices(scores, top_n):
+            score = int(scores[idx])
+            results.append({
+                "job": jobs[idx],
                 "match_score": score,
                 "matched_keywords": score,
             })
-
-        scored_jobs.sort(key=lambda x: x["match_score"], reverse=True)
-        return scored_jobs[:top_n]
+        return results
 
     # ── Scoring helpers ──────────────────────────────────────────
 
+    @staticmethod
+    def _top_indices(scores: np.ndarray, top_n: int) -> np.ndarray:
+        """
+        Indices of the top_n highest scores, best first, without sorting the
+        whole array (argpartition, then sort only the winners).
+        Ties keep their input order, matching a stable full sort.
+        """
+        n = len(scores)
+        if top_n <= 0 or n == 0:
+            return np.empty(0, dtype=np.int64)
+        if top_n < n:
+            # Include every score tied with the k-th best so ties stay stable
+            kth = np.partition(scores, n - top_n)[n - top_n]
+            candidates = np.flatnonzero(scores >= kth)
+        else:
+            candidates = np.arange(n)
+        order = np.lexsort((candidates, -scores[candidates]))
+        return candidates[order][:top_n]
+
+    @staticmethod
+    def _semantic_scores(
+        resume_embedding: Optional[List[float]], jobs: List[Job]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Cosine similarity of the resume against each job via the shared
+        embedding index (one matrix-vector product, no per-job arrays).
+
+        Jobs that carry an embedding but are not indexed yet (e.g. written
+        by another worker process) are added to the index on the fly. They
+        are recognised by embedding_dim, so unembedded jobs cost no extra
+        query; every write packs vectors, and legacy JSON-only rows are
+        indexed at startup. Conversely, an indexed job whose row no longer
+        has a vector (cleared by another process after a text change) is
+        scored on keywords only and dropped from the index.
+
+        Returns (scores, has_embedding) arrays aligned with `jobs`.
+        """
+        scores = np.zeros(len(jobs), dtype=np.float32)
+        has_emb = np.zeros(len(jobs), dtype=bool)
+        if not resume_embedding:
+            return scores, has_emb
+
+        job_ids = [job.id for job in jobs]
+        rows = embedding_index.rows_for(job_ids)
+        missing = [
+            (job.id, job_embedding(job))
+            for job, row in zip(jobs, rows)
+            if row < 0 and job.embedding_dim is not None
+        ]
+        if missing:
+            embedding_index.upsert(missing)
+
+        snapshot = embedding_index.snapshot()
+        rows = embedding_index.rows_for(job_ids, snapshot)
+        q = embedding_index.normalize_query(resume_embedding, snapshot)
+        if q is None:
+            return scores, has_emb
+
+        stored = np.fromiter((job.embedding_dim is not None for job in jobs), dtype=bool, count=len(jobs))
+        stale = (rows >= 0) & ~stored
+        if stale.any():
+            embedding_index.remove([jobs[i].id for i in np.flatnonzero(stale)])
+        has_emb = (rows >= 0) & stored
+        if has_emb.any():
+            scores[has_emb] = snapshot.dot(q, rows[has_emb])
+            if snapshot.quantized:
+                JobMatcher._rescore_exact(q, jobs, has_emb, scores)
+        return scores, has_emb
+
+    @staticmethod
+    def _rescore_exact(q: np.ndarray, jobs: List[Job], has_emb: np.ndarray, scores: np.ndarray) -> None:
+        """
+        Replace int8-index scores with exact cosine similarity computed from
+        the full-precision vectors on the loaded job rows (in place).
+
+        Rows packed as int8 are skipped: decoding them gives back another
+        int8 approximation, no better than the index score.
+        """
+        positions, vectors = [], []
+        for i in np.flatnonzero(has_emb):
+            job = jobs[i]
+            if not job.has_embedding or (job.embedding_packed is not None and job.embedding_dtype == "int8"):
+                continue
+            vector = job_embedding(job)
+            if vector is not None and len(vector) == len(q):
+                positions.append(i)
+                vectors.append(vector)
+        if positions:
+            scores[positions] = normalize_rows(np.vstack(vectors)) @ q
+
     @staticmethod
     def _cosine_similarity(vec_a: List[float], vec_b: List[float]) -> float:
         """
@@ -153,29 +277,7 @@ class JobMatcher:
         if not resume_keywords:
             return 0
 
-        score = 0
-        
-        title_keywords = ResumeParser.extract_keywords(job.title or "")
-        description_keywords = ResumeParser.extract_keywords(job.description or "")
-        company_keywords = ResumeParser.extract_keywords(job.company or "")
-        location_keywords = ResumeParser.extract_keywords(job.location or "")
-        
-        # Title matches (weight: 3x)
-        title_matches = resume_keywords & title_keywords
-        score += len(title_matches) * 3
-        
-        # Description matches (weight: 1x)
-        description_matches = resume_keywords & description_keywords
-        score += len(description_matches)
-        
-        # Company matches (bonus: +2)
-        company_matches = resume_keywords & company_keywords
-        if company_matches:
-            score += 2
-        
-        # Location matches (bonus: +1)
-        location_matches = resume_keywords & location_keywords
-        if location_matches:
-            score += 1
-        
-        return score
+        job_terms = extract_job_terms(job)
+        return keyword_score({
+            field: len(resume_keywords & terms.keys()) for field, terms in job_terms.items()
+        })
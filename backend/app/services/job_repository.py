@@ -1,14 +1,99 @@
-from typing import Optional, List
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from dataclasses import dataclass
+from typing import Dict, Optional, List, Tuple
+from sqlalchemy.orm import Session, load_only, with_expression
+from sqlalchemy import and_, bindparam, case, func, null, or_, update
+from sqlalchemy.dialects import postgresql, sqlite
 from datetime import datetime, timedelta
+import base64
+import json
 import logging
+import time
 
+from app.core.config import settings
 from app.models.job_model import Job
 from app.services.normalizer import NormalizedJob
+from app.services.embedding_codec import job_embedding, packed_columns
+from app.services.embedding_index import embedding_index
+from app.services.embedding_service import EmbeddingService
+from app.services.full_text_search import apply_full_text_search
+from app.services.keyword_index import KeywordIndex
 
 logger = logging.getLogger(__name__)
 
+# Rows per INSERT ... ON CONFLICT statement in save_jobs_batch
+UPSERT_CHUNK_SIZE = 500
+
+# GET /jobs totals cached per filter combination: filters -> (expires_at, count)
+COUNT_CACHE_MAX_ENTRIES = 256
+_count_cache: Dict[tuple, Tuple[float, int]] = {}
+
+# Dialects whose INSERT supports ON CONFLICT DO UPDATE ... RETURNING
+UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def _packed_params(embedding) -> dict:
+    """Bind parameters for _PACKED_VALUES."""
+    columns = packed_columns(embedding)
+    return {
+        "b_packed": columns["embedding_packed"],
+        "b_dim": columns["embedding_dim"],
+        "b_dtype": columns["embedding_dtype"],
+    }
+
+
+# SET clause writing a packed vector (and emptying the legacy JSON column)
+_PACKED_VALUES = {
+    "embedding_packed": bindparam("b_packed", type_=Job.embedding_packed.type),
+    "embedding_dim": bindparam("b_dim", type_=Job.embedding_dim.type),
+    "embedding_dtype": bindparam("b_dtype", type_=Job.embedding_dtype.type),
+    "embedding": null(),
+}
+
+
+# Columns list endpoints return; the description is cut down to a snippet in SQL
+SUMMARY_COLUMNS = (
+    Job.id, Job.title, Job.company, Job.location, Job.job_type,
+    Job.apply_link, Job.source, Job.created_at,
+)
+
+
+def summary_options(*extra_columns) -> tuple:
+    """
+    Query options loading only SUMMARY_COLUMNS (plus `extra_columns`) and
+    Job.snippet. Other columns stay deferred and load on first access.
+    """
+    return (
+        load_only(*SUMMARY_COLUMNS, *extra_columns),
+        with_expression(Job.snippet, func.substr(Job.description, 1, settings.job_snippet_chars)),
+    )
+
+
+@dataclass
+class JobPage:
+    """One page of GET /jobs results."""
+    jobs: List[Job]
+    total: int
+    total_is_exact: bool
+    has_more: bool
+    next_cursor: Optional[str]
+
+
+def encode_job_cursor(job: Job) -> str:
+    """Opaque keyset cursor pointing just after `job` in (created_at, id) DESC order."""
+    raw = json.dumps({"c": job.created_at.isoformat() if job.created_at else None, "i": job.id})
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_job_cursor(cursor: str) -> tuple[datetime, int]:
+    """Inverse of encode_job_cursor. Raises ValueError if the cursor is malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(data["c"]), int(data["i"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
 class JobRepository:
     """
     Service layer for job database operations.
@@ -22,10 +107,19 @@ class JobRepository:
         Save a normalized job to the database.
         If dedup_hash already exists, update instead of duplicate.
         Optionally stores the vector embedding.
+
+        An existing job keeps its embedding unless its title/description
+        fingerprint changed; then the stale vector is dropped and the job
+        goes back to the backfill queue.
         """
+        fingerprint = EmbeddingService.job_text_fingerprint(job.title, job.description)
         existing = self.db.query(Job).filter_by(dedup_hash=job.dedup_hash).first()
 
         if existing:
+            text_changed = (
+                existing.text_fingerprint is not None
+                and existing.text_fingerprint != fingerprint
+            )
             # Update existing job
             existing.title = job.title
             existing.company = job.company
@@ -36,9 +130,16 @@ class JobRepository:
             existing.source = job.source
             existing.job_metadata = job.job_metadata
             existing.is_active = True
-            if embedding is not None:
-                existing.embedding = embedding
+            existing.text_fingerprint = fingerprint
+            if embedding is not None or (text_changed and existing.has_embedding):
+                for column, value in packed_columns(embedding).items():
+                    setattr(existing, column, value)
+                existing.embedding_claimed_until = None
             self.db.commit()
+            if embedding is not None:
+                embedding_index.upsert([(existing.id, embedding)])
+            elif text_changed:
+                embedding_index.remove([existing.id])
             return existing
 
         # Create new job
@@ -52,41 +153,178 @@ class JobRepository:
             source=job.source,
             dedup_hash=job.dedup_hash,
             job_metadata=job.job_metadata,
-            embedding=embedding,
+            text_fingerprint=fingerprint,
+            **packed_columns(embedding),
             is_active=True,
         )
         self.db.add(db_job)
         self.db.commit()
         self.db.refresh(db_job)
+        if embedding is not None:
+            embedding_index.upsert([(db_job.id, embedding)])
         return db_job
 
     def save_jobs_batch(
         self,
         jobs: List[NormalizedJob],
         embeddings: Optional[List[Optional[List[float]]]] = None,
+        refresh_keyword_stats: bool = True,
     ) -> tuple[int, List[Job]]:
         """
         Batch save multiple normalized jobs.
         Optionally accepts a parallel list of embeddings (one per job).
+
+        Rows are written in chunks with INSERT ... ON CONFLICT (dedup_hash)
+        DO UPDATE ... RETURNING (PostgreSQL and SQLite). If a chunk fails,
+        e.g. because one row breaks another constraint, it is rolled back
+        and its rows are saved one at a time so the bad row only loses itself.
+        Saved jobs are (re)indexed in the keyword index in one pass; callers
+        saving many small batches can pass refresh_keyword_stats=False and
+        call KeywordIndex.refresh_stats() once at the end.
         Returns (count, list_of_saved_jobs).
         """
-        count = 0
-        saved_jobs = []
+        # ON CONFLICT cannot touch a row twice per statement; last occurrence wins
+        latest = {}
         for idx, job in enumerate(jobs):
+            emb = embeddings[idx] if embeddings and idx < len(embeddings) else None
+            latest[job.dedup_hash] = (job, emb)
+        items = list(latest.values())
+
+        saved_jobs = []
+        for start in range(0, len(items), UPSERT_CHUNK_SIZE):
+            chunk = items[start:start + UPSERT_CHUNK_SIZE]
+            saved = self._upsert_chunk(chunk)
+            if saved is None:
+                saved = self._save_rows(chunk)
+            saved_jobs.extend(saved)
+
+        keyword_index = KeywordIndex(self.db)
+        if keyword_index.index_jobs(saved_jobs) and refresh_keyword_stats:
+            keyword_index.refresh_stats()
+        return len(saved_jobs), saved_jobs
+
+    def _upsert_chunk(self, chunk: List[tuple]) -> Optional[List[Job]]:
+        """
+        Upsert (NormalizedJob, embedding) pairs in one statement.
+        Returns the saved rows in input order, or None if the chunk must be
+        retried row by row (statement failed or unsupported database).
+        """
+        dialect_insert = UPSERT_INSERTS.get(self.db.get_bind().dialect.name)
+        if dialect_insert is None:
+            return None
+
+        rows = [
+            {
+                "title": job.title,
+                "company": job.company,
+                "location": job.location,
+                "job_type": job.job_type,
+                "description": job.description,
+                "apply_link": job.apply_link,
+                "source": job.source,
+                "dedup_hash": job.dedup_hash,
+                "job_metadata": job.job_metadata,
+                **packed_columns(emb),
+                "text_fingerprint": EmbeddingService.job_text_fingerprint(job.title, job.description),
+                "is_active": True,
+            }
+            for job, emb in chunk
+        ]
+        stmt = dialect_insert(Job).values(rows)
+        excluded = stmt.excluded
+        # Same rule as save_job: a changed title/description invalidates the embedding
+        text_changed = and_(
+            Job.text_fingerprint.isnot(None),
+            Job.text_fingerprint != excluded.text_fingerprint,
+        )
+        # A supplied vector wins, a text change clears it, otherwise keep what is stored
+        embedding_columns = {
+            column: case(
+                (excluded.embedding_packed.isnot(None), getattr(excluded, column)),
+                (text_changed, null()),
+                else_=getattr(Job, column),
+            )
+            for column in ("embedding_packed", "embedding_dim", "embedding_dtype", "embedding")
+        }
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Job.dedup_hash],
+            set_={
+                "title": excluded.title,
+                "company": excluded.company,
+                "location": excluded.location,
+                "job_type": excluded.job_type,
+                "description": excluded.description,
+                "apply_link": excluded.apply_link,
+                "source": excluded.source,
+                "job_metadata": excluded.job_metadata,
+                "is_active": True,
+                "text_fingerprint": excluded.text_fingerprint,
+                **embedding_columns,
+                "embedding_claimed_until": case(
+                    (text_changed, null()), else_=Job.embedding_claimed_until
+                ),
+                "updated_at": func.now(),
+            },
+        ).returning(Job.id)
+
+        try:
+            ids = [row.id for row in self.db.execute(stmt)]
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            logger.warning(f"Bulk upsert of {len(chunk)} jobs failed, saving rows individually: {e}")
+            return None
+
+        by_hash = {
+            job.dedup_hash: job
+            for job in self.db.query(Job).filter(Job.id.in_(ids)).populate_existing()
+        }
+        saved = [by_hash[job.dedup_hash] for job, _ in chunk if job.dedup_hash in by_hash]
+
+        # Keep the in-memory matrix in step: new vectors in, invalidated ones out
+        vectors = [(job.id, job_embedding(job)) for job in saved]
+        embedding_index.upsert([(job_id, vec) for job_id, vec in vectors if vec is not None])
+        embedding_index.remove([job_id for job_id, vec in vectors if vec is None])
+        return saved
+
+    def _save_rows(self, chunk: List[tuple]) -> List[Job]:
+        """Save (NormalizedJob, embedding) pairs one by one, skipping rows that fail."""
+        saved_jobs = []
+        for job, emb in chunk:
             try:
-                emb = embeddings[idx] if embeddings and idx < len(embeddings) else None
-                saved_job = self.save_job(job, embedding=emb)
-                saved_jobs.append(saved_job)
-                count += 1
+                saved_jobs.append(self.save_job(job, embedding=emb))
             except Exception as e:
+                self.db.rollback()
                 logger.error(f"Error saving job {job.title}: {e}")
                 continue
-        return count, saved_jobs
+        return saved_jobs
 
     def get_job_by_id(self, job_id: int) -> Optional[Job]:
         """Get job by ID."""
         return self.db.query(Job).filter_by(id=job_id).first()
 
+    def get_jobs_by_ids(
+        self,
+        job_ids: List[int],
+        active_only: bool = True,
+        summary: bool = False,
+        extra_columns: tuple = (),
+    ) -> List[Job]:
+        """
+        Load jobs by id, preserving the order of `job_ids`.
+        Ids that do not exist (or are inactive) are skipped.
+        With `summary`, only the summary projection (plus `extra_columns`) is read.
+        """
+        if not job_ids:
+            return []
+        query = self.db.query(Job).filter(Job.id.in_(job_ids))
+        if active_only:
+            query = query.filter_by(is_active=True)
+        if summary:
+            query = query.options(*summary_options(*extra_columns))
+        by_id = {job.id: job for job in query.all()}
+        return [by_id[job_id] for job_id in job_ids if job_id in by_id]
+
     def get_jobs_without_embeddings(self, limit: int = 500) -> List[Job]:
         """
         Get active jobs that don't have embeddings yet.
@@ -95,35 +333,232 @@ class JobRepository:
         return (
             self.db.query(Job)
             .filter_by(is_active=True)
-            .filter(Job.embedding.is_(None))
+            .filter(~Job.has_embedding)
             .order_by(Job.created_at.desc())
             .limit(limit)
             .all()
         )
 
+    def get_recent_job_ids_without_embeddings(self, limit: int) -> List[int]:
+        """
+        Ids of the most recent active jobs that don't have embeddings yet.
+        Resume matching scores them on keywords next to the semantic candidates.
+        """
+        if limit <= 0:
+            return []
+        return [
+            job_id for (job_id,) in
+            self.db.query(Job.id)
+            .filter_by(is_active=True)
+            .filter(~Job.has_embedding)
+            .order_by(Job.created_at.desc(), Job.id.desc())
+            .limit(limit)
+        ]
+
+    def claim_jobs_without_embeddings(self, limit: int, lease_seconds: int) -> List[Job]:
+        """
+        Lease up to `limit` active jobs without embeddings to this worker.
+
+        Claimed jobs are skipped by other workers until the lease expires,
+        so several backfill workers can drain the queue without embedding
+        the same job twice. A worker that dies simply lets its leases run out.
+        On PostgreSQL the candidate rows are locked with FOR UPDATE SKIP LOCKED;
+        elsewhere the conditional UPDATE decides who wins a race.
+        """
+        now = datetime.utcnow()
+        lease_until = now + timedelta(seconds=lease_seconds)
+        claimable = and_(
+            Job.is_active.is_(True),
+            ~Job.has_embedding,
+            or_(Job.embedding_claimed_until.is_(None), Job.embedding_claimed_until < now),
+        )
+        try:
+            candidate_ids = [
+                job_id for (job_id,) in self.db.query(Job.id)
+                .filter(claimable)
+                .order_by(Job.created_at.desc())
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            ]
+            if not candidate_ids:
+                self.db.rollback()
+                return []
+            self.db.execute(
+                update(Job)
+                .where(Job.id.in_(candidate_ids))
+                .where(claimable)
+                .values(embedding_claimed_until=lease_until)
+                .execution_options(synchronize_session=False)
+            )
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Error claiming jobs for embedding backfill: {e}")
+            return []
+
+        # The lease timestamp doubles as a claim token
+        return (
+            self.db.query(Job)
+            .filter(Job.id.in_(candidate_ids))
+            .filter(Job.embedding_claimed_until == lease_until)
+            .order_by(Job.created_at.desc())
+            .all()
+        )
+
+    def release_embedding_claims(self, job_ids: List[int]) -> None:
+        """
+        Return claimed jobs to the backfill queue (e.g. after a failed batch).
+        """
+        if not job_ids:
+            return
+        try:
+            self.db.execute(
+                update(Job)
+                .where(Job.id.in_(job_ids))
+                .values(embedding_claimed_until=None)
+                .execution_options(synchronize_session=False)
+            )
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Error releasing embedding claims: {e}")
+
+    def count_jobs_without_embeddings(self) -> int:
+        """
+        Number of active jobs still waiting for an embedding (backfill backlog).
+        """
+        return (
+            self.db.query(func.count(Job.id))
+            .filter(Job.is_active.is_(True))
+            .filter(~Job.has_embedding)
+            .scalar()
+        ) or 0
+
     def update_embeddings_batch(self, job_embedding_pairs: List[tuple]) -> int:
         """
         Bulk update embeddings for jobs.
+
+        Writes with one executemany UPDATE keyed by id (no ORM objects are
+        loaded) and logs the number of rows updated and the elapsed time.
         
         Args:
-            job_embedding_pairs: List of (job_id, embedding_vector) tuples.
+            job_embedding_pairs: List of (job_id, embedding_vector) tuples, or
+                (job_id, embedding_vector, text_fingerprint) to skip jobs whose
+                text changed after it was sent for embedding.
         
         Returns:
             Number of jobs updated.
         """
-        updated = 0
-        for job_id, embedding in job_embedding_pairs:
-            try:
-                job = self.db.query(Job).filter_by(id=job_id).first()
-                if job:
-                    job.embedding = embedding
-                    updated += 1
-            except Exception as e:
-                logger.error(f"Error updating embedding for job {job_id}: {e}")
-                continue
-        self.db.commit()
+        if not job_embedding_pairs:
+            return 0
+        start = time.perf_counter()
+
+        # Last write wins for ids repeated within the batch
+        latest = {}
+        for pair in job_embedding_pairs:
+            latest[pair[0]] = (pair[1], pair[2] if len(pair) > 2 else None)
+
+        # One narrow read drops deleted jobs and stale (text changed) results up front
+        ids = list(latest)
+        current = {}
+        for i in range(0, len(ids), UPSERT_CHUNK_SIZE):
+            current.update(
+                self.db.query(Job.id, Job.text_fingerprint).filter(Job.id.in_(ids[i:i + UPSERT_CHUNK_SIZE]))
+            )
+        params = [
+            {"b_id": job_id, "b_embedding": embedding, "b_fingerprint": fingerprint, **_packed_params(embedding)}
+            for job_id, (embedding, fingerprint) in latest.items()
+            if job_id in current and (not fingerprint or current[job_id] in (None, fingerprint))
+        ]
+        skipped = len(latest) - len(params)
+        if skipped:
+            logger.debug(f"Skipping {skipped} embeddings for deleted or changed jobs")
+        if not params:
+            return 0
+
+        # Core UPDATE on the table (not the ORM entity) so the params run as one executemany.
+        # The WHERE clause re-checks the fingerprint in case the text changed since the read.
+        jobs = Job.__table__
+        stmt = (
+            update(jobs)
+            .where(jobs.c.id == bindparam("b_id"))
+            .where(or_(
+                bindparam("b_fingerprint").is_(None),
+                jobs.c.text_fingerprint.is_(None),
+                jobs.c.text_fingerprint == bindparam("b_fingerprint"),
+            ))
+            .values(
+                **_PACKED_VALUES,
+                text_fingerprint=func.coalesce(bindparam("b_fingerprint"), jobs.c.text_fingerprint),
+                embedding_claimed_until=None,
+            )
+        )
+        try:
+            self.db.connection().execute(stmt, params)
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Error updating embeddings for {len(params)} jobs: {e}")
+            return 0
+
+        # executemany has no RETURNING and drivers differ on rowcount: re-read which
+        # rows now hold the fingerprint that was sent (the WHERE clause skipped the rest)
+        stored = {}
+        sent_ids = [p["b_id"] for p in params]
+        for i in range(0, len(sent_ids), UPSERT_CHUNK_SIZE):
+            stored.update(
+                self.db.query(Job.id, Job.text_fingerprint)
+                .filter(Job.id.in_(sent_ids[i:i + UPSERT_CHUNK_SIZE]), Job.embedding_dim.isnot(None))
+            )
+        applied = [
+            (p["b_id"], p["b_embedding"])
+            for p in params
+            if p["b_id"] in stored and (p["b_fingerprint"] is None or stored[p["b_id"]] == p["b_fingerprint"])
+        ]
+        updated = len(applied)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        logger.info(f"Updated embeddings for {updated} jobs in {elapsed_ms:.0f} ms")
+        if updated < len(params):
+            logger.debug(f"Skipped {len(params) - updated} embeddings for jobs whose text changed meanwhile")
+
+        # Keep the in-memory matrix in step with the committed rows
+        embedding_index.upsert(applied)
         return updated
 
+    def migrate_legacy_embeddings(self, limit: int = 1000) -> int:
+        """
+        Move up to `limit` embeddings from the legacy JSON column to
+        embedding_packed (online: runs in small batches next to normal
+        traffic; readers accept either format meanwhile).
+        Returns the number of rows migrated.
+        """
+        rows = (
+            self.db.query(Job.id, Job.embedding)
+            .filter(Job.embedding_packed.is_(None))
+            .filter(Job.embedding.isnot(None))
+            .limit(limit)
+            .all()
+        )
+        params = [{"b_id": job_id, **_packed_params(embedding)} for job_id, embedding in rows if embedding]
+        if not params:
+            return 0
+
+        jobs = Job.__table__
+        stmt = (
+            update(jobs)
+            .where(jobs.c.id == bindparam("b_id"))
+            .where(jobs.c.embedding_packed.is_(None))
+            .values(**_PACKED_VALUES)
+        )
+        try:
+            self.db.connection().execute(stmt, params)
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Error migrating {len(params)} embeddings to packed storage: {e}")
+            return 0
+        return len(params)
+
     def search_jobs(
         self,
         title: Optional[str] = None,
@@ -134,12 +569,99 @@ class JobRepository:
         is_active: bool = True,
         skip: int = 0,
         limit: int = 50,
+        summary: bool = False,
+        extra_columns: tuple = (),
     ) -> tuple[List[Job], int]:
         """
         Search jobs with optional filters.
         Returns (results, total_count).
+        With `summary`, only the summary projection (plus `extra_columns`) is read.
         """
+        query = self._filtered_query(title, company, location, job_type, source, is_active=is_active)
+        total = query.count()
+        if summary:
+            query = query.options(*summary_options(*extra_columns))
+        jobs = query.order_by(Job.created_at.desc(), Job.id.desc()).offset(skip).limit(limit).all()
+
+        return jobs, total
+
+    def list_jobs(
+        self,
+        title: Optional[str] = None,
+        company: Optional[str] = None,
+        location: Optional[str] = None,
+        job_type: Optional[str] = None,
+        source: Optional[str] = None,
+        q: Optional[str] = None,
+        cursor: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 50,
+        exact_total: bool = False,
+        summary: bool = False,
+    ) -> JobPage:
+        """
+        One page of active jobs, newest first, for GET /jobs.
+
+        With a cursor (from a previous page's next_cursor) the page starts
+        right after that job using the (created_at, id) index instead of
+        OFFSET, so deep pages cost the same as the first. Without one,
+        `skip` works as before. The total comes from a short-lived cache
+        unless exact_total is set.
+
+        With `q`, results are full-text matches ranked by relevance
+        (combined with the substring filters) and paged with `skip`.
+        With `summary`, only the summary projection is read.
+
+        Raises:
+            ValueError: the cursor is malformed, or combined with `q`.
+        """
+        q = (q or "").strip() or None
+        if q and cursor:
+            raise ValueError("cursor paging is not available for ranked search (q); use skip")
+        filters = (title, company, location, job_type, source, q)
+        query = self._filtered_query(*filters, is_active=True)
+
+        if cursor:
+            created_at, last_id = decode_job_cursor(cursor)
+            created_col, created_val = Job.created_at, created_at
+            if self.db.get_bind().dialect.name == "sqlite":
+                # SQLite stores timestamps as text in mixed formats; compare julian days
+                created_col = func.julianday(Job.created_at)
+                created_val = func.julianday(created_at.replace(tzinfo=None).isoformat(" "))
+            query = query.filter(or_(
+                created_col < created_val,
+                and_(created_col == created_val, Job.id < last_id),
+            ))
+
+        if summary:
+            query = query.options(*summary_options())
+
+        # One extra row tells whether another page follows
+        if not q:
+            query = query.order_by(Job.created_at.desc(), Job.id.desc())
+        if skip and not cursor:
+            query = query.offset(skip)
+        rows = query.limit(limit + 1).all()
+        jobs, has_more = rows[:limit], len(rows) > limit
+        next_cursor = encode_job_cursor(jobs[-1]) if has_more and not q else None
+
+        total, total_is_exact = self._count_jobs(filters, exact_total)
+        return JobPage(jobs, total, total_is_exact, has_more, next_cursor)
+
+    def _filtered_query(
+        self,
+        title: Optional[str] = None,
+        company: Optional[str] = None,
+        location: Optional[str] = None,
+        job_type: Optional[str] = None,
+        source: Optional[str] = None,
+        q: Optional[str] = None,
+        is_active: bool = True,
+    ):
         query = self.db.query(Job).filter_by(is_active=is_active)
+        if q:
+            # Also orders by relevance (dropped again for counting)
+            query = apply_full_text_search(query, q, self.db.get_bind().dialect.name)
 
         if title:
             query = query.filter(Job.title.ilike(f"%{title}%"))
@@ -151,11 +673,23 @@ class JobRepository:
             query = query.filter_by(job_type=job_type)
         if source:
             query = query.filter_by(source=source)
+        return query
 
-        total = query.count()
-        jobs = query.order_by(Job.created_at.desc()).offset(skip).limit(limit).all()
+    def _count_jobs(self, filters: tuple, exact: bool) -> tuple[int, bool]:
+        """
+        Active-job count for the given filters: (total, is_exact).
+        Cached per filter combination for settings.jobs_count_cache_seconds.
+        """
+        now = time.monotonic()
+        cached = _count_cache.get(filters)
+        if cached and not exact and cached[0] > now:
+            return cached[1], False
 
-        return jobs, total
+        total = self._filtered_query(*filters, is_active=True).order_by(None).count()
+        if len(_count_cache) >= COUNT_CACHE_MAX_ENTRIES:
+            _count_cache.clear()
+        _count_cache[filters] = (now + settings.jobs_count_cache_seconds, total)
+        return total, True
 
     def delete_old_jobs(self, older_than_days: int = 30) -> int:
         """
@@ -170,12 +704,20 @@ class JobRepository:
         """
         cutoff = datetime.utcnow() - timedelta(days=older_than_days)
         try:
+            stale_ids = [
+                job_id for (job_id,) in
+                self.db.query(Job.id).filter(Job.created_at < cutoff).all()
+            ]
+            KeywordIndex(self.db).remove_jobs(stale_ids)
             count = (
                 self.db.query(Job)
                 .filter(Job.created_at < cutoff)
                 .delete(synchronize_session="fetch")
             )
             self.db.commit()
+            embedding_index.remove(stale_ids)
+            if count:
+                KeywordIndex(self.db).refresh_stats()
             logger.info(f"Deleted {count} jobs older than {older_than_days} days (before {cutoff.date()})")
             return count
         except Exception as e:
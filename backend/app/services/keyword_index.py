@@ -0,0 +1,300 @@
+"""
+Persistent inverted keyword index over job fields.
+
+Jobs are tokenized once, at ingest time, into (term, job_id, field)
+postings in the `job_terms` table. Resume keyword scoring then walks the
+postings for the resume's terms instead of re-tokenizing every job.
+
+Scores are BM25 with per-field weights. Document frequencies and field
+lengths are precomputed over the whole active corpus (term_stats /
+field_stats), so a job's score does not depend on which other jobs were
+loaded alongside it and can be cached.
+"""
+
+import logging
+import math
+import time
+from collections import Counter
+from typing import Dict, Iterable, List, Set, Tuple
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.job_model import Job
+from app.models.job_term_model import JobTerm, TermStat, FieldStat
+from app.services.resume_parser import ResumeParser
+
+logger = logging.getLogger(__name__)
+
+INDEXED_FIELDS = ("title", "description", "company", "location")
+
+# Longer tokens are almost always noise (URLs, hashes) and would not fit the column
+MAX_TERM_LENGTH = 100
+
+# Bound the size of IN (...) lists sent to the database
+CHUNK_SIZE = 500
+
+# field_stats changes at most once per ingest run; cache it in-process
+FIELD_STATS_TTL_SECONDS = 300
+_field_stats_cache: Dict[str, object] = {"expires": 0.0, "value": {}}
+
+
+def extract_job_terms(job: Job) -> Dict[str, Counter]:
+    """
+    Tokenize each indexed field of a job into term -> frequency counts.
+    """
+    return {
+        field: Counter(
+            term for term in ResumeParser.tokenize(getattr(job, field) or "")
+            if len(term) <= MAX_TERM_LENGTH
+        )
+        for field in INDEXED_FIELDS
+    }
+
+
+def keyword_score(field_matches: Dict[str, int]) -> int:
+    """
+    Combine per-field match counts into the legacy overlap score
+    (used by JobMatcher when no keyword index scores are supplied).
+
+    - Title match: 3 points per shared keyword
+    - Description match: 1 point per shared keyword
+    - Company match: +2 bonus if any keyword is shared
+    - Location match: +1 bonus if any keyword is shared
+    """
+    score = field_matches.get("title", 0) * 3
+    score += field_matches.get("description", 0)
+    if field_matches.get("company", 0):
+        score += 2
+    if field_matches.get("location", 0):
+        score += 1
+    return score
+
+
+def field_weights() -> Dict[str, float]:
+    """Per-field BM25 weights from settings."""
+    return {
+        "title": settings.bm25_title_weight,
+        "description": settings.bm25_description_weight,
+        "company": settings.bm25_company_weight,
+        "location": settings.bm25_location_weight,
+    }
+
+
+def _chunks(items: List, size: int = CHUNK_SIZE) -> Iterable[List]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+class KeywordIndex:
+    """
+    Maintains and queries the job_terms inverted index.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    # ── Maintenance ──────────────────────────────────────────────
+
+    def index_jobs(self, jobs: List[Job]) -> int:
+        """
+        (Re)index the given jobs, replacing any postings they already have.
+        Commits once for the whole batch. Returns the number of postings written.
+        """
+        jobs = [job for job in jobs if job.id is not None]
+        if not jobs:
+            return 0
+
+        postings = []
+        for job in jobs:
+            for field, counts in extract_job_terms(job).items():
+                length = sum(counts.values())
+                postings.extend(
+                    {"term": term, "job_id": job.id, "field": field, "tf": tf, "field_length": length}
+                    for term, tf in counts.items()
+                )
+
+        try:
+            self._delete_postings([job.id for job in jobs])
+            for chunk in _chunks(postings, 5000):
+                self.db.execute(insert(JobTerm), chunk)
+            for job in jobs:
+                job.keywords_indexed = True
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Error indexing keywords for {len(jobs)} jobs: {e}")
+            return 0
+
+        logger.debug(f"Indexed {len(postings)} keyword postings for {len(jobs)} jobs")
+        return len(postings)
+
+    def remove_jobs(self, job_ids: List[int]) -> None:
+        """
+        Drop postings for the given jobs (caller commits).
+        """
+        self._delete_postings(job_ids)
+
+    def index_missing(self, limit: int = 500) -> int:
+        """
+        Index up to `limit` jobs that are not in the index yet
+        (e.g. rows saved before the index existed).
+        Returns the number of jobs indexed. Caller refreshes the statistics.
+        """
+        jobs = (
+            self.db.query(Job)
+            .filter(Job.keywords_indexed.is_(False))
+            .order_by(Job.created_at.desc())
+            .limit(limit)
+            .all()
+        )
+        if jobs:
+            self.index_jobs(jobs)
+        return len(jobs)
+
+    def refresh_stats(self) -> None:
+        """
+        Recompute BM25 corpus statistics (document frequencies and field
+        lengths) over the postings of active jobs, in one transaction.
+        """
+        active_postings = (
+            select(JobTerm)
+            .join(Job, Job.id == JobTerm.job_id)
+            .where(Job.is_active.is_(True))
+            .subquery()
+        )
+        per_job_fields = (
+            select(active_postings.c.job_id, active_postings.c.field, active_postings.c.field_length)
+            .distinct()
+            .subquery()
+        )
+        try:
+            self.db.execute(delete(TermStat))
+            self.db.execute(
+                insert(TermStat).from_select(
+                    ["term", "field", "doc_freq"],
+                    select(active_postings.c.term, active_postings.c.field, func.count())
+                    .group_by(active_postings.c.term, active_postings.c.field),
+                )
+            )
+            self.db.execute(delete(FieldStat))
+            self.db.execute(
+                insert(FieldStat).from_select(
+                    ["field", "doc_count", "total_length"],
+                    select(per_job_fields.c.field, func.count(), func.sum(per_job_fields.c.field_length))
+                    .group_by(per_job_fields.c.field),
+                )
+            )
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Error refreshing keyword index statistics: {e}")
+            return
+
+        _field_stats_cache["expires"] = 0.0
+        logger.info("Keyword index statistics refreshed")
+
+    def _delete_postings(self, job_ids: List[int]) -> None:
+        for chunk in _chunks(list(job_ids)):
+            self.db.execute(delete(JobTerm).where(JobTerm.job_id.in_(chunk)))
+
+    # ── Scoring ──────────────────────────────────────────────────
+
+    def score_jobs(self, resume_keywords: Set[str], jobs: List[Job]) -> List[float]:
+        """
+        BM25 keyword score in [0, 1) for each job (aligned with `jobs`).
+
+        Indexed jobs are scored from the postings of the resume's terms;
+        jobs not indexed yet fall back to tokenizing their fields. Raw
+        scores are mapped to [0, 1) with s / (s + bm25_half_score), which
+        is independent of the other jobs being scored.
+        """
+        terms = [term for term in resume_keywords if len(term) <= MAX_TERM_LENGTH]
+        if not terms or not jobs:
+            return [0.0] * len(jobs)
+
+        field_stats = self._field_stats()
+        idf = self._idf(terms, field_stats)
+        weights = field_weights()
+        raw = [0.0] * len(jobs)
+
+        position = {job.id: i for i, job in enumerate(jobs)}
+        indexed_ids = [job.id for job in jobs if job.keywords_indexed]
+        for job_id, term, field, tf, length in self._postings(terms, indexed_ids):
+            raw[position[job_id]] += self._bm25(idf, field_stats, weights, term, field, tf, length)
+
+        term_set = set(terms)
+        for i, job in enumerate(jobs):
+            if job.keywords_indexed:
+                continue
+            for field, counts in extract_job_terms(job).items():
+                length = sum(counts.values())
+                for term in term_set & counts.keys():
+                    raw[i] += self._bm25(idf, field_stats, weights, term, field, counts[term], length)
+
+        half = settings.bm25_half_score
+        return [s / (s + half) if s > 0 else 0.0 for s in raw]
+
+    @staticmethod
+    def _bm25(idf, field_stats, weights, term: str, field: str, tf: int, length: int) -> float:
+        """Weighted BM25 contribution of one term occurring in one job field."""
+        weight = weights.get(field, 0.0)
+        if not weight:
+            return 0.0
+        _, avg_length = field_stats.get(field, (0, 1.0))
+        k1, b = settings.bm25_k1, settings.bm25_b
+        norm = k1 * (1 - b + b * length / avg_length)
+        return weight * idf[(term, field)] * tf * (k1 + 1) / (tf + norm)
+
+    def _idf(
+        self, terms: List[str], field_stats: Dict[str, Tuple[int, float]]
+    ) -> Dict[Tuple[str, str], float]:
+        """
+        BM25 idf per (term, field). Terms missing from term_stats (indexed
+        since the last refresh) are treated as appearing in one document.
+        """
+        doc_freq: Dict[Tuple[str, str], int] = {}
+        for chunk in _chunks(terms):
+            rows = self.db.query(TermStat.term, TermStat.field, TermStat.doc_freq).filter(
+                TermStat.term.in_(chunk)
+            )
+            for term, field, df in rows:
+                doc_freq[(term, field)] = df
+
+        idf = {}
+        for field in INDEXED_FIELDS:
+            n = max(field_stats.get(field, (0, 1.0))[0], 1)
+            for term in terms:
+                df = min(max(doc_freq.get((term, field), 1), 1), n)
+                idf[(term, field)] = math.log(1 + (n - df + 0.5) / (df + 0.5))
+        return idf
+
+    def _field_stats(self) -> Dict[str, Tuple[int, float]]:
+        """Per-field (doc_count, average_length), cached for a few minutes."""
+        now = time.monotonic()
+        if now < _field_stats_cache["expires"]:
+            return _field_stats_cache["value"]
+
+        stats = {
+            field: (doc_count, (total_length / doc_count) if doc_count and total_length else 1.0)
+            for field, doc_count, total_length in self.db.query(
+                FieldStat.field, FieldStat.doc_count, FieldStat.total_length
+            )
+        }
+        _field_stats_cache["value"] = stats
+        _field_stats_cache["expires"] = now + FIELD_STATS_TTL_SECONDS
+        return stats
+
+    def _postings(self, terms: List[str], job_ids: List[int]) -> Iterable[Tuple[int, str, str, int, int]]:
+        """
+        Postings of the given terms restricted to the given jobs:
+        (job_id, term, field, tf, field_length) rows.
+        """
+        if not job_ids:
+            return
+        for term_chunk in _chunks(terms):
+            for id_chunk in _chunks(job_ids):
+                yield from self.db.query(
+                    JobTerm.job_id, JobTerm.term, JobTerm.field, JobTerm.tf, JobTerm.field_length
+                ).filter(JobTerm.term.in_(term_chunk), JobTerm.job_id.in_(id_chunk))
@@ -0,0 +1,140 @@
+"""
+Bounded process pool for resume PDF text extraction.
+
+pdfplumber is CPU-bound and synchronous; running it inside an async route
+stalls every other request on the worker. Extraction runs in separate
+processes instead, with a byte-size guard, a page cap and a per-document
+time budget. A worker that blows the budget (e.g. on a pathological PDF)
+is killed and the pool is replaced.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Optional
+
+from app.core.config import settings
+from app.services.resume_parser import ResumeParser
+
+logger = logging.getLogger(__name__)
+
+
+class PdfExtractionError(Exception):
+    """PDF text extraction could not be completed."""
+
+
+class PdfTooLargeError(PdfExtractionError):
+    """Upload exceeds the configured byte-size limit."""
+
+
+class PdfExtractionTimeout(PdfExtractionError):
+    """Extraction exceeded the per-document time budget."""
+
+
+def _extract_in_worker(pdf_bytes: bytes, max_pages: int) -> str:
+    """Runs in a pool process."""
+    return ResumeParser.extract_text_from_bytes(pdf_bytes, max_pages=max_pages)
+
+
+class PdfExtractionPool:
+    """
+    Runs ResumeParser.extract_text_from_bytes in a small process pool.
+
+    At most `max_workers` documents are extracted at once; further uploads
+    wait for a free slot, and the time budget starts once a slot is taken.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = settings.resume_extract_workers,
+        timeout_seconds: float = settings.resume_extract_timeout_seconds,
+        max_pages: int = settings.resume_max_pages,
+        max_bytes: int = settings.resume_max_bytes,
+        extract_fn: Callable[[bytes, int], str] = _extract_in_worker,
+    ):
+        self.max_workers = max_workers
+        # Module-level function run in the workers (picklable for spawn)
+        self.extract_fn = extract_fn
+        self.timeout_seconds = timeout_seconds
+        self.max_pages = max_pages
+        self.max_bytes = max_bytes
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    async def extract_text(self, pdf_bytes: bytes) -> str:
+        """
+        Extract cleaned text from PDF bytes without blocking the event loop.
+
+        Raises:
+            PdfTooLargeError: the upload is bigger than max_bytes.
+            PdfExtractionTimeout: extraction took longer than timeout_seconds.
+            PdfExtractionError: the worker process died.
+        """
+        if len(pdf_bytes) > self.max_bytes:
+            raise PdfTooLargeError(f"PDF is {len(pdf_bytes)} bytes (limit {self.max_bytes})")
+
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_workers)
+
+        async with self._slots:
+            try:
+                return await self._run(pdf_bytes)
+            except BrokenProcessPool:
+                # Another document's timeout killed the pool under us; retry once
+                logger.warning("PDF extraction pool was reset; retrying once")
+                try:
+                    return await self._run(pdf_bytes)
+                except BrokenProcessPool as e:
+                    raise PdfExtractionError("PDF extraction worker crashed") from e
+
+    async def _run(self, pdf_bytes: bytes) -> str:
+        executor = self._get_executor()
+        future = executor.submit(self.extract_fn, pdf_bytes, self.max_pages)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout_seconds)
+        except asyncio.CancelledError:
+            if asyncio.current_task().cancelling():
+                raise  # the caller was cancelled
+            # Still queued when another document's timeout shut the pool down
+            raise BrokenProcessPool("PDF extraction pool was shut down") from None
+        except asyncio.TimeoutError:
+            logger.error(
+                f"PDF extraction exceeded {self.timeout_seconds}s; killing worker processes"
+            )
+            self._kill(executor)
+            raise PdfExtractionTimeout(f"PDF extraction took longer than {self.timeout_seconds}s")
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: the parent runs threads (scheduler, DB pool), so avoid fork
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def _kill(self, executor: ProcessPoolExecutor) -> None:
+        """
+        Terminate every worker of a pool. ProcessPoolExecutor cannot cancel a
+        running task, so the hung process is killed along with its siblings
+        (their in-flight documents are retried on the fresh pool).
+        """
+        processes = list((getattr(executor, "_processes", None) or {}).values())
+        if executor is self._executor:
+            self._executor = None
+        for process in processes:
+            if process.is_alive():
+                process.kill()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self) -> None:
+        """Stop the pool (called on application shutdown)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Shared pool for the whole process (worker processes start on first use)
+pdf_extraction_pool = PdfExtractionPool()
@@ -0,0 +1,131 @@
+"""
+Content-addressed cache for uploaded resumes.
+
+Keyed by the SHA-256 of the uploaded PDF bytes, it stores the cleaned
+text, keyword set and resume embedding so that a repeat upload skips
+both PDF extraction and the embedding service round trip.
+
+An in-process LRU sits in front of Redis; Redis shares entries between
+workers and survives restarts. Redis being down is non-critical.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import List, Optional, Set, Tuple
+
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.core.config import settings
+from app.core.redis import redis
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedResume:
+    """Everything /match/resume derives from the PDF bytes."""
+    text: str
+    keywords: Set[str] = field(default_factory=set)
+    embedding: Optional[List[float]] = None
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "text": self.text,
+            "keywords": sorted(self.keywords),
+            "embedding": self.embedding,
+        })
+
+    @classmethod
+    def from_json(cls, raw: str) -> "CachedResume":
+        data = json.loads(raw)
+        return cls(
+            text=data["text"],
+            keywords=set(data.get("keywords") or []),
+            embedding=data.get("embedding"),
+        )
+
+
+class ResumeCache:
+    """
+    Two-level (in-process LRU + Redis) cache of parsed resumes with a TTL.
+    """
+
+    def __init__(
+        self,
+        namespace: str = "resume:cache",
+        ttl_seconds: int = settings.resume_cache_ttl_seconds,
+        max_local_items: int = settings.resume_cache_max_items,
+    ):
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.max_local_items = max_local_items
+        self._local: "OrderedDict[str, Tuple[float, CachedResume]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def digest(pdf_bytes: bytes) -> str:
+        """Cache key for an uploaded file: SHA-256 of its bytes."""
+        return hashlib.sha256(pdf_bytes).hexdigest()
+
+    async def get(self, digest: str) -> Optional[CachedResume]:
+        """Look up a resume in the local LRU, then in Redis."""
+        entry = self._get_local(digest)
+        if entry is not None:
+            return entry
+
+        try:
+            raw = await redis.get(f"{self.namespace}:{digest}")
+        except RedisConnectionError as e:
+            logger.warning("Redis unavailable; skipping resume cache lookup: %s", e)
+            return None
+        if not raw:
+            return None
+
+        try:
+            entry = CachedResume.from_json(raw)
+        except (ValueError, KeyError) as e:
+            logger.warning(f"Discarding corrupt resume cache entry {digest[:12]}: {e}")
+            return None
+
+        self._set_local(digest, entry)
+        return entry
+
+    async def set(self, digest: str, entry: CachedResume) -> None:
+        """Store a resume in both levels. Non-critical if Redis is down."""
+        self._set_local(digest, entry)
+        try:
+            await redis.set(f"{self.namespace}:{digest}", entry.to_json(), ex=self.ttl_seconds)
+        except RedisConnectionError as e:
+            logger.warning("Redis unavailable; resume cached in-process only: %s", e)
+
+    # ── Local LRU ────────────────────────────────────────────────
+
+    def _get_local(self, digest: str) -> Optional[CachedResume]:
+        with self._lock:
+            item = self._local.get(digest)
+            if item is None:
+                return None
+            expires_at, entry = item
+            if expires_at < time.monotonic():
+                del self._local[digest]
+                return None
+            self._local.move_to_end(digest)
+            return entry
+
+    def _set_local(self, digest: str, entry: CachedResume) -> None:
+        if self.max_local_items <= 0:
+            return
+        with self._lock:
+            self._local[digest] = (time.monotonic() + self.ttl_seconds, entry)
+            self._local.move_to_end(digest)
+            while len(self._local) > self.max_local_items:
+                self._local.popitem(last=False)
+
+
+# Shared cache for the whole process (the LRU level is per worker)
+resume_cache = ResumeCache()
@@ -1,6 +1,6 @@
 import logging
 import re
-from typing import Set
+from typing import List, Optional, Set
 import pdfplumber
 
 logger = logging.getLogger(__name__)
@@ -11,6 +11,12 @@ class ResumeParser:
     Extract text from PDF resumes using pdfplumber.
     """
 
+    STOPWORDS = {
+        'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from',
+        'has', 'he', 'in', 'is', 'it', 'its', 'of', 'on', 'that', 'the',
+        'to', 'was', 'will', 'with', 'have', 'had', 'were', 'been', 'this',
+    }
+
     @staticmethod
     def extract_text(pdf_path: str) -> str:
         """
@@ -33,15 +39,17 @@ class ResumeParser:
             return ""
 
     @staticmethod
-    def extract_text_from_bytes(pdf_bytes: bytes) -> str:
+    def extract_text_from_bytes(pdf_bytes: bytes, max_pages: Optional[int] = None) -> str:
         """
         Extract text from PDF file bytes (for API upload).
+        Only the first `max_pages` pages are read when a cap is given.
         """
         try:
             import io
             text_parts = []
             with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
-                for page in pdf.pages:
+                pages = pdf.pages if max_pages is None else pdf.pages[:max_pages]
+                for page in pages:
                     page_text = page.extract_text()
                     if page_text:
                         text_parts.append(page_text)
@@ -65,24 +73,24 @@ class ResumeParser:
         return text.strip()
 
     @staticmethod
-    def extract_keywords(text: str) -> Set[str]:
+    def tokenize(text: str) -> List[str]:
         """
-        Extract meaningful keywords from text (simple tokenization).
-        Returns set of lowercase words, excluding common stopwords.
+        Split text into meaningful lowercase tokens, keeping repeats.
+        Same filtering as extract_keywords (used for term frequencies).
         """
-        stopwords = {
-            'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from',
-            'has', 'he', 'in', 'is', 'it', 'its', 'of', 'on', 'that', 'the',
-            'to', 'was', 'will', 'with', 'have', 'had', 'were', 'been', 'this',
-        }
-        
         # Tokenize: split on whitespace and punctuation
         words = re.findall(r'\b\w+\b', text.lower())
         
         # Filter: length > 2, not stopwords, alphanumeric
-        keywords = {
+        return [
             word for word in words
-            if len(word) > 2 and word not in stopwords and word.isalnum()
-        }
-        
-        return keywords
+            if len(word) > 2 and word not in ResumeParser.STOPWORDS and word.isalnum()
+        ]
+
+    @staticmethod
+    def extract_keywords(text: str) -> Set[str]:
+        """
+        Extract meaningful keywords from text (simple tokenization).
+        Returns set of lowercase words, excluding common stopwords.
+        """
+        return set(ResumeParser.tokenize(text))
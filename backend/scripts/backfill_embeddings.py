@@ -6,9 +6,19 @@ that don't have vector embeddings stored yet.
 Usage:
     cd backend
     python -m scripts.backfill_embeddings
+    python -m scripts.backfill_embeddings --warm-cache
+    python -m scripts.backfill_embeddings --migrate-storage
 
 This is safe to run multiple times — it only processes jobs where
 embedding IS NULL.
+
+--warm-cache instead copies the embeddings already stored in the database
+into the content-hash embedding cache, so re-ingested postings with
+unchanged text are not sent to the embedding service again.
+
+--migrate-storage moves every embedding still stored in the legacy JSON
+column to the packed binary column (the scheduler does the same in small
+batches in the background).
 """
 import sys
 from pathlib import Path
@@ -16,11 +26,15 @@ from pathlib import Path
 # Add parent directory to Python path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+import argparse
 import asyncio
 import logging
 from app.core.database import SessionLocal, engine, Base
 from app.core.config import settings
+from app.models.job_model import Job
 from app.services.job_repository import JobRepository
+from app.services.embedding_cache import embedding_cache
+from app.services.embedding_codec import decode_job_embedding
 from app.services.embedding_service import EmbeddingService
 
 logging.basicConfig(level=settings.log_level)
@@ -29,6 +43,55 @@ logger = logging.getLogger(__name__)
 # How many jobs to process per batch (matches embed-batch call size)
 BATCH_SIZE = settings.embedding_batch_size
 
+# Jobs per Redis pipeline when warming the cache
+WARM_CHUNK_SIZE = 500
+
+
+async def warm_cache():
+    """Push every stored job embedding into the embedding cache."""
+    db = SessionLocal()
+    total_written = 0
+    try:
+        rows = (
+            db.query(
+                Job.title, Job.description,
+                Job.embedding_packed, Job.embedding_dim, Job.embedding_dtype, Job.embedding,
+            )
+            .filter(Job.has_embedding)
+            .yield_per(WARM_CHUNK_SIZE)
+        )
+        texts, embeddings = [], []
+        for title, description, packed, dim, dtype, legacy in rows:
+            texts.append(EmbeddingService.build_job_text(title or "", description or ""))
+            embeddings.append(decode_job_embedding(packed, dim, dtype, legacy))
+            if len(texts) >= WARM_CHUNK_SIZE:
+                total_written += await embedding_cache.set_many(texts, embeddings)
+                texts, embeddings = [], []
+        if texts:
+            total_written += await embedding_cache.set_many(texts, embeddings)
+    finally:
+        db.close()
+
+    logger.info(f"Embedding cache warmed with {total_written} vectors")
+
+
+def migrate_storage():
+    """Move all legacy JSON embeddings to the packed binary column."""
+    db = SessionLocal()
+    total_migrated = 0
+    try:
+        repo = JobRepository(db)
+        while True:
+            migrated = repo.migrate_legacy_embeddings(limit=WARM_CHUNK_SIZE)
+            if not migrated:
+                break
+            total_migrated += migrated
+            logger.info(f"Migrated {total_migrated} embeddings to packed storage")
+    finally:
+        db.close()
+
+    logger.info(f"Storage migration complete. Total embeddings migrated: {total_migrated}")
+
 
 async def main():
     if not settings.backfill_enabled:
@@ -47,8 +110,10 @@ async def main():
         repo = JobRepository(db)
 
         while True:
-            # Fetch a batch of jobs missing embeddings
-            jobs_missing = repo.get_jobs_without_embeddings(limit=BATCH_SIZE)
+            # Lease a batch of jobs missing embeddings (safe alongside the scheduler's worker)
+            jobs_missing = repo.claim_jobs_without_embeddings(
+                limit=BATCH_SIZE, lease_seconds=settings.backfill_lease_seconds
+            )
 
             if not jobs_missing:
                 logger.info("No more jobs without embeddings. Backfill complete.")
@@ -66,15 +131,16 @@ async def main():
             embeddings = await embedding_service.embed_batch(texts)
 
             if embeddings is None:
+                repo.release_embedding_claims([job.id for job in jobs_missing])
                 logger.error(
                     "Embedding service returned None (unavailable or error). "
                     "Stopping backfill. Re-run this script when the service is back."
                 )
                 break
 
-            # Pair job IDs with their embeddings and update DB
+            # Pair job IDs with their embeddings (and text fingerprint) and update DB
             pairs = [
-                (job.id, emb)
+                (job.id, emb, EmbeddingService.job_text_fingerprint(job.title, job.description))
                 for job, emb in zip(jobs_missing, embeddings)
                 if emb is not None
             ]
@@ -94,4 +160,17 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--warm-cache", action="store_true",
+        help="copy stored embeddings into the embedding cache instead of backfilling",
+    )
+    parser.add_argument(
+        "--migrate-storage", action="store_true",
+        help="move JSON embeddings to the packed binary column and exit",
+    )
+    args = parser.parse_args()
+    if args.migrate_storage:
+        migrate_storage()
+    else:
+        asyncio.run(warm_cache() if args.warm_cache else main())
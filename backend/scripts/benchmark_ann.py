@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+"""
+Recall-vs-latency benchmark for the ANN index against exact brute force.
+
+Usage:
+    cd backend
+    python -m scripts.benchmark_ann                    # synthetic corpus
+    python -m scripts.benchmark_ann --jobs 100000 --dim 384
+    python -m scripts.benchmark_ann --from-db          # real job embeddings
+
+Recall@k is the fraction of the exact top-k that the IVF index returns.
+
+The int8 section compares the quantized index (match_quantization=int8)
+with the float32 one: memory per 100k jobs, and agreement of the top 20
+with exact float32 search, both for the int8 scores alone and after exact
+rescoring of the int8 top-k candidates (what JobMatcher does).
+"""
+import sys
+from pathlib import Path
+
+# Add parent directory to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import argparse
+import time
+from typing import List
+
+import numpy as np
+
+from app.services.embedding_index import EmbeddingIndex
+from app.services.ann_index import ExactIndex, IvfFlatIndex
+
+
+def synthetic_corpus(n: int, dim: int, clusters: int, seed: int = 0) -> np.ndarray:
+    """Clustered random vectors (real embeddings are far from uniform)."""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+    labels = rng.integers(0, clusters, size=n)
+    return (centers[labels] + 0.6 * rng.normal(size=(n, dim))).astype(np.float32)
+
+
+def load_index(args) -> EmbeddingIndex:
+    index = EmbeddingIndex()
+    if args.from_db:
+        from app.core.database import SessionLocal
+        db = SessionLocal()
+        try:
+            index.rebuild(db)
+        finally:
+            db.close()
+    else:
+        vectors = synthetic_corpus(args.jobs, args.dim, args.clusters)
+        index.upsert(zip(range(1, len(vectors) + 1), vectors))
+    return index
+
+
+def timed_search(ann, queries: np.ndarray, k: int):
+    results, latencies = [], []
+    for q in queries:
+        start = time.perf_counter()
+        ids, _ = ann.search(q, k)
+        latencies.append((time.perf_counter() - start) * 1000)
+        results.append(ids)
+    return results, np.array(latencies)
+
+
+def recall(truth: List[np.ndarray], found: List[np.ndarray], k: int) -> float:
+    hits = [len(np.intersect1d(t[:k], f[:k])) / max(min(k, len(t)), 1) for t, f in zip(truth, found)]
+    return float(np.mean(hits))
+
+
+def benchmark_int8(index: EmbeddingIndex, queries: np.ndarray, truth: List[np.ndarray], k: int) -> None:
+    """int8 first pass + exact float32 rescoring vs. exact float32 search."""
+    snapshot = index.snapshot()
+    quantized = EmbeddingIndex(dtype="int8")
+    quantized.upsert(zip(snapshot.ids.tolist(), snapshot.matrix))
+    q_snapshot = quantized.snapshot()
+
+    first_pass, rescored, latencies = [], [], []
+    for q in queries:
+        start = time.perf_counter()
+        ids, _ = ExactIndex(quantized).search(q, k)
+        # Exact rescoring of the candidates from full-precision vectors
+        qn = index.normalize_query(q)
+        rows = index.rows_for(ids)
+        exact_scores = snapshot.matrix[rows] @ qn
+        order = np.argsort(-exact_scores, kind="stable")[:20]
+        latencies.append((time.perf_counter() - start) * 1000)
+        first_pass.append(ids[:20])
+        rescored.append(ids[order])
+
+    per_100k = 100_000 / len(snapshot.ids) / 2**20
+    print(f"\nint8 first pass ({k} candidates) + exact rescoring")
+    print(f"  memory per 100k jobs: float32 {snapshot.nbytes * per_100k:.1f} MB, "
+          f"int8 {q_snapshot.nbytes * per_100k:.1f} MB")
+    print(f"  top-20 agreement with exact: int8 only {recall(truth, first_pass, 20):.3f}, "
+          f"rescored {recall(truth, rescored, 20):.3f}")
+    print(f"  latency p50 {np.percentile(latencies, 50):.2f} ms, p95 {np.percentile(latencies, 95):.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=50000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--clusters", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=300, help="candidates retrieved per query")
+    parser.add_argument("--nlist", type=int, default=0, help="0 = auto")
+    parser.add_argument("--nprobe", type=str, default="1,2,4,8,16,32")
+    parser.add_argument("--from-db", action="store_true", help="benchmark on stored job embeddings")
+    args = parser.parse_args()
+
+    index = load_index(args)
+    print(f"Corpus: {len(index)} jobs, dim={index.dim}")
+    if not len(index):
+        print("No embeddings to benchmark.")
+        return
+
+    snapshot = index.snapshot()
+    rng = np.random.default_rng(1)
+    picks = rng.choice(len(snapshot.ids), min(args.queries, len(snapshot.ids)), replace=False)
+    # Perturb corpus vectors so queries are near, but not identical to, jobs
+    queries = snapshot.matrix[picks] + 0.3 * rng.normal(size=(len(picks), index.dim)).astype(np.float32)
+
+    exact = ExactIndex(index)
+    truth, exact_ms = timed_search(exact, queries, args.k)
+
+    ivf = IvfFlatIndex(index, nlist=args.nlist, min_corpus_size=1)
+    start = time.perf_counter()
+    ivf.build()
+    build_s = time.perf_counter() - start
+    print(f"IVF build: {len(ivf._list_ids)} lists in {build_s:.2f}s\n")
+
+    header = f"{'index':<16}{'recall@' + str(args.k):>12}{'recall@20':>12}{'p50 ms':>10}{'p95 ms':>10}{'speedup':>10}"
+    print(header)
+    print("-" * len(header))
+    exact_p50 = np.percentile(exact_ms, 50)
+    print(f"{'exact':<16}{1.0:>12.3f}{1.0:>12.3f}{exact_p50:>10.2f}{np.percentile(exact_ms, 95):>10.2f}{1.0:>10.1f}")
+
+    for nprobe in [int(p) for p in args.nprobe.split(",") if p]:
+        ivf.nprobe = nprobe
+        found, ivf_ms = timed_search(ivf, queries, args.k)
+        p50 = np.percentile(ivf_ms, 50)
+        print(
+            f"{'ivf nprobe=' + str(nprobe):<16}"
+            f"{recall(truth, found, args.k):>12.3f}"
+            f"{recall(truth, found, 20):>12.3f}"
+            f"{p50:>10.2f}{np.percentile(ivf_ms, 95):>10.2f}"
+            f"{exact_p50 / p50:>10.1f}"
+        )
+
+    benchmark_int8(index, queries, truth, args.k)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+"""
+Wall-clock benchmark: serial vs concurrent career-page crawling.
+
+Usage:
+    cd backend
+    python -m scripts.benchmark_crawl                  # synthetic sites (mock transport)
+    python -m scripts.benchmark_crawl --sources 40 --slow 2
+    python -m scripts.benchmark_crawl --live           # the real YAML configs
+
+The serial baseline fetches one page after another, as FetcherService did
+before (no per-source timeout). The concurrent run is
+FetcherService._fetch_from_career_pages with its shared CrawlClient.
+Synthetic sites answer after a random 0.1-1.0s; `--slow` of them hang for
+10s and are cut off by their per-source timeout in the concurrent run.
+"""
+import sys
+from pathlib import Path
+
+# Add parent directory to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+
+import httpx
+
+from app.fetchers.career_page import CareerPageFetcher
+from app.fetchers.crawler import CrawlClient
+from app.services.fetcher_service import FetcherService
+
+PAGE = "<html><body>" + "".join(
+    f'<div class="job"><h2>Engineer {i}</h2><span>Remote</span><a href="/jobs/{i}">Apply</a><p>Role {i}</p></div>'
+    for i in range(50)
+) + "</body></html>"
+
+SLOW_SECONDS = 10.0
+
+
+def write_configs(directory: Path, sources: int, slow: int, timeout: float) -> dict:
+    """Synthetic YAML configs, three sources per host. Returns host -> latency."""
+    rng = random.Random(0)
+    latencies = {}
+    for i in range(sources):
+        host = f"site{i // 3}.test"
+        latencies.setdefault(host, rng.uniform(0.1, 1.0))
+        (directory / f"source{i:03d}.yaml").write_text(
+            f"company: Company {i}\nbase_url: https://{host}\njob_url: https://{host}/careers/{i}\n"
+            f"timeout_seconds: {timeout}\n"
+            "selectors:\n  job_container: div.job\n  title: h2\n  location: span\n"
+            "  link: a\n  description: p\n"
+        )
+    for host in list(latencies)[:slow]:
+        latencies[host] = SLOW_SECONDS
+    return latencies
+
+
+def mock_transport(latencies: dict) -> httpx.MockTransport:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(latencies.get(request.url.host, 0.0))
+        return httpx.Response(200, text=PAGE)
+    return httpx.MockTransport(handler)
+
+
+async def crawl_serial(config_dir: Path, transport) -> tuple[int, float]:
+    start = time.perf_counter()
+    jobs = 0
+    async with CrawlClient(max_concurrency=1, per_host_concurrency=1, transport=transport) as client:
+        for config_file in sorted(config_dir.glob("*.yaml")):
+            jobs += len(await CareerPageFetcher(str(config_file)).fetch(client))
+    return jobs, time.perf_counter() - start
+
+
+async def crawl_concurrent(config_dir: Path, transport) -> tuple[int, float]:
+    start = time.perf_counter()
+    async with CrawlClient(transport=transport) as client:
+        jobs = await FetcherService(str(config_dir), validators=None)._fetch_from_career_pages(client)
+    return len(jobs), time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sources", type=int, default=24)
+    parser.add_argument("--slow", type=int, default=1, help="sites that hang (synthetic only)")
+    parser.add_argument("--timeout", type=float, default=5.0, help="per-source timeout (synthetic only)")
+    parser.add_argument("--live", action="store_true", help="crawl app/configs/companies over the network")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.live:
+            config_dir, transport = Path("app/configs/companies"), None
+        else:
+            config_dir = Path(tmp)
+            transport = mock_transport(write_configs(config_dir, args.sources, args.slow, args.timeout))
+
+        sources = len(list(config_dir.glob("*.yaml")))
+        print(f"Sources: {sources}\n")
+        header = f"{'mode':<12}{'jobs':>8}{'seconds':>10}{'speedup':>10}"
+        print(header)
+        print("-" * len(header))
+        serial_jobs, serial_s = asyncio.run(crawl_serial(config_dir, transport))
+        print(f"{'serial':<12}{serial_jobs:>8}{serial_s:>10.2f}{1.0:>10.1f}")
+        jobs, concurrent_s = asyncio.run(crawl_concurrent(config_dir, transport))
+        print(f"{'concurrent':<12}{jobs:>8}{concurrent_s:>10.2f}{serial_s / concurrent_s:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
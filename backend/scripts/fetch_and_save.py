@@ -35,6 +35,8 @@ async def main():
     logger.info(f"Fetched {len(jobs)} unique jobs")
 
     if not jobs:
+        # Every parsed job was a known duplicate: the pages are handled
+        await fetcher.save_page_validators()
         logger.warning("No jobs fetched, exiting")
         return
 
@@ -44,21 +46,24 @@ async def main():
         repo = JobRepository(db)
         saved_count, saved_jobs = repo.save_jobs_batch(jobs)
         logger.info(f"Saved {saved_count} jobs to database")
+        # Pages whose jobs are now saved can be skipped while unchanged
+        await fetcher.save_page_validators()
 
-        # Generate and store embeddings for saved jobs
-        if saved_jobs:
-            logger.info("Generating embeddings for saved jobs...")
+        # Generate and store embeddings for saved jobs whose text is new or changed
+        jobs_to_embed = [job for job in saved_jobs if not job.has_embedding]
+        if jobs_to_embed:
+            logger.info(f"Generating embeddings for {len(jobs_to_embed)} saved jobs...")
             embedding_service = EmbeddingService()
             texts = [
                 EmbeddingService.build_job_text(job.title or "", job.description or "")
-                for job in saved_jobs
+                for job in jobs_to_embed
             ]
             embeddings = await embedding_service.embed_batch(texts)
 
             if embeddings:
                 pairs = [
-                    (job.id, emb)
-                    for job, emb in zip(saved_jobs, embeddings)
+                    (job.id, emb, job.text_fingerprint)
+                    for job, emb in zip(jobs_to_embed, embeddings)
                     if emb is not None
                 ]
                 if pairs:
@@ -0,0 +1,85 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import asyncio
+import time
+
+import httpx
+
+from app.fetchers.adzuna_api import AdzunaApiFetcher
+from app.fetchers.rate_limit import TokenBucket
+
+
+def _transport(total: int, requested: list):
+    """Mock Adzuna search endpoint with `total` results, newest first."""
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.path.rsplit("/", 1)[-1])
+        per_page = int(request.url.params["results_per_page"])
+        requested.append(page)
+        first = (page - 1) * per_page
+        results = [
+            {"title": f"Job {n}", "company": {"display_name": "Acme"}, "redirect_url": f"https://a.test/{n}"}
+            for n in range(first, min(first + per_page, total))
+        ]
+        return httpx.Response(200, json={"count": total, "results": results})
+    return httpx.MockTransport(handler)
+
+
+def _fetcher(**kwargs) -> AdzunaApiFetcher:
+    fetcher = AdzunaApiFetcher(query="python", **kwargs)
+    fetcher.app_id, fetcher.app_key, fetcher.country = "id", "key", "gb"
+    return fetcher
+
+
+def _fetch(fetcher: AdzunaApiFetcher, total: int, requested: list, **kwargs):
+    async def run():
+        async with httpx.AsyncClient(transport=_transport(total, requested)) as client:
+            return await fetcher.fetch(client, **kwargs)
+    return asyncio.run(run())
+
+
+def test_token_bucket_spaces_requests_after_burst():
+    bucket = TokenBucket(rate_per_second=20.0, capacity=2)
+
+    async def take(n):
+        for _ in range(n):
+            await bucket.acquire()
+
+    start = time.monotonic()
+    asyncio.run(take(6))
+    assert time.monotonic() - start >= 0.19  # 2 immediate, then 4 x 50ms
+    assert bucket.acquired == 6
+
+
+def test_fetches_pages_up_to_depth_and_result_count():
+    requested = []
+    jobs = _fetch(_fetcher(results_per_page=50, max_pages=4, page_concurrency=3), 230, requested)
+    assert sorted(requested) == [1, 2, 3, 4] and len(jobs) == 200
+    assert len({job.apply_link for job in jobs}) == 200
+
+    requested = []
+    jobs = _fetch(_fetcher(results_per_page=50, max_pages=10), 120, requested)
+    assert sorted(requested) == [1, 2, 3] and len(jobs) == 120
+
+
+def test_stops_at_first_page_of_known_jobs():
+    requested = []
+    known = {f"https://a.test/{n}" for n in range(50, 500)}  # everything after page 1
+
+    async def page_is_known(page_jobs):
+        return all(job.apply_link in known for job in page_jobs)
+
+    limiter = TokenBucket(rate_per_second=1000.0, capacity=10)
+    jobs = _fetch(
+        _fetcher(results_per_page=50, max_pages=10, page_concurrency=1), 500, requested,
+        limiter=limiter, page_is_known=page_is_known,
+    )
+    assert requested == [1, 2] and len(jobs) == 100 and limiter.acquired == 2
+
+
+if __name__ == "__main__":
+    test_token_bucket_spaces_requests_after_burst()
+    test_fetches_pages_up_to_depth_and_result_count()
+    test_stops_at_first_page_of_known_jobs()
+    print("Adzuna fetcher tests passed.")
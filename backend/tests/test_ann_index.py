@@ -0,0 +1,55 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from app.services.embedding_index import EmbeddingIndex
+from app.services.ann_index import ExactIndex, IvfFlatIndex
+
+
+def _clustered_index(n: int = 2000, dim: int = 16) -> EmbeddingIndex:
+    rng = np.random.default_rng(0)
+    centers = rng.normal(size=(20, dim))
+    vectors = centers[rng.integers(0, 20, size=n)] + 0.1 * rng.normal(size=(n, dim))
+    index = EmbeddingIndex()
+    index.upsert(zip(range(1, n + 1), vectors))
+    return index
+
+
+def test_ivf_matches_exact_top_results(tmp_path):
+    index = _clustered_index()
+    ivf = IvfFlatIndex(index, nprobe=8, min_corpus_size=1)
+    ivf.build()
+
+    query = index.snapshot().matrix[10]
+    exact_ids, _ = ExactIndex(index).search(query, 20)
+    ivf_ids, ivf_scores = ivf.search(query, 20)
+    assert len(np.intersect1d(exact_ids, ivf_ids)) >= 18
+    assert np.all(np.diff(ivf_scores) <= 0)
+
+    # Persisted index reloads and picks up jobs added after the build
+    path = tmp_path / "ann.npz"
+    ivf.save(path)
+    reloaded = IvfFlatIndex(index, nprobe=8, min_corpus_size=1)
+    assert reloaded.load(path)
+    index.upsert([(99999, query * 2)])
+    ids, _ = reloaded.search(query, 5)
+    assert 99999 in ids.tolist()
+
+
+def test_ivf_falls_back_to_exact_below_min_corpus():
+    index = _clustered_index(n=50)
+    ivf = IvfFlatIndex(index, min_corpus_size=100)
+    ivf.build()
+    assert not ivf.is_trained
+    ids, _ = ivf.search(index.snapshot().matrix[0], 5)
+    assert ids[0] == 1
+
+
+if __name__ == "__main__":
+    import tempfile
+    with tempfile.TemporaryDirectory() as tmp:
+        test_ivf_matches_exact_top_results(Path(tmp))
+    test_ivf_falls_back_to_exact_below_min_corpus()
+    print("ANN index tests passed.")
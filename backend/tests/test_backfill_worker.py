@@ -0,0 +1,139 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import asyncio
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models.job_model import Job
+from app.services.embedding_codec import job_embedding
+from app.services.backfill_worker import AimdController, BackfillWorker
+from app.services.job_repository import JobRepository
+from app.services.normalizer import NormalizedJob
+
+
+def test_aimd_grows_additively_and_halves_on_failure():
+    c = AimdController(min_batch_size=1, max_batch_size=5, max_concurrency=3,
+                       target_latency_seconds=10.0)
+    for _ in range(3):
+        c.on_success(1.0)
+    assert (c.batch_size, c.concurrency) == (5, 2)
+
+    c.on_success(30.0)  # too slow: shrink the batch
+    assert (c.batch_size, c.concurrency) == (2, 2)
+
+    c.on_failure()
+    assert (c.batch_size, c.concurrency) == (1, 1)
+    first_backoff = c.backoff_seconds
+    c.on_failure()
+    assert c.backoff_seconds == 2 * first_backoff
+    c.on_success(1.0)
+    assert c.backoff_seconds == 0.0
+
+
+class FakeEmbeddingService:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.calls = []
+
+    async def embed_batch(self, texts, batch_size=None):
+        self.calls.append(len(texts))
+        return None if self.fail else [[1.0, 0.0] for _ in texts]
+
+
+def _factory(n_jobs: int):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    db = factory()
+    db.add_all(
+        Job(title=f"Job {i}", company="Acme", location="Remote", description="d",
+            job_type="full-time", apply_link=f"https://example.com/{i}",
+            source="adzuna", dedup_hash=f"hash-{i}")
+        for i in range(n_jobs)
+    )
+    db.commit()
+    db.close()
+    return factory
+
+
+def _worker(n_jobs: int, service: FakeEmbeddingService) -> BackfillWorker:
+    worker = BackfillWorker(
+        controller=AimdController(max_batch_size=4, max_concurrency=2),
+        run_budget_seconds=30.0,
+        session_factory=_factory(n_jobs),
+    )
+    worker.embedding_service = service
+    return worker
+
+
+def test_run_drains_backlog_with_growing_batches():
+    service = FakeEmbeddingService()
+    worker = _worker(20, service)
+    assert asyncio.run(worker.run_once()) == 20
+    assert worker.backlog == 0
+    assert service.calls[0] == 1 and max(service.calls) == 4
+    assert worker.metrics()["embedded_total"] == 20
+
+
+def test_failed_round_backs_off():
+    service = FakeEmbeddingService(fail=True)
+    worker = _worker(3, service)
+    assert asyncio.run(worker.run_once()) == 0
+    assert worker.backlog == 3 and worker.failed_rounds == 1
+    assert worker.metrics()["paused_for_seconds"] > 0
+
+    # The failed batch's lease was released for other workers
+    repo = JobRepository(worker.session_factory())
+    assert len(repo.claim_jobs_without_embeddings(limit=10, lease_seconds=60)) == 3
+
+    # Paused: the next run does not call the service
+    assert asyncio.run(worker.run_once()) == 0
+    assert len(service.calls) == 1
+
+
+def test_claims_are_exclusive_until_the_lease_expires():
+    factory = _factory(5)
+    first, second = JobRepository(factory()), JobRepository(factory())
+
+    claimed = first.claim_jobs_without_embeddings(limit=3, lease_seconds=60)
+    others = second.claim_jobs_without_embeddings(limit=10, lease_seconds=60)
+    assert len(claimed) == 3 and len(others) == 2
+    assert not {j.id for j in claimed} & {j.id for j in others}
+    assert second.claim_jobs_without_embeddings(limit=10, lease_seconds=60) == []
+
+    # A lease that has run out (worker died) is reclaimed by someone else
+    first.release_embedding_claims([j.id for j in claimed])
+    assert len(first.claim_jobs_without_embeddings(limit=10, lease_seconds=-1)) == 3
+    assert len(second.claim_jobs_without_embeddings(limit=10, lease_seconds=60)) == 3
+
+def test_changed_text_requeues_embedding():
+    db = _factory(0)()
+    repo = JobRepository(db)
+    posting = dict(company="Acme", location="Remote", job_type="full-time",
+                   apply_link="https://example.com/x", source="adzuna", dedup_hash="hash-x")
+    job = repo.save_job(NormalizedJob(title="Engineer", description="Python", **posting),
+                        embedding=[1.0, 0.0])
+
+    # Same text (modulo whitespace): embedding kept
+    repo.save_job(NormalizedJob(title="Engineer ", description="Python", **posting))
+    assert job_embedding(db.get(Job, job.id)).tolist() == [1.0, 0.0]
+
+    # New description: embedding cleared, stale backfill results rejected
+    old_fingerprint = db.get(Job, job.id).text_fingerprint
+    repo.save_job(NormalizedJob(title="Engineer", description="Go and Rust", **posting))
+    assert not db.get(Job, job.id).has_embedding
+    assert repo.update_embeddings_batch([(job.id, [0.0, 1.0], old_fingerprint)]) == 0
+    assert len(repo.claim_jobs_without_embeddings(limit=10, lease_seconds=60)) == 1
+
+
+if __name__ == "__main__":
+    test_aimd_grows_additively_and_halves_on_failure()
+    test_run_drains_backlog_with_growing_batches()
+    test_failed_round_backs_off()
+    test_claims_are_exclusive_until_the_lease_expires()
+    test_changed_text_requeues_embedding()
+    print("Backfill worker tests passed.")
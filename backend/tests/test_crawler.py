@@ -0,0 +1,190 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import asyncio
+import time
+
+import httpx
+
+from app.fetchers.career_page import NOT_MODIFIED, SAME_BODY, CareerPageFetcher
+from app.fetchers.crawler import CrawlClient
+from app.fetchers.page_cache import PageValidatorStore
+from app.services.fetcher_service import FetcherService, career_page_stats
+
+PAGE = """
+<html><body>
+  <div class="job"><h2>Data Engineer</h2><span>Remote</span><a href="/jobs/1">Apply</a><p>ETL</p></div>
+  <div class="job"><h2>ML Engineer</h2><span>Berlin</span><a href="/jobs/2">Apply</a><p>Models</p></div>
+</body></html>
+"""
+
+
+def _transport(delays: dict, log: list):
+    """Mock transport: per-host latency; records (host, start, end)."""
+    async def handler(request: httpx.Request) -> httpx.Response:
+        start = time.monotonic()
+        await asyncio.sleep(delays.get(request.url.host, 0.0))
+        log.append((request.url.host, start, time.monotonic()))
+        return httpx.Response(200, text=PAGE)
+    return httpx.MockTransport(handler)
+
+
+def _max_overlap(intervals) -> int:
+    events = sorted([(s, 1) for s, _ in intervals] + [(e, -1) for _, e in intervals])
+    peak = current = 0
+    for _, delta in events:
+        current += delta
+        peak = max(peak, current)
+    return peak
+
+
+def test_per_host_concurrency_and_spacing():
+    log = []
+
+    async def crawl():
+        transport = _transport({"a.test": 0.05, "b.test": 0.05}, log)
+        async with CrawlClient(
+            max_concurrency=8, per_host_concurrency=2, host_delay_seconds=0.0, transport=transport
+        ) as client:
+            urls = [f"https://a.test/{i}" for i in range(6)] + [f"https://b.test/{i}" for i in range(2)]
+            await asyncio.gather(*(client.get(url) for url in urls))
+        async with CrawlClient(host_delay_seconds=0.05, transport=transport) as client:
+            await asyncio.gather(*(client.get(f"https://c.test/{i}") for i in range(3)))
+
+    asyncio.run(crawl())
+    a_host = [(s, e) for host, s, e in log if host == "a.test"]
+    assert _max_overlap(a_host) == 2
+    # b.test is not held up behind a.test's queue
+    assert max(s for host, s, _ in log if host == "b.test") < sorted(s for s, _ in a_host)[2]
+    starts = sorted(s for host, s, _ in log if host == "c.test")
+    assert all(later - earlier >= 0.045 for earlier, later in zip(starts, starts[1:]))
+
+
+def test_slow_source_does_not_hold_up_the_crawl(tmp_path):
+    for name, host, timeout in [("fast", "fast.test", 5), ("slow", "slow.test", 0.2)]:
+        (tmp_path / f"{name}.yaml").write_text(
+            f"company: {name}\nbase_url: https://{host}\njob_url: https://{host}/careers\n"
+            f"timeout_seconds: {timeout}\n"
+            "selectors:\n  job_container: div.job\n  title: h2\n  location: span\n  link: a\n  description: p\n"
+        )
+    transport = _transport({"fast.test": 0.05, "slow.test": 5.0}, [])
+
+    async def crawl():
+        async with CrawlClient(transport=transport) as client:
+            return await FetcherService(str(tmp_path), validators=None)._fetch_from_career_pages(client)
+
+    start = time.monotonic()
+    jobs = asyncio.run(crawl())
+    assert time.monotonic() - start < 1.0
+    assert [(job.company, job.title) for job in jobs] == [("fast", "Data Engineer"), ("fast", "ML Engineer")]
+    assert jobs[0].apply_link == "https://fast.test/jobs/1"
+
+    # Streaming: each source's jobs go to the callback instead of the result
+    received = []
+
+    async def on_source(source, source_jobs, on_saved=None):
+        received.append((source, len(source_jobs)))
+
+    async def stream():
+        async with CrawlClient(transport=transport) as client:
+            service = FetcherService(str(tmp_path), validators=None)
+            return await service._fetch_from_career_pages(client, on_source=on_source)
+
+    assert asyncio.run(stream()) == [] and received == [("fast", 2)]
+
+
+class _MemoryValidators(PageValidatorStore):
+    def __init__(self):
+        super().__init__()
+        self.entries = {}
+
+    async def get(self, url):
+        return self.entries.get(url)
+
+    async def set(self, url, validators, keep_ttl=False):
+        self.entries[url] = validators
+
+
+def test_unchanged_pages_are_not_parsed(tmp_path):
+    pages = {"etag.test": PAGE, "plain.test": PAGE}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        if host == "etag.test":
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, text=pages[host], headers={"ETag": '"v1"'})
+        return httpx.Response(200, text=pages[host])
+
+    fetchers = []
+    for host in pages:
+        config = tmp_path / f"{host}.yaml"
+        config.write_text(
+            f"company: {host}\nbase_url: https://{host}\njob_url: https://{host}/careers\n"
+            "selectors:\n  job_container: div.job\n  title: h2\n  location: span\n  link: a\n  description: p\n"
+        )
+        fetchers.append(CareerPageFetcher(str(config)))
+    validators = _MemoryValidators()
+
+    async def crawl():
+        async with CrawlClient(host_delay_seconds=0.0, transport=httpx.MockTransport(handler)) as client:
+            return [(len(await f.fetch(client, validators)), f.unchanged) for f in fetchers]
+
+    assert asyncio.run(crawl()) == [(2, None), (2, None)]
+    # Nothing is stored until the caller has saved the jobs
+    assert validators.entries == {}
+    assert asyncio.run(crawl()) == [(2, None), (2, None)]
+    for f in fetchers:
+        asyncio.run(validators.set(f.job_url, f.new_validators))
+
+    assert asyncio.run(crawl()) == [(0, NOT_MODIFIED), (0, SAME_BODY)]
+    pages["plain.test"] = PAGE.replace("ML Engineer", "ML Researcher")
+    assert asyncio.run(crawl()) == [(0, NOT_MODIFIED), (2, None)]
+    assert fetchers[1].new_validators is not None
+
+
+def test_failed_and_empty_pages_are_not_remembered(tmp_path):
+    for host in ["broken.test", "empty.test", "ok.test"]:
+        (tmp_path / f"{host}.yaml").write_text(
+            f"company: {host}\nbase_url: https://{host}\njob_url: https://{host}/careers\n"
+            "selectors:\n  job_container: div.job\n  title: h2\n  location: span\n  link: a\n  description: p\n"
+        )
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.host == "broken.test":
+            return httpx.Response(500)
+        if request.url.host == "empty.test":
+            return httpx.Response(200, text="<html><body></body></html>", headers={"ETag": '"v1"'})
+        return httpx.Response(200, text=PAGE, headers={"ETag": '"v1"'})
+
+    validators = _MemoryValidators()
+    service = FetcherService(str(tmp_path), validators=validators)
+    received = {}
+
+    async def on_source(source, source_jobs, on_saved=None):
+        received[source] = on_saved
+
+    async def crawl():
+        async with CrawlClient(host_delay_seconds=0.0, transport=httpx.MockTransport(handler)) as client:
+            await service._fetch_from_career_pages(client, on_source=on_source)
+
+    asyncio.run(crawl())
+    assert career_page_stats["broken.test"]["failed"] == 1
+    assert career_page_stats["empty.test"]["parsed"] == 1
+    # Only the page with jobs gets a validator write, and only once it is awaited
+    assert list(received) == ["ok.test"] and validators.entries == {}
+    asyncio.run(received["ok.test"]())
+    assert list(validators.entries) == ["https://ok.test/careers"]
+
+
+if __name__ == "__main__":
+    import tempfile
+    test_per_host_concurrency_and_spacing()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_slow_source_does_not_hold_up_the_crawl(Path(tmp))
+    with tempfile.TemporaryDirectory() as tmp:
+        test_unchanged_pages_are_not_parsed(Path(tmp))
+    with tempfile.TemporaryDirectory() as tmp:
+        test_failed_and_empty_pages_are_not_remembered(Path(tmp))
+    print("Crawler tests passed.")
@@ -0,0 +1,72 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import asyncio
+
+from app.services.embedding_batcher import EmbeddingBatcher
+from app.services.embedding_service import EmbeddingService
+
+
+def _vector(text: str):
+    return [float(len(text)), float(sum(map(ord, text)))]
+
+
+def _fake_service(monkeypatch, calls: list, fail: bool = False):
+    async def embed_batch(self, texts, batch_size=None, use_cache=True):
+        calls.append(("batch", list(texts), use_cache))
+        await asyncio.sleep(0.01)
+        if fail:
+            raise RuntimeError("embedding service down")
+        return [_vector(text) for text in texts]
+
+    async def embed(self, text):
+        calls.append(("single", [text], None))
+        if fail:
+            raise RuntimeError("embedding service down")
+        return _vector(text)
+
+    monkeypatch.setattr(EmbeddingService, "embed_batch", embed_batch)
+    monkeypatch.setattr(EmbeddingService, "embed", embed)
+
+
+def test_concurrent_callers_share_one_upstream_call(monkeypatch):
+    calls = []
+    _fake_service(monkeypatch, calls)
+    batcher = EmbeddingBatcher(max_batch_size=16, max_wait_ms=20)
+    texts = [f"resume {i} " + "x" * i for i in range(5)]
+
+    async def run():
+        return await asyncio.gather(*(batcher.embed(text) for text in texts))
+
+    results = asyncio.run(run())
+    # One /embed-batch call, outside the job-embedding cache
+    assert calls == [("batch", texts, False)]
+    assert results == [_vector(text) for text in texts]
+    assert batcher.metrics()["batches"] == 1 and batcher.metrics()["requests"] == 5
+
+    # A lone request goes to /embed
+    assert asyncio.run(batcher.embed("alone")) == _vector("alone")
+    assert calls[-1] == ("single", ["alone"], None)
+
+
+def test_upstream_error_reaches_every_caller_and_batcher_recovers(monkeypatch):
+    calls = []
+    _fake_service(monkeypatch, calls, fail=True)
+    batcher = EmbeddingBatcher(max_batch_size=3, max_wait_ms=20)
+
+    async def run():
+        return await asyncio.gather(*(batcher.embed(f"resume {i}") for i in range(4)))
+
+    # Same contract as EmbeddingService.embed: None when the service fails
+    assert asyncio.run(run()) == [None] * 4
+    assert sorted(kind for kind, _, _ in calls) == ["batch", "single"]  # 3 + the 4th alone
+    assert batcher.metrics()["pending"] == 0
+
+    _fake_service(monkeypatch, calls)
+    assert asyncio.run(run())[3] == _vector("resume 3")
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
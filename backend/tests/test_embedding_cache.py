@@ -0,0 +1,56 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import asyncio
+
+import numpy as np
+
+from app.services import embedding_service
+from app.services.embedding_cache import _decode, _encode, text_hash
+from app.services.embedding_service import EmbeddingService
+
+
+class FakeCache:
+    def __init__(self, entries):
+        self.entries = dict(entries)
+
+    async def get_many(self, texts):
+        return [self.entries.get(text_hash(t)) for t in texts]
+
+    async def set_many(self, texts, embeddings):
+        for text, emb in zip(texts, embeddings):
+            self.entries[text_hash(text)] = emb
+        return len(texts)
+
+
+def test_text_hash_ignores_whitespace_layout():
+    assert text_hash("Engineer\n\n  Python  ") == text_hash("Engineer Python")
+    assert text_hash("Engineer Python") != text_hash("engineer python")
+
+
+def test_vector_roundtrip_is_float32():
+    vector = [0.1, -2.5, 3.0]
+    assert np.allclose(_decode(_encode(vector)), vector, atol=1e-7)
+
+
+def test_embed_batch_only_sends_misses(monkeypatch):
+    cache = FakeCache({text_hash("a"): [1.0], text_hash("c"): [3.0]})
+    sent = []
+
+    async def fake_embed(self, texts, batch_size=None):
+        sent.extend(texts)
+        return [[float(len(t)) * 10] for t in texts]
+
+    monkeypatch.setattr(embedding_service, "embedding_cache", cache)
+    monkeypatch.setattr(EmbeddingService, "_embed_uncached", fake_embed)
+
+    service = EmbeddingService()
+    result = asyncio.run(service.embed_batch(["a", "bb", "c"]))
+    assert result == [[1.0], [20.0], [3.0]]
+    assert sent == ["bb"]
+
+    # The miss is now cached
+    sent.clear()
+    asyncio.run(service.embed_batch(["bb"]))
+    assert sent == []
@@ -0,0 +1,52 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models.job_model import Job
+from app.services.embedding_codec import job_embedding, pack_embedding, unpack_embedding
+from app.services.job_repository import JobRepository
+
+
+def test_pack_roundtrip_per_dtype():
+    rng = np.random.default_rng(0)
+    vector = rng.normal(size=384).astype(np.float32)
+    for dtype, atol in (("float32", 0.0), ("float16", 1e-2), ("int8", 3e-2)):
+        payload, dim, stored = pack_embedding(vector, dtype)
+        decoded = unpack_embedding(payload, dim, stored)
+        assert decoded.dtype == np.float32 and dim == 384 and stored == dtype
+        assert np.allclose(decoded, vector, atol=atol)
+
+    payload, dim, _ = pack_embedding(vector, "float32")
+    assert len(payload) == 4 * dim
+    assert not unpack_embedding(payload, dim, "float32").flags.owndata  # view over the bytes
+
+
+def test_legacy_json_rows_are_migrated():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    db.add_all(
+        Job(title=f"Job {i}", company="Acme", job_type="full-time", apply_link=f"https://example.com/{i}",
+            source="adzuna", dedup_hash=f"hash-{i}", embedding=[float(i), 1.0])
+        for i in range(3)
+    )
+    db.commit()
+
+    repo = JobRepository(db)
+    assert repo.migrate_legacy_embeddings(limit=2) == 2
+    assert repo.migrate_legacy_embeddings(limit=2) == 1
+    assert repo.migrate_legacy_embeddings(limit=2) == 0
+    for job in db.query(Job):
+        assert job.embedding is None and job.embedding_packed is not None
+        assert job_embedding(job).tolist() == [float(job.title.split()[-1]), 1.0]
+
+
+if __name__ == "__main__":
+    test_pack_roundtrip_per_dtype()
+    test_legacy_json_rows_are_migrated()
+    print("Embedding codec tests passed.")
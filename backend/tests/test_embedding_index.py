@@ -0,0 +1,122 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models.job_model import Job
+from app.services.embedding_codec import pack_embedding
+from app.services.embedding_index import EmbeddingIndex, embedding_index
+from app.services.job_repository import JobRepository
+from app.services.normalizer import NormalizedJob
+
+
+def test_upsert_score_and_remove():
+    index = EmbeddingIndex()
+    index.upsert([(1, [1.0, 0.0]), (2, [0.0, 2.0]), (3, [1.0, 1.0])])
+    assert len(index) == 3 and index.dim == 2
+
+    ids, scores = index.score([3.0, 0.0])
+    by_id = dict(zip(ids.tolist(), scores.tolist()))
+    assert np.isclose(by_id[1], 1.0)
+    assert np.isclose(by_id[2], 0.0)
+    assert np.isclose(by_id[3], np.sqrt(0.5))
+
+    # Overwrite an existing row, drop another, ignore wrong-dim vectors
+    index.upsert([(2, [1.0, 0.0]), (4, [1.0, 0.0, 0.0])])
+    index.remove([3])
+    ids, scores = index.score([1.0, 0.0])
+    assert sorted(ids.tolist()) == [1, 2]
+    assert np.allclose(scores, 1.0)
+    assert index.rows_for([1, 3]).tolist()[1] == -1
+
+
+def test_query_dimension_mismatch():
+    index = EmbeddingIndex()
+    index.upsert([(1, [1.0, 0.0])])
+    ids, scores = index.score([1.0, 0.0, 0.0])
+    assert len(ids) == 0 and len(scores) == 0
+
+
+def test_int8_index_approximates_float32():
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(500, 64)).astype(np.float32)
+    exact, quantized = EmbeddingIndex(), EmbeddingIndex(dtype="int8")
+    for index in (exact, quantized):
+        index.upsert(zip(range(500), vectors))
+    quantized.upsert([(3, vectors[4])])
+    quantized.remove([7])
+    exact.upsert([(3, vectors[4])])
+    exact.remove([7])
+
+    assert quantized.snapshot().quantized and quantized.snapshot().matrix.dtype == np.int8
+    assert quantized.snapshot().nbytes < exact.snapshot().nbytes / 3
+
+    query = rng.normal(size=64)
+    ids_exact, scores_exact = exact.score(query)
+    ids_q, scores_q = quantized.score(query)
+    assert ids_exact.tolist() == ids_q.tolist()
+    assert np.allclose(scores_exact, scores_q, atol=0.02)
+
+
+
+def _posting(n: int, description: str = "Python") -> NormalizedJob:
+    return NormalizedJob(
+        title=f"Engineer {n}", company="Acme", location="Remote", job_type="full-time",
+        description=description, apply_link=f"https://example.com/{n}",
+        source="adzuna", dedup_hash=f"hash-{n}",
+    )
+
+
+def test_sync_picks_up_other_processes_writes():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    repo = JobRepository(db)  # writes to the shared index: "another process"
+    _, saved = repo.save_jobs_batch(
+        [_posting(n) for n in range(1, 5)], embeddings=[[1.0, 0.0], [0.0, 1.0], None, [1.0, 1.0]]
+    )
+    ids = [job.id for job in saved]
+
+    local = EmbeddingIndex()  # this worker's index
+    assert local.sync(db) == (3, 0)  # first sync rebuilds
+    assert sorted(local.snapshot().ids.tolist()) == [ids[0], ids[1], ids[3]]
+
+    # Elsewhere: job 1's text changes (vector cleared), job 2 is re-embedded,
+    # job 3 gets its first vector, job 4 is deleted, job 5 is written by raw SQL
+    repo.save_job(_posting(1, description="Rust"))
+    repo.update_embeddings_batch([(ids[1], [1.0, 0.0]), (ids[2], [0.0, 1.0])])
+    payload, dim, dtype = pack_embedding([0.6, 0.8])
+    db.execute(
+        text(
+            "INSERT INTO jobs (title, company, location, job_type, apply_link, source, dedup_hash, is_active,"
+            " embedding_packed, embedding_dim, embedding_dtype)"
+            " VALUES ('Engineer 5', 'Acme', 'Remote', 'full-time', 'x', 'adzuna', 'hash-5', 1, :packed, :dim, :dtype)"
+        ),
+        {"packed": payload, "dim": dim, "dtype": dtype},
+    )
+    db.execute(text("DELETE FROM jobs WHERE id = :id"), {"id": ids[3]})
+    db.commit()
+    new_id = db.query(Job.id).filter_by(dedup_hash="hash-5").scalar()
+
+    upserted, removed = local.sync(db)
+    assert removed == 2 and upserted >= 3
+    assert sorted(local.snapshot().ids.tolist()) == sorted([ids[1], ids[2], new_id])
+    by_id = dict(zip(*(array.tolist() for array in local.score([1.0, 0.0]))))
+    assert np.isclose(by_id[ids[1]], 1.0) and np.isclose(by_id[new_id], 0.6)
+
+    # Nothing new: nothing removed, the same vectors
+    assert local.sync(db)[1] == 0
+    assert len(local) == 3
+    embedding_index.remove(ids + [new_id])
+
+
+if __name__ == "__main__":
+    test_upsert_score_and_remove()
+    test_query_dimension_mismatch()
+    test_int8_index_approximates_float32()
+    test_sync_picks_up_other_processes_writes()
+    print("Embedding index tests passed.")
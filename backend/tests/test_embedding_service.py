@@ -0,0 +1,141 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import asyncio
+import functools
+import json
+import time
+
+import httpx
+
+from app.core.config import settings
+from app.services import embedding_service
+from app.services.embedding_service import EmbeddingService, close_http_client, get_http_client
+
+
+def _vector(text: str):
+    return [float(len(text)), float(sum(map(ord, text)))]
+
+
+class FakeService:
+    """
+    Mock /embed-batch with in-flight tracking. A chunk waits for its
+    slowest text's delay; a chunk with a text in `fail` answers 500, and
+    texts in `short` are missing from the answer.
+    """
+    def __init__(self, delays=None, fail=(), short=()):
+        self.delays = delays or {}
+        self.fail, self.short = set(fail), set(short)
+        self.in_flight = self.peak = 0
+        self.started, self.finished, self.cancelled = [], [], []
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        texts = json.loads(request.content)["texts"]
+        self.started.append(texts)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(max(self.delays.get(text, 0.0) for text in texts))
+            if self.fail & set(texts):
+                return httpx.Response(500, text="model crashed")
+            embeddings = [_vector(text) for text in texts if text not in self.short]
+            self.finished.append(texts)
+            return httpx.Response(200, json={"embeddings": embeddings})
+        except asyncio.CancelledError:
+            self.cancelled.append(texts)
+            raise
+        finally:
+            self.in_flight -= 1
+
+
+def _service(monkeypatch, fake: FakeService, batch_size=2, max_in_flight=4) -> EmbeddingService:
+    monkeypatch.setattr(settings, "embedding_batch_size", batch_size)
+    monkeypatch.setattr(settings, "embedding_max_in_flight", max_in_flight)
+    monkeypatch.setattr(
+        embedding_service.httpx, "AsyncClient",
+        functools.partial(httpx.AsyncClient, transport=httpx.MockTransport(fake.handler)),
+    )
+    return EmbeddingService()
+
+
+def _embed(service: EmbeddingService, texts):
+    async def run():
+        try:
+            return await service.embed_batch(texts, use_cache=False)
+        finally:
+            await close_http_client()
+    return asyncio.run(run())
+
+
+def test_chunks_finishing_out_of_order_keep_input_order(monkeypatch):
+    texts = [f"job {i}" for i in range(7)]
+    # Earlier chunks answer last
+    fake = FakeService(delays={text: 0.05 * (7 - i) for i, text in enumerate(texts)})
+    service = _service(monkeypatch, fake, batch_size=2)
+
+    assert _embed(service, texts) == [_vector(text) for text in texts]
+    assert fake.finished[0] == ["job 6"] and fake.finished[-1] == ["job 0", "job 1"]
+
+
+def test_in_flight_chunks_are_capped(monkeypatch):
+    texts = [f"job {i}" for i in range(16)]
+    fake = FakeService(delays={text: 0.02 for text in texts})
+    service = _service(monkeypatch, fake, batch_size=2, max_in_flight=3)
+
+    assert _embed(service, texts) == [_vector(text) for text in texts]
+    assert len(fake.started) == 8 and fake.peak == 3
+
+
+def test_one_failed_chunk_fails_the_call_and_cancels_the_rest(monkeypatch):
+    texts = [f"job {i}" for i in range(8)]
+    fake = FakeService(delays={text: 5.0 for text in texts[2:]}, fail={"job 1"})
+    service = _service(monkeypatch, fake, batch_size=2, max_in_flight=4)
+
+    async def run():
+        try:
+            result = await service.embed_batch(texts, use_cache=False)
+            await asyncio.sleep(0.05)  # let cancellations land (asyncio.run would cancel leftovers anyway)
+            return result, list(fake.cancelled)
+        finally:
+            await close_http_client()
+
+    start = time.monotonic()
+    result, cancelled = asyncio.run(run())
+    assert result is None and time.monotonic() - start < 2.0
+    # The three slow siblings were cancelled, not left running
+    assert sorted(map(tuple, cancelled)) == [("job 2", "job 3"), ("job 4", "job 5"), ("job 6", "job 7")]
+    assert fake.finished == []
+
+    # A chunk answering with the wrong number of vectors also fails the call
+    fake = FakeService(short={"job 3"})
+    assert _embed(_service(monkeypatch, fake), texts) is None
+
+
+def test_client_is_shared_per_event_loop(monkeypatch):
+    _service(monkeypatch, FakeService())
+
+    async def clients():
+        first, second = get_http_client(), get_http_client()
+        return first, second
+
+    first, second = asyncio.run(clients())
+    assert first is second
+    # A new loop (e.g. a script calling asyncio.run again) gets a new client
+    third, _ = asyncio.run(clients())
+    assert third is not first
+
+    async def closed_then_reused():
+        client = get_http_client()
+        await client.aclose()
+        replacement = get_http_client()
+        await close_http_client()
+        return client, replacement
+
+    client, replacement = asyncio.run(closed_then_reused())
+    assert replacement is not client and client.is_closed
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
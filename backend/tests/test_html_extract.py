@@ -0,0 +1,134 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+pytest.importorskip("cssselect")
+
+from app.fetchers.career_page import CareerPageFetcher
+from app.fetchers.html_extract import compile_selectors, extract_jobs
+
+CONFIG_DIR = Path(__file__).parent.parent / "app" / "configs" / "companies"
+
+SELECTORS = {
+    "job_container": "li.job-card",
+    "title": "h3.job-title",
+    "location": "span.job-location",
+    "link": "a.job-link",
+    "description": "div.job-summary",
+}
+
+# Entities, comments, scripts/styles, stray whitespace, missing fields,
+# relative links, unclosed tags and text outside the containers
+TRICKY_PAGE = """<!DOCTYPE html>
+<html><head><title>Careers</title><style>.job-card { color: red }</style></head>
+<body>
+  <nav><a class="job-link" href="/not-a-job">Jobs</a></nav>
+  <ul class="jobs">
+    <li class="job-card featured" data-id="1">
+      <h3 class="job-title">  Senior <b>Data</b> Engineer &amp; Analyst <!-- hiring! --> </h3>
+      <span class="job-location">Berlin,&nbsp;DE</span>
+      <a class="job-link primary" href="/jobs/1?ref=list">Apply</a>
+      <div class="job-summary">
+        <p>Build <em>pipelines</em>.</p><script>track("1")</script>
+        <style>p { margin: 0 }</style>Tail text
+      </div>
+    </li>
+    <li class="job-card"><h3 class="job-title">No link here</h3></li>
+    <li class="job-card">
+      <h3 class="job-title">Café Manager – München</h3>
+      <a class="job-link" href="https://example.com/jobs/3">Apply</a>
+      <a class="job-link" href="/second-link-ignored">Again</a>
+    </li>
+    <li class="job-card"><h3 class="job-title">Unclosed <i>tags
+      <a class="job-link" href="jobs/4">Apply
+    </li>
+    <li class="JOB-CARD"><h3 class="job-title">Wrong case class</h3><a class="job-link" href="/5">x</a></li>
+    <li class="job-card"><h3 class="job-title"></h3><a class="job-link">No href</a></li>
+  </ul>
+  <p>Footer</p>
+</body></html>
+"""
+
+
+def _page_for(selectors: dict, jobs: int = 30) -> str:
+    """Synthetic listing page built from a config's selectors."""
+    def tag(selector: str, content: str, attrs: str = "") -> str:
+        name, _, cls = selector.partition(".")
+        return f'<{name} class="{cls}"{attrs}>{content}</{name}>'
+
+    cards = "".join(
+        tag(selectors["job_container"], "".join([
+            tag(selectors["title"], f" Engineer <span>{i}</span> "),
+            tag(selectors["location"], "Remote" if i % 3 else ""),
+            tag(selectors["link"], "Apply", f' href="/jobs/{i}"'),
+            tag(selectors["description"], f"<p>Role {i}</p> <!-- c --> details") if i % 2 else "",
+        ]))
+        for i in range(jobs)
+    )
+    return f"<html><body><header>Careers</header><main>{cards}</main></body></html>"
+
+
+def _all_engines(html: str, selectors: dict):
+    return (
+        extract_jobs(html, selectors, engine="bs4"),
+        extract_jobs(html, selectors, engine="lxml", subtree=False),
+        extract_jobs(html, selectors, engine="lxml", subtree=True),
+    )
+
+
+def test_lxml_matches_beautifulsoup_on_tricky_markup():
+    reference, tree, streamed = _all_engines(TRICKY_PAGE, SELECTORS)
+    assert tree == reference and streamed == reference
+    assert [(job.title, job.link) for job in reference] == [
+        ("SeniorDataEngineer & Analyst", "/jobs/1?ref=list"),
+        ("Café Manager – München", "https://example.com/jobs/3"),
+        ("UnclosedtagsApply", "jobs/4"),
+        ("", ""),
+    ]
+    assert reference[0].description == "Buildpipelines.Tail text"
+    assert reference[0].location == "Berlin,\xa0DE"
+
+
+@pytest.mark.parametrize("config", sorted(CONFIG_DIR.glob("*.yaml")), ids=lambda p: p.stem)
+def test_lxml_matches_beautifulsoup_for_company_configs(config):
+    bs4_fetcher = CareerPageFetcher(str(config))
+    bs4_fetcher.parser = "bs4"
+    lxml_fetcher = CareerPageFetcher(str(config))
+    lxml_fetcher.parser = "lxml"
+    assert compile_selectors(lxml_fetcher.selectors) is not None
+
+    html = _page_for(lxml_fetcher.selectors)
+    reference = bs4_fetcher.parse(html)
+    assert len(reference) == 30
+    assert lxml_fetcher.parse(html) == reference
+    lxml_fetcher.parse_subtree = True
+    assert lxml_fetcher.parse(html) == reference
+
+
+def test_selectors_outside_cssselect_and_nested_containers_keep_parity():
+    # :-soup-contains() is soupsieve-only: the config falls back to bs4
+    soup_only = dict(SELECTORS, job_container='li:-soup-contains("Apply")')
+    assert compile_selectors(soup_only) is None
+    reference, tree, streamed = _all_engines(TRICKY_PAGE, soup_only)
+    assert len(reference) == 3 and tree == reference and streamed == reference
+
+    # Containers inside containers cannot be streamed; the whole tree is used
+    nested = "<div class='job'><h2>Outer</h2><a href='/o'>o</a><div class='job'><h2>Inner</h2><a href='/i'>i</a></div></div>"
+    selectors = {"job_container": "div.job", "title": "h2", "location": "span", "link": "a", "description": "p"}
+    reference, tree, streamed = _all_engines(nested, selectors)
+    assert [job.title for job in reference] == ["Outer", "Inner"]
+    assert tree == reference and streamed == reference
+
+    # A missing selector never produced jobs, and still does not
+    partial = {"job_container": "li.job-card", "title": "h3", "link": "a"}
+    assert _all_engines(TRICKY_PAGE, partial) == ([], [], [])
+
+
+if __name__ == "__main__":
+    test_lxml_matches_beautifulsoup_on_tricky_markup()
+    for config_path in sorted(CONFIG_DIR.glob("*.yaml")):
+        test_lxml_matches_beautifulsoup_for_company_configs(config_path)
+    test_selectors_outside_cssselect_and_nested_containers_keep_parity()
+    print("HTML extraction parity tests passed.")
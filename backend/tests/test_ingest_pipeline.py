@@ -0,0 +1,176 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import asyncio
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.database import Base
+from app.fetchers.base import JobData
+from app.models.alert_model import UserAlert
+from app.models.job_model import Job
+from app.services import ingest_pipeline
+from app.services.email_queue_service import EmailQueueService
+from app.services.ingest_pipeline import IngestPipeline
+from app.services.normalizer import normalize
+
+SLOW_SOURCE_SECONDS = 0.5
+
+
+def _session_factory():
+    # One shared connection: the save stage runs in worker threads
+    engine = create_engine(
+        "sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)
+
+
+def _job(company: str, n: int, title: str = "Engineer") -> JobData:
+    return JobData(
+        title=f"{title} {n}", company=company, location="Remote",
+        description="Python", apply_link=f"https://{company.lower()}.test/jobs/{n}", source="career_page",
+    )
+
+
+class FakeDedup:
+    """DedupService stand-in: Redis memory as a set."""
+    def __init__(self, known=()):
+        self.known = set(known)
+
+    async def seen_many(self, hashes):
+        return [h in self.known for h in hashes]
+
+    async def mark_many(self, hashes):
+        self.known.update(hashes)
+
+
+class FakeFetcher:
+    """A fast and a slow source; the slow one records when it finishes."""
+    def __init__(self, fast, slow, slow_seconds=SLOW_SOURCE_SECONDS):
+        self.fast, self.slow, self.slow_seconds = fast, slow, slow_seconds
+        self.slow_done_at = None
+
+    async def fetch_all(self, on_source=None):
+        async def fast():
+            await on_source("fast", self.fast)
+
+        async def slow():
+            await asyncio.sleep(self.slow_seconds)
+            self.slow_done_at = time.monotonic()
+            await on_source("slow", self.slow)
+
+        await asyncio.gather(fast(), slow())
+        return []
+
+
+def test_fast_source_is_saved_and_alerted_before_slow_source_finishes(monkeypatch):
+    factory = _session_factory()
+    with factory() as db:
+        db.add_all([
+            UserAlert(email="a@example.com", name="Platform", filters={"title": "platform"}),
+            UserAlert(email="b@example.com", name="Nothing", filters={"company": "nobody"}),
+        ])
+        db.commit()
+
+    queued = []
+
+    async def queue_email(to_email, alert_name, jobs):
+        queued.append((to_email, alert_name, sorted(job.title for job in jobs)))
+        return True
+
+    monkeypatch.setattr(EmailQueueService, "queue_email", staticmethod(queue_email))
+
+    fast = [_job("Acme", n) for n in range(30)] + [_job("Acme", 0), _job("Acme", 99, "Platform Engineer")]
+    slow = [_job("Globex", n) for n in range(5)] + [_job("Globex", 7, "Platform Lead")]
+    known = {normalize(_job("Acme", 29)).dedup_hash}
+    fetcher = FakeFetcher(fast, slow)
+    pipeline = IngestPipeline(
+        fetcher=fetcher, session_factory=factory, dedup=FakeDedup(known),
+        queue_size=2, batch_size=8, save_chunk_size=10,
+    )
+
+    run_start = time.monotonic()
+    result = asyncio.run(pipeline.run())
+
+    # Fast source's jobs were committed before the slow one even finished downloading
+    assert result.first_save_seconds < SLOW_SOURCE_SECONDS
+    assert run_start + result.first_save_seconds < fetcher.slow_done_at
+
+    # 38 fetched, minus one repeat in the run and one already known
+    assert (result.fetched, result.unique, result.saved) == (38, 36, 36)
+    with factory() as db:
+        assert db.query(Job).count() == 36
+
+    # One notification per matching alert, covering both sources
+    assert result.notifications_queued == 1
+    assert queued == [("a@example.com", "Platform", ["Platform Engineer 99", "Platform Lead 7"])]
+
+    stages = result.stages
+    assert [stages[name].items_in for name in ingest_pipeline.STAGES] == [38, 38, 38, 36, 36]
+    assert stages["save"].batches >= 4  # chunks of at most 10
+    assert ingest_pipeline.ingest_metrics()["stages"]["save"]["items_out"] == 36
+
+
+def test_full_queues_hold_back_the_producer():
+    factory = _session_factory()
+
+    class SlowDedup(FakeDedup):
+        async def seen_many(self, hashes):
+            await asyncio.sleep(0.02)
+            return await super().seen_many(hashes)
+
+    fetcher = FakeFetcher([_job("Acme", n) for n in range(40)], [], slow_seconds=0.0)
+    pipeline = IngestPipeline(
+        fetcher=fetcher, session_factory=factory, dedup=SlowDedup(), queue_size=1, batch_size=2,
+    )
+    result = asyncio.run(pipeline.run())
+
+    assert result.saved == 40
+    # 20 batches through a one-slot queue: the fetch stage had to wait for dedup
+    assert result.stages["fetch"].blocked_seconds > 0.1
+    assert result.stages["dedup"].batches == 20
+
+
+
+def test_source_is_marked_saved_only_after_all_its_jobs_are_saved(monkeypatch):
+    factory = _session_factory()
+    events = []
+
+    class ValidatorFetcher:
+        async def fetch_all(self, on_source=None):
+            for source, count in [("good", 10), ("dupes", 3), ("broken", 4)]:
+                async def on_saved(source=source):
+                    with factory() as db:
+                        events.append((source, db.query(Job).filter(Job.company == source).count()))
+                await on_source(source, [_job(source, n) for n in range(count)], on_saved)
+            return []
+
+    save_sync = IngestPipeline._save_sync
+
+    def failing_save(db, chunk):
+        if any(job.company == "broken" for job in chunk):
+            raise RuntimeError("database unavailable")
+        return save_sync(db, chunk)
+
+    monkeypatch.setattr(IngestPipeline, "_save_sync", staticmethod(failing_save))
+    known = {normalize(_job("dupes", n)).dedup_hash for n in range(3)}
+    pipeline = IngestPipeline(
+        fetcher=ValidatorFetcher(), session_factory=factory, dedup=FakeDedup(known),
+        batch_size=5, save_chunk_size=5,
+    )
+    result = asyncio.run(pipeline.run())
+
+    assert result.saved == 10
+    # "good" after all 10 rows were committed, "dupes" with nothing to save,
+    # "broken" never: its page must be parsed again next time
+    assert sorted(events) == [("dupes", 0), ("good", 10)]
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,141 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.core.database import Base
+from app.models.job_model import Job
+from app.services import job_matcher, job_repository
+from app.services.embedding_index import EmbeddingIndex
+from app.services.job_matcher import JobMatcher
+from app.services.job_repository import JobRepository
+from app.services.normalizer import NormalizedJob
+
+
+def _full_sort(scores: np.ndarray, k: int) -> list:
+    """Reference: stable full sort by score, best first."""
+    return sorted(range(len(scores)), key=lambda i: scores[i], reverse=True)[:k]
+
+
+def test_top_indices_matches_full_sort_with_ties():
+    rng = np.random.default_rng(7)
+    cases = [
+        np.array([0.5, 0.9, 0.5, 0.9, 0.1, 0.5], dtype=np.float32),
+        np.zeros(8, dtype=np.float32),
+        rng.integers(0, 5, size=200).astype(np.float32) / 4,  # many ties
+        rng.random(300).astype(np.float32),
+    ]
+    for scores in cases:
+        n = len(scores)
+        for k in (1, 2, 3, n // 2, n - 1, n, n + 5):
+            assert JobMatcher._top_indices(scores, k).tolist() == _full_sort(scores, k), (scores, k)
+
+    assert JobMatcher._top_indices(np.array([], dtype=np.float32), 3).tolist() == []
+    assert JobMatcher._top_indices(np.array([1.0, 2.0]), 0).tolist() == []
+
+
+def _posting(n: int) -> NormalizedJob:
+    return NormalizedJob(
+        title=f"Engineer {n}", company="Acme", location="Remote", job_type="full-time",
+        description="Python " * 200, apply_link=f"https://example.com/{n}",
+        source="adzuna", dedup_hash=f"hash-{n}",
+    )
+
+
+def test_unindexed_candidates_cost_no_queries_per_job(monkeypatch):
+    monkeypatch.setattr(job_matcher, "embedding_index", EmbeddingIndex())
+    monkeypatch.setattr(job_repository, "embedding_index", EmbeddingIndex())  # "another worker"
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    repo = JobRepository(db)
+    # 50 jobs without vectors, 2 with vectors another worker wrote (not indexed here)
+    repo.save_jobs_batch(
+        [_posting(n) for n in range(52)], embeddings=[None] * 50 + [[1.0, 0.0], [0.0, 1.0]]
+    )
+    db.expunge_all()
+
+    jobs, _ = repo.search_jobs(limit=1000, summary=True, extra_columns=JobMatcher.candidate_columns())
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    scores, has_emb = JobMatcher._semantic_scores([1.0, 0.0], jobs)
+    event.remove(engine, "before_cursor_execute", record)
+
+    # Only the two embedded jobs load their vectors; the 50 others cost nothing
+    assert len(statements) <= 2 * 3
+    embedded_ids = sorted(job.id for job, flag in zip(jobs, has_emb) if flag)
+    assert len(embedded_ids) == 2 and embedded_ids == sorted(j.id for j in jobs)[-2:]
+    assert max(scores) > 0.99
+
+
+def test_vector_cleared_elsewhere_is_not_scored(monkeypatch):
+    index = EmbeddingIndex()
+    monkeypatch.setattr(job_matcher, "embedding_index", index)
+    monkeypatch.setattr(job_repository, "embedding_index", index)
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    repo = JobRepository(db)
+    _, saved = repo.save_jobs_batch([_posting(1), _posting(2)], embeddings=[[1.0, 0.0], [0.0, 1.0]])
+    ids = [job.id for job in saved]
+
+    # Another process changed job 1's text and cleared its vector; this index still has it
+    db.execute(Job.__table__.update().where(Job.id == ids[0]).values(embedding_packed=None, embedding_dim=None))
+    db.commit()
+    db.expunge_all()
+    jobs, _ = repo.search_jobs(limit=10, summary=True, extra_columns=JobMatcher.candidate_columns())
+    jobs.sort(key=lambda job: job.id)
+
+    scores, has_emb = JobMatcher._semantic_scores([1.0, 0.0], jobs)
+    assert has_emb.tolist() == [False, True] and scores[0] == 0.0
+    assert index.rows_for(ids).tolist()[0] == -1
+
+
+def test_exact_rescoring_restores_float_order(monkeypatch):
+    index = EmbeddingIndex(dtype="int8")
+    monkeypatch.setattr(job_matcher, "embedding_index", index)
+    monkeypatch.setattr(job_repository, "embedding_index", index)
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    repo = JobRepository(db)
+    query = [1.0, 0.0]
+    # Exact cosine: a (0.28735) > b (0.28691); the int8 index scores b first
+    a, b = [0.3, 1.0], [0.2995, 1.0]
+
+    def load(storage_dtype, vectors):
+        monkeypatch.setattr(settings, "embedding_storage_dtype", storage_dtype)
+        _, saved = repo.save_jobs_batch([_posting(1), _posting(2)], embeddings=vectors)
+        ids = [job.id for job in saved]
+        db.expunge_all()
+        return repo.get_jobs_by_ids(ids, summary=True, extra_columns=JobMatcher.candidate_columns())
+
+    jobs = load("float32", [a, b])
+    approx = dict(zip(*(array.tolist() for array in index.score(query))))
+    assert approx[jobs[1].id] > approx[jobs[0].id]  # the index alone would rank b first
+    matches = JobMatcher.match_jobs_hybrid("python", query, jobs, keyword_scores=[0.0, 0.0])
+    assert [match["job"].id for match in matches] == [jobs[0].id, jobs[1].id]
+    exact = [0.3 / np.hypot(0.3, 1.0), 0.2995 / np.hypot(0.2995, 1.0)]
+    assert [match["semantic_score"] for match in matches] == [round(score * 100, 2) for score in exact]
+
+    # Stored as int8 there is nothing more precise to rescore from: index scores stand
+    index.remove([job.id for job in jobs])
+    rng = np.random.default_rng(3)
+    query = rng.normal(size=64).tolist()
+    jobs = load("int8", rng.normal(size=(2, 64)).tolist())
+    approx = dict(zip(*(array.tolist() for array in index.score(query))))
+    scores, _ = JobMatcher._semantic_scores(query, jobs)
+    assert scores.tolist() == [approx[job.id] for job in jobs]
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,212 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.core.database import Base
+from app.models.job_model import Job
+from app.services.embedding_codec import job_embedding
+from app.services.embedding_index import embedding_index
+from app.services.full_text_search import ensure_full_text_schema
+import pytest
+
+from app.services.job_repository import JobRepository
+from app.services.normalizer import NormalizedJob
+
+
+def _session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)()
+
+
+def _posting(n: int, description: str = "Python", link: str = None) -> NormalizedJob:
+    return NormalizedJob(
+        title=f"Engineer {n}", company="Acme", location="Remote", job_type="full-time",
+        description=description, apply_link=link or f"https://example.com/{n}",
+        source="adzuna", dedup_hash=f"hash-{n}",
+    )
+
+
+def test_bulk_upsert_inserts_and_updates():
+    db = _session()
+    repo = JobRepository(db)
+    count, saved = repo.save_jobs_batch(
+        [_posting(1), _posting(2), _posting(3)], embeddings=[[1.0, 0.0], None, [0.0, 1.0]]
+    )
+    assert count == 3 and [job.dedup_hash for job in saved] == ["hash-1", "hash-2", "hash-3"]
+    assert all(job.keywords_indexed for job in saved)
+
+    # Re-ingest: unchanged text keeps its vector, changed text is re-queued
+    count, saved = repo.save_jobs_batch([_posting(1), _posting(3, description="Rust")])
+    assert count == 2 and db.query(Job).count() == 3
+    assert job_embedding(db.get(Job, saved[0].id)).tolist() == [1.0, 0.0]
+    assert not db.get(Job, saved[1].id).has_embedding
+    assert db.get(Job, saved[1].id).description == "Rust"
+
+
+def test_bad_row_does_not_fail_the_chunk():
+    db = _session()
+    repo = JobRepository(db)
+    repo.save_jobs_batch([_posting(1)])
+
+    # Job 5 reuses job 1's apply_link (unique) under a new dedup hash
+    count, saved = repo.save_jobs_batch(
+        [_posting(4), _posting(5, link="https://example.com/1"), _posting(6)]
+    )
+    assert count == 2 and [job.dedup_hash for job in saved] == ["hash-4", "hash-6"]
+    assert db.query(Job).count() == 3
+
+
+def test_keyset_pages_cover_every_job_once():
+    db = _session()
+    repo = JobRepository(db)
+    repo.save_jobs_batch([_posting(n) for n in range(7)])  # same created_at: id breaks ties
+
+    seen, cursor = [], None
+    for _ in range(5):
+        page = repo.list_jobs(cursor=cursor, limit=3, exact_total=True)
+        seen.extend(job.id for job in page.jobs)
+        assert page.total == 7 and page.total_is_exact
+        if not page.has_more:
+            break
+        cursor = page.next_cursor
+    assert seen == sorted(seen, reverse=True) and len(set(seen)) == 7
+
+    # Offset paging still works; the total is now served from the cache
+    page = repo.list_jobs(skip=6, limit=3)
+    assert [job.id for job in page.jobs] == seen[6:] and not page.has_more
+    assert not page.total_is_exact
+
+    with pytest.raises(ValueError):
+        repo.list_jobs(cursor="not-a-cursor")
+
+
+def test_full_text_search_ranks_and_stays_in_sync():
+    db = _session()
+    with db.get_bind().connect() as conn:
+        ensure_full_text_schema(conn)
+    repo = JobRepository(db)
+    repo.save_jobs_batch([
+        _posting(1, description="Backend role, some kubernetes exposure"),
+        _posting(2, description="Frontend role"),
+        NormalizedJob(
+            title="Kubernetes Platform Engineer", company="Acme", location="Berlin",
+            job_type="full-time", description="Operate clusters", source="adzuna",
+            apply_link="https://example.com/k8s", dedup_hash="hash-k8s",
+        ),
+    ])
+
+    # Title matches outrank description matches
+    page = repo.list_jobs(q="kubernetes", exact_total=True)
+    assert [job.dedup_hash for job in page.jobs] == ["hash-k8s", "hash-1"] and page.total == 2
+    assert page.next_cursor is None
+
+    # Location is indexed too
+    assert [job.dedup_hash for job in repo.list_jobs(q="berlin").jobs] == ["hash-k8s"]
+    assert repo.list_jobs(q="remote", exact_total=True).total == 2
+
+    # Substring filters still apply on top of q
+    assert [job.dedup_hash for job in repo.list_jobs(q="kubernetes", location="remote").jobs] == ["hash-1"]
+
+    # The bulk upsert keeps the index in step with changed text
+    repo.save_jobs_batch([_posting(2, description="Frontend role with Kubernetes")])
+    assert repo.list_jobs(q="kubernetes", exact_total=True).total == 3
+    assert repo.list_jobs(q="frontend role", exact_total=True).total == 1
+
+    with pytest.raises(ValueError):
+        repo.list_jobs(q="kubernetes", cursor=page.next_cursor or "x")
+
+
+def test_full_text_index_without_location_is_rebuilt():
+    db = _session()
+    repo = JobRepository(db)
+    repo.save_jobs_batch([_posting(1), _posting(2)])
+    with db.get_bind().connect() as conn:
+        # Index layout from before location was searchable
+        conn.execute(text(
+            "CREATE VIRTUAL TABLE jobs_fts USING fts5("
+            "title, company, description, content='jobs', content_rowid='id')"
+        ))
+        conn.commit()
+        ensure_full_text_schema(conn)
+        ensure_full_text_schema(conn)  # idempotent
+
+    assert repo.list_jobs(q="remote", exact_total=True).total == 2
+    repo.save_jobs_batch([_posting(3)])
+    assert repo.list_jobs(q="remote engineer", exact_total=True).total == 3
+
+
+def test_summary_projection_defers_heavy_columns():
+    db = _session()
+    repo = JobRepository(db)
+    repo.save_jobs_batch([_posting(1, description="x" * 5000)], embeddings=[[1.0, 0.0]])
+    db.expunge_all()
+
+    job = repo.list_jobs(summary=True).jobs[0]
+    assert job.title == "Engineer 1" and len(job.snippet) == settings.job_snippet_chars
+    assert "description" not in job.__dict__ and "embedding_packed" not in job.__dict__
+    assert len(job.description) == 5000  # deferred columns still load on access
+
+    db.expunge_all()
+    (job,) = repo.get_jobs_by_ids([job.id], summary=True, extra_columns=(Job.embedding_packed,))
+    assert "embedding_packed" in job.__dict__ and "description" not in job.__dict__
+
+
+def test_embedding_update_skips_text_changed_meanwhile():
+    db = _session()
+    repo = JobRepository(db)
+    _, saved = repo.save_jobs_batch([_posting(1), _posting(2), _posting(3)])
+    ids = [job.id for job in saved]
+    pairs = [(job.id, [float(n), 1.0], job.text_fingerprint) for n, job in enumerate(saved)]
+    embedding_index.remove(ids)
+
+    # Job 2's text is edited after the fingerprint read, just before the UPDATE runs
+    def edit_job_2(conn, cursor, statement, parameters, context, executemany):
+        if executemany and statement.startswith("UPDATE jobs"):
+            cursor.connection.execute("UPDATE jobs SET text_fingerprint = 'edited' WHERE id = ?", (ids[1],))
+
+    event.listen(db.get_bind(), "before_cursor_execute", edit_job_2)
+    try:
+        assert repo.update_embeddings_batch(pairs) == 2
+    finally:
+        event.remove(db.get_bind(), "before_cursor_execute", edit_job_2)
+
+    db.expire_all()
+    assert [db.get(Job, job_id).has_embedding for job_id in ids] == [True, False, True]
+    indexed = embedding_index.snapshot().rows
+    assert ids[0] in indexed and ids[1] not in indexed and ids[2] in indexed
+    embedding_index.remove(ids)
+
+
+
+def test_recent_unembedded_job_ids():
+    db = _session()
+    repo = JobRepository(db)
+    _, saved = repo.save_jobs_batch(
+        [_posting(n) for n in range(5)], embeddings=[None, [1.0, 0.0], None, None, [0.0, 1.0]]
+    )
+    ids = [job.id for job in saved]
+    saved[3].is_active = False
+    db.commit()
+
+    # Newest first (same created_at second: higher id first), embedded and inactive jobs skipped
+    assert repo.get_recent_job_ids_without_embeddings(10) == [ids[2], ids[0]]
+    assert repo.get_recent_job_ids_without_embeddings(1) == [ids[2]]
+    assert repo.get_recent_job_ids_without_embeddings(0) == []
+    embedding_index.remove(ids)
+
+
+if __name__ == "__main__":
+    test_bulk_upsert_inserts_and_updates()
+    test_bad_row_does_not_fail_the_chunk()
+    test_keyset_pages_cover_every_job_once()
+    test_full_text_search_ranks_and_stays_in_sync()
+    test_full_text_index_without_location_is_rebuilt()
+    test_summary_projection_defers_heavy_columns()
+    test_embedding_update_skips_text_changed_meanwhile()
+    test_recent_unembedded_job_ids()
+    print("Job repository tests passed.")
@@ -0,0 +1,68 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models.job_model import Job
+from app.models.job_term_model import JobTerm, FieldStat
+from app.services.keyword_index import KeywordIndex
+from app.services.resume_parser import ResumeParser
+
+
+def _session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)()
+
+
+def _job(n: int, title: str, description: str, company: str, location: str) -> Job:
+    return Job(
+        title=title, company=company, location=location, description=description,
+        job_type="full-time", apply_link=f"https://example.com/{n}", source="career_page",
+        dedup_hash=f"hash-{n}",
+    )
+
+
+def test_bm25_scores_from_postings():
+    db = _session()
+    jobs = [
+        _job(1, "Senior Python Engineer", "FastAPI, PostgreSQL and Docker on AWS", "Acme", "Berlin"),
+        _job(2, "Data Scientist", "Python, pandas, statistics", "Globex", "Remote"),
+        _job(3, "Line Cook", "Prepare meals", "Diner", "Austin"),
+    ]
+    db.add_all(jobs)
+    db.commit()
+    resume_keywords = ResumeParser.extract_keywords(
+        "Python engineer with FastAPI, Docker and AWS experience, based in Berlin"
+    )
+
+    index = KeywordIndex(db)
+    index.index_jobs(jobs)
+    index.refresh_stats()
+    assert all(job.keywords_indexed for job in jobs)
+    assert db.query(FieldStat).filter_by(field="title").one().doc_count == 3
+
+    scores = index.score_jobs(resume_keywords, jobs)
+    assert scores[0] > scores[1] > scores[2] == 0.0
+    assert all(0.0 <= s < 1.0 for s in scores)
+
+    # Stable: a job's score does not depend on the other jobs scored with it
+    assert index.score_jobs(resume_keywords, [jobs[1]]) == [scores[1]]
+
+    # Jobs not indexed yet are scored the same way from their fields
+    jobs[0].keywords_indexed = False
+    assert index.score_jobs(resume_keywords, jobs) == scores
+
+    # Re-indexing after an update replaces the old postings
+    jobs[2].title = "Python Cook"
+    index.index_jobs([jobs[2]])
+    assert index.score_jobs(resume_keywords, jobs)[2] > 0.0
+    assert db.query(JobTerm).filter_by(job_id=jobs[2].id, term="line").count() == 0
+
+
+if __name__ == "__main__":
+    test_bm25_scores_from_postings()
+    print("Keyword index tests passed.")
@@ -0,0 +1,76 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import asyncio
+import time
+
+import pytest
+
+from app.services.pdf_extraction import PdfExtractionPool, PdfExtractionTimeout
+
+TIMEOUT_SECONDS = 2.0
+
+
+def _fake_extract(pdf_bytes: bytes, max_pages: int) -> str:
+    """Worker stand-in (module level, so spawned workers can import it): b"hang" never returns."""
+    if pdf_bytes == b"hang":
+        time.sleep(60)
+    return pdf_bytes.decode()
+
+
+def _pool(max_workers: int = 1) -> PdfExtractionPool:
+    return PdfExtractionPool(
+        max_workers=max_workers, timeout_seconds=TIMEOUT_SECONDS, extract_fn=_fake_extract
+    )
+
+
+def test_hung_worker_times_out_and_pool_recovers():
+    pool = _pool()
+
+    async def run():
+        assert await pool.extract_text(b"warm up") == "warm up"
+        workers = list(pool._executor._processes.values())
+        start = time.monotonic()
+        with pytest.raises(PdfExtractionTimeout):
+            await pool.extract_text(b"hang")
+        assert time.monotonic() - start < TIMEOUT_SECONDS + 1
+        assert pool._executor is None
+        for process in workers:
+            process.join(timeout=1)
+        assert not any(process.is_alive() for process in workers)
+        # The next document runs on a fresh pool
+        assert await pool.extract_text(b"next") == "next"
+
+    try:
+        asyncio.run(run())
+    finally:
+        pool.shutdown()
+
+
+def test_queued_document_is_retried_after_pool_kill():
+    pool = _pool()
+
+    async def run():
+        assert await pool.extract_text(b"warm up") == "warm up"
+        # Queue documents behind the hung one; past the executor's call queue
+        # (max_workers + 1 items) they are still pending when the pool is killed
+        pool._slots = asyncio.Semaphore(4)
+        hung = asyncio.create_task(pool.extract_text(b"hang"))
+        await asyncio.sleep(0.3)
+        queued = [asyncio.create_task(pool.extract_text(f"queued {i}".encode())) for i in range(3)]
+        with pytest.raises(PdfExtractionTimeout):
+            await hung
+        # Cancelled by the kill before a worker took them: retried, not a raw CancelledError
+        assert await asyncio.gather(*queued) == ["queued 0", "queued 1", "queued 2"]
+
+    try:
+        asyncio.run(run())
+    finally:
+        pool.shutdown()
+
+
+if __name__ == "__main__":
+    test_hung_worker_times_out_and_pool_recovers()
+    test_queued_document_is_retried_after_pool_kill()
+    print("PDF extraction pool tests passed.")
@@ -0,0 +1,197 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import asyncio
+from types import SimpleNamespace
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from redis.exceptions import ConnectionError as RedisConnectionError
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.api import match_routes
+from app.core.database import Base, get_db
+from app.services import resume_cache as resume_cache_module
+from app.services.resume_cache import CachedResume, ResumeCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeRedis:
+    """Redis stand-in honouring `ex`; `down` makes every call fail."""
+    def __init__(self, clock):
+        self.clock = clock
+        self.entries = {}
+        self.calls = []
+        self.down = False
+
+    async def get(self, key):
+        self.calls.append(("get", key))
+        if self.down:
+            raise RedisConnectionError("connection refused")
+        value, expires_at = self.entries.get(key, (None, 0.0))
+        return value if self.clock() < expires_at else None
+
+    async def set(self, key, value, ex=None):
+        self.calls.append(("set", key))
+        if self.down:
+            raise RedisConnectionError("connection refused")
+        self.entries[key] = (value, self.clock() + ex)
+
+
+def _cache(monkeypatch, ttl_seconds=60, max_local_items=2):
+    clock = Clock()
+    fake = FakeRedis(clock)
+    monkeypatch.setattr(resume_cache_module, "redis", fake)
+    monkeypatch.setattr(resume_cache_module, "time", SimpleNamespace(monotonic=clock))
+    return ResumeCache(ttl_seconds=ttl_seconds, max_local_items=max_local_items), fake, clock
+
+
+def _entry(text, embedding=None):
+    return CachedResume(text=text, keywords={"python", text}, embedding=embedding)
+
+
+def test_local_lru_hits_skip_redis_and_evict_least_recent(monkeypatch):
+    cache, fake, _ = _cache(monkeypatch)
+
+    async def run():
+        for name in ("a", "b"):
+            await cache.set(name, _entry(name))
+        fake.calls.clear()
+        assert (await cache.get("a")).text == "a"  # "a" is now the most recent
+        assert fake.calls == []
+        await cache.set("c", _entry("c"))  # evicts "b" locally
+        fake.calls.clear()
+        assert (await cache.get("b")).keywords == {"python", "b"}  # back from Redis
+        assert fake.calls == [("get", "resume:cache:b")]
+        fake.calls.clear()
+        assert (await cache.get("b")).text == "b"  # and kept locally again
+        assert fake.calls == []
+
+    asyncio.run(run())
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    cache, fake, clock = _cache(monkeypatch, ttl_seconds=60)
+
+    async def run():
+        await cache.set("a", _entry("a", embedding=[1.0, 0.0]))
+        clock.now += 59
+        assert (await cache.get("a")).embedding == [1.0, 0.0]
+        clock.now += 2
+        assert await cache.get("a") is None
+        assert "a" not in cache._local
+
+    asyncio.run(run())
+
+
+def test_redis_down_is_not_an_error(monkeypatch):
+    cache, fake, _ = _cache(monkeypatch, max_local_items=0)
+    fake.down = True
+
+    async def run():
+        await cache.set("a", _entry("a"))
+        assert await cache.get("a") is None
+
+    asyncio.run(run())
+    assert [kind for kind, _ in fake.calls] == ["set", "get"]
+
+
+def test_corrupt_redis_entry_is_discarded(monkeypatch):
+    cache, fake, clock = _cache(monkeypatch)
+    fake.entries["resume:cache:bad"] = ("{not json", clock() + 60)
+    fake.entries["resume:cache:partial"] = ('{"keywords": []}', clock() + 60)
+
+    async def run():
+        assert await cache.get("bad") is None
+        assert await cache.get("partial") is None
+
+    asyncio.run(run())
+    assert cache._local == {}
+
+
+# ── /match/resume ────────────────────────────────────────────────
+
+class FakeBatcher:
+    def __init__(self):
+        self.embedding = None
+        self.calls = 0
+
+    async def embed(self, text):
+        self.calls += 1
+        return self.embedding
+
+
+class FakePool:
+    def __init__(self):
+        self.calls = 0
+
+    async def extract_text(self, pdf_bytes):
+        self.calls += 1
+        return "Python engineer"
+
+
+def _client(monkeypatch, cache):
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+
+    def override_db():
+        db = factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    batcher, pool = FakeBatcher(), FakePool()
+    monkeypatch.setattr(match_routes, "resume_cache", cache)
+    monkeypatch.setattr(match_routes, "embedding_batcher", batcher)
+    monkeypatch.setattr(match_routes, "pdf_extraction_pool", pool)
+    app = FastAPI()
+    app.include_router(match_routes.router)
+    app.dependency_overrides[get_db] = override_db
+    return TestClient(app), batcher, pool
+
+
+def test_entry_cached_without_embedding_is_completed_later(monkeypatch):
+    cache, fake, _ = _cache(monkeypatch)
+    client, batcher, pool = _client(monkeypatch, cache)
+    pdf = b"%PDF-1.4 resume"
+    digest = ResumeCache.digest(pdf)
+
+    def upload():
+        response = client.post("/match/resume", files={"resume": ("cv.pdf", pdf, "application/pdf")})
+        assert response.status_code == 200
+        return response.json()["matching_mode"]
+
+    # Embedding service down: text and keywords are cached without an embedding
+    assert upload() == "keyword_only"
+    assert pool.calls == 1 and asyncio.run(cache.get(digest)).embedding is None
+
+    # Still down: the cached text is reused and the entry is not rewritten
+    fake.calls.clear()
+    assert upload() == "keyword_only"
+    assert pool.calls == 1 and batcher.calls == 2
+    assert ("set", f"resume:cache:{digest}") not in fake.calls
+
+    # Back up: the embedding is computed once and stored with the entry
+    batcher.embedding = [1.0, 0.0]
+    assert upload() == "hybrid"
+    cached = asyncio.run(cache.get(digest))
+    assert cached.embedding == [1.0, 0.0] and cached.text == "Python engineer"
+    assert upload() == "hybrid"
+    assert pool.calls == 1 and batcher.calls == 3
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))